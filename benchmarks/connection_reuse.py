@@ -0,0 +1,58 @@
+"""Benchmark connection reuse of the Portainer client under high concurrency.
+
+Fires waves of concurrent requests at an in-process fake server and reports
+how many TCP connections were opened, once with a bare ``ClientSession`` and
+once with a tuned :class:`~pyportainer.PortainerTransportConfig`. Request
+coalescing is turned off, so every call reaches the server and the
+connection pool is what gets measured.
+
+Run with ``python -m benchmarks.connection_reuse``.
+"""
+
+# pylint: disable=protected-access
+from __future__ import annotations
+
+import asyncio
+import time
+
+from aiohttp import ClientSession
+
+from benchmarks.fake_server import FakePortainer
+from pyportainer import Portainer, PortainerTransportConfig
+
+CONCURRENCY = 500
+WAVES = 5
+
+
+async def _run(server: FakePortainer, portainer: Portainer) -> tuple[float, int]:
+    """Run all waves and return the elapsed time and number of connections."""
+    server.reset()
+    start = time.perf_counter()
+    for _ in range(WAVES):
+        await asyncio.gather(*(portainer._request("system/status") for _ in range(CONCURRENCY)))
+    return time.perf_counter() - start, len(server.connections)
+
+
+async def main() -> None:
+    """Run the benchmark."""
+    server = FakePortainer(body=b'{"Version": "2.27.0"}')
+    await server.start()
+
+    try:
+        async with ClientSession() as session, Portainer(server.url, "key", session=session, max_retries=0, coalesce_requests=False) as portainer:
+            bare = await _run(server, portainer)
+
+        transport = PortainerTransportConfig(limit_per_host=32, keepalive_timeout=60.0)
+        async with Portainer(server.url, "key", max_retries=0, transport=transport, coalesce_requests=False) as portainer:
+            tuned = await _run(server, portainer)
+    finally:
+        await server.stop()
+
+    total = CONCURRENCY * WAVES
+    print(f"{total} requests in {WAVES} waves of {CONCURRENCY} concurrent calls")
+    for name, (elapsed, connections) in (("bare ClientSession", bare), ("PortainerTransportConfig", tuned)):
+        print(f"{name:>26}: {connections:4d} connections, {total / connections:7.1f} requests/connection, {total / elapsed:8.0f} req/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,59 @@
+"""Benchmark response decoding of the Portainer client.
+
+Compares the former ``json.loads`` + ``from_dict`` path with decoding raw
+bytes through orjson straight into the models, using the ``containers.json``
+and ``container_inspect.json`` test fixtures scaled to thousands of entries.
+
+Run with ``python -m benchmarks.decode``.
+"""
+
+from __future__ import annotations
+
+import json
+import timeit
+from pathlib import Path
+from typing import Any
+
+import orjson
+from mashumaro.codecs.orjson import ORJSONDecoder
+
+from pyportainer.models.docker import DockerContainer
+from pyportainer.models.docker_inspect import DockerInspect
+
+FIXTURES = Path(__file__).parent.parent / "tests" / "fixtures"
+ENTRIES = 5_000
+ROUNDS = 5
+
+
+def _scaled_body(filename: str) -> bytes:
+    """Build a JSON array of ``ENTRIES`` items from a fixture."""
+    data: Any = orjson.loads((FIXTURES / filename).read_bytes())
+    items = data if isinstance(data, list) else [data]
+    return orjson.dumps((items * (ENTRIES // len(items) + 1))[:ENTRIES])
+
+
+def _report(name: str, body: bytes, model: Any) -> None:
+    """Time both decode paths for a single payload."""
+    decoder = ORJSONDecoder(list[model])
+
+    def stdlib() -> None:
+        [model.from_dict(item) for item in json.loads(body)]
+
+    def orjson_models() -> None:
+        decoder.decode(body)
+
+    legacy = min(timeit.repeat(stdlib, number=1, repeat=ROUNDS))
+    fast = min(timeit.repeat(orjson_models, number=1, repeat=ROUNDS))
+    print(f"{name} ({ENTRIES} entries, {len(body) / 1024:.0f} KiB)")
+    print(f"  json.loads + from_dict: {legacy * 1000:8.1f} ms")
+    print(f"  orjson bytes -> models: {fast * 1000:8.1f} ms ({legacy / fast:.1f}x)")
+
+
+def main() -> None:
+    """Run the benchmark."""
+    _report("containers.json", _scaled_body("containers.json"), DockerContainer)
+    _report("container_inspect.json", _scaled_body("container_inspect.json"), DockerInspect)
+
+
+if __name__ == "__main__":
+    main()
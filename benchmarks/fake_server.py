@@ -0,0 +1,61 @@
+"""In-process fake Portainer server used by the benchmarks."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from aiohttp import web
+
+if TYPE_CHECKING:
+    from asyncio import BaseTransport
+
+    from aiohttp.web import Request, Response
+
+
+@dataclass
+class FakePortainer:
+    """A minimal HTTP server that answers every GET with a fixed JSON body.
+
+    The server records each distinct TCP connection it accepts so benchmarks
+    can report how well the client reuses connections.
+    """
+
+    body: bytes = b"{}"
+    requests: int = 0
+    connections: set[BaseTransport] = field(default_factory=set)
+    _runner: web.AppRunner | None = None
+    _port: int = 0
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server."""
+        return f"http://127.0.0.1:{self._port}"
+
+    async def _handle(self, request: Request) -> Response:
+        """Answer a request with the configured body."""
+        self.requests += 1
+        if request.transport is not None:
+            self.connections.add(request.transport)
+        return web.Response(body=self.body, content_type="application/json")
+
+    async def start(self) -> None:
+        """Start the server on a free local port."""
+        app = web.Application()
+        app.router.add_route("GET", "/{tail:.*}", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        server = site._server  # pylint: disable=protected-access
+        self._port = server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+
+    async def stop(self) -> None:
+        """Stop the server."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    def reset(self) -> None:
+        """Reset the request and connection counters."""
+        self.requests = 0
+        self.connections.clear()
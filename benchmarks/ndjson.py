@@ -0,0 +1,63 @@
+"""Benchmark NDJSON framing throughput on bursty streams.
+
+Compares the former ``buffer += chunk`` / ``buffer.split`` loop with
+:class:`~pyportainer.streaming.NDJSONFramer` for a burst of Docker events,
+such as a mass redeploy delivering thousands of events in a few large chunks.
+
+Run with ``python -m benchmarks.ndjson``.
+"""
+
+from __future__ import annotations
+
+import timeit
+from functools import partial
+from pathlib import Path
+
+from pyportainer.streaming import NDJSONFramer
+
+FIXTURES = Path(__file__).parent.parent / "tests" / "fixtures"
+EVENTS = 20_000
+ROUNDS = 3
+
+
+def _split_loop(chunks: list[bytes]) -> int:
+    """Frame lines the way ``_stream_request`` used to."""
+    count = 0
+    buffer = b""
+    for chunk in chunks:
+        buffer += chunk
+        while b"\n" in buffer:
+            line, buffer = buffer.split(b"\n", 1)
+            if line.strip():
+                count += 1
+    return count
+
+
+def _framer(chunks: list[bytes]) -> int:
+    """Frame lines with the incremental framer."""
+    count = 0
+    framer = NDJSONFramer()
+    for chunk in chunks:
+        count += sum(1 for _ in framer.feed(chunk))
+    return count + len(framer.flush())
+
+
+def main() -> None:
+    """Run the benchmark."""
+    event = (FIXTURES / "docker_event.json").read_bytes().strip() + b"\n"
+    stream = event * EVENTS
+
+    for chunk_size in (64 * 1024, 1024 * 1024, len(stream)):
+        chunks = [stream[i : i + chunk_size] for i in range(0, len(stream), chunk_size)]
+        assert _split_loop(chunks) == _framer(chunks) == EVENTS  # noqa: S101
+
+        legacy = min(timeit.repeat(partial(_split_loop, chunks), number=1, repeat=ROUNDS))
+        framed = min(timeit.repeat(partial(_framer, chunks), number=1, repeat=ROUNDS))
+        size = len(stream) / 1024 / 1024
+        print(f"{EVENTS} events ({size:.1f} MiB) in {len(chunks)} chunk(s) of {chunk_size // 1024} KiB")
+        print(f"  split loop: {legacy * 1000:8.1f} ms ({size / legacy:8.1f} MiB/s)")
+        print(f"  framer    : {framed * 1000:8.1f} ms ({size / framed:8.1f} MiB/s)")
+
+
+if __name__ == "__main__":
+    main()
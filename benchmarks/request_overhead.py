@@ -0,0 +1,75 @@
+"""Benchmark the per-request overhead of the Portainer client.
+
+Measures two things against an in-process fake server:
+
+* the cost of preparing a request (URL and headers), comparing the former
+  per-call construction with the precomputed base URL and header template;
+* the end-to-end latency of sequential ``_request`` calls.
+
+Run with ``python -m benchmarks.request_overhead``.
+"""
+
+# pylint: disable=protected-access
+from __future__ import annotations
+
+import asyncio
+import time
+import timeit
+
+from yarl import URL
+
+from benchmarks.fake_server import FakePortainer
+from pyportainer import Portainer
+from pyportainer.pyportainer import VERSION
+
+ITERATIONS = 100_000
+REQUESTS = 2_000
+URI = "endpoints/1/docker/containers/json"
+
+
+def _prepare_per_call(portainer: Portainer) -> None:
+    """Prepare a request the way it was done before the headers and base URL were cached."""
+    URL.build(
+        scheme=portainer._api_scheme,
+        host=portainer._api_host,
+        port=portainer._api_port,
+        path=f"{portainer._api_base_path}/api/",
+    ).join(URL(URI))
+    _ = {
+        "Accept": "application/json, text/plain",
+        "User-Agent": f"PythonPortainer/{VERSION}",
+        "X-API-Key": portainer._api_key,
+    }
+
+
+def _prepare_cached(portainer: Portainer) -> None:
+    """Prepare a request using the precomputed base URL and header template."""
+    portainer._url(URI)
+    _ = portainer._headers
+
+
+async def main() -> None:
+    """Run the benchmark."""
+    server = FakePortainer(body=b"[]")
+    await server.start()
+
+    try:
+        async with Portainer(server.url, "key", max_retries=0) as portainer:
+            per_call = timeit.timeit(lambda: _prepare_per_call(portainer), number=ITERATIONS)
+            cached = timeit.timeit(lambda: _prepare_cached(portainer), number=ITERATIONS)
+
+            await portainer._request(URI)
+            start = time.perf_counter()
+            for _ in range(REQUESTS):
+                await portainer._request(URI)
+            elapsed = time.perf_counter() - start
+    finally:
+        await server.stop()
+
+    print(f"request preparation, per call : {per_call / ITERATIONS * 1e6:6.2f} µs")
+    print(f"request preparation, cached   : {cached / ITERATIONS * 1e6:6.2f} µs")
+    print(f"sequential _request round trip: {elapsed / REQUESTS * 1e6:6.1f} µs")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,58 @@
+"""Benchmark fleet-wide stats computation.
+
+Compares summarizing every container one at a time with
+:func:`~pyportainer.collector.container_stats_result` against a single
+:func:`~pyportainer.stats.compute_stats_batch` call, with and without NumPy,
+for a fleet of containers sampled at the same tick. The batch also computes
+the I/O rates against the previous samples, which the per-container summary
+does not, so both sides read the samples and the batch reads the previous
+ones too.
+
+Run with ``python -m benchmarks.stats_batch``.
+"""
+
+from __future__ import annotations
+
+import timeit
+from functools import partial
+from pathlib import Path
+
+from pyportainer.collector import container_stats_result
+from pyportainer.models.docker import DockerContainerStats
+from pyportainer.stats import _HAS_NUMPY, compute_stats_batch
+
+FIXTURES = Path(__file__).parent.parent / "tests" / "fixtures"
+CONTAINERS = 2_000
+ROUNDS = 5
+
+
+def _per_container(samples: list[DockerContainerStats]) -> int:
+    """Summarize every sample on its own."""
+    return len([container_stats_result(1, str(index), stats) for index, stats in enumerate(samples)])
+
+
+def _batch(samples: list[DockerContainerStats], previous: list[DockerContainerStats], *, use_numpy: bool) -> int:
+    """Summarize all samples in one batch, including I/O rates."""
+    return len(compute_stats_batch(samples, previous, use_numpy=use_numpy))
+
+
+def main() -> None:
+    """Run the benchmark."""
+    previous = [DockerContainerStats.from_json((FIXTURES / "container_stats.json").read_bytes()) for _ in range(CONTAINERS)]
+    samples = [DockerContainerStats.from_json((FIXTURES / "container_stats_2.json").read_bytes()) for _ in range(CONTAINERS)]
+
+    candidates = {
+        "per container": partial(_per_container, samples),
+        "batch (python)": partial(_batch, samples, previous, use_numpy=False),
+    }
+    if _HAS_NUMPY:
+        candidates["batch (numpy)"] = partial(_batch, samples, previous, use_numpy=True)
+
+    print(f"{CONTAINERS} containers")
+    for name, candidate in candidates.items():
+        elapsed = min(timeit.repeat(candidate, number=1, repeat=ROUNDS))
+        print(f"  {name:<15}: {elapsed * 1000:7.1f} ms ({CONTAINERS / elapsed:9.0f} containers/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,31 +1,66 @@
 """Asynchronous Python client for Python Portainer."""
 
+from .cache import PortainerResponseCache
+from .collector import PortainerContainerStatsResult, PortainerStatsCollector, PortainerStatsSnapshot, StatsCallback
 from .exceptions import (
     PortainerAuthenticationError,
     PortainerConnectionError,
     PortainerError,
     PortainerTimeoutError,
 )
-from .listener import EventListenerCallback, PortainerEventListener, PortainerEventListenerResult
+from .listener import (
+    EventListenerCallback,
+    EventOverflowPolicy,
+    EventStreamState,
+    PortainerEventListener,
+    PortainerEventListenerResult,
+    PortainerEventQueueStats,
+    PortainerEventStreamHealth,
+    PortainerEventSubscription,
+)
 from .models.docker import DockerContainerState, DockerDFType, DockerHealthStatus, EndpointStatus, StackStatus, StackType
+from .pull import ImagePullTracker
 from .pyportainer import Portainer
-from .watcher import PortainerImageWatcher, WatcherCallback
+from .stats import ContainerCPUSample, ContainerSampleCache, ContainerStatsBatch, ContainerStatsHistory
+from .store import JSONWatcherStore, SQLiteWatcherStore, WatcherStore
+from .transport import PortainerTransportConfig
+from .watcher import ChangeSetCallback, PortainerImageWatcher, WatcherCallback
 
 __all__ = [
+    "ChangeSetCallback",
+    "ContainerCPUSample",
+    "ContainerSampleCache",
+    "ContainerStatsBatch",
+    "ContainerStatsHistory",
     "DockerContainerState",
     "DockerDFType",
     "DockerHealthStatus",
     "EndpointStatus",
     "EventListenerCallback",
+    "EventOverflowPolicy",
+    "EventStreamState",
+    "ImagePullTracker",
+    "JSONWatcherStore",
     "Portainer",
     "PortainerAuthenticationError",
     "PortainerConnectionError",
+    "PortainerContainerStatsResult",
     "PortainerError",
     "PortainerEventListener",
     "PortainerEventListenerResult",
+    "PortainerEventQueueStats",
+    "PortainerEventStreamHealth",
+    "PortainerEventSubscription",
     "PortainerImageWatcher",
+    "PortainerResponseCache",
+    "PortainerStatsCollector",
+    "PortainerStatsSnapshot",
     "PortainerTimeoutError",
+    "PortainerTransportConfig",
+    "SQLiteWatcherStore",
     "StackStatus",
     "StackType",
+    "StatsCallback",
     "WatcherCallback",
+    "WatcherStore",
 ]
@@ -0,0 +1,169 @@
+"""Time-to-live response cache for read-only Portainer calls."""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import timedelta
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+DEFAULT_CACHE_TTLS: Mapping[str, timedelta] = MappingProxyType(
+    {
+        "get_endpoints": timedelta(seconds=60),
+        "docker_version": timedelta(minutes=10),
+        "docker_info": timedelta(seconds=30),
+        "portainer_system_status": timedelta(minutes=5),
+        "get_stacks": timedelta(seconds=30),
+        "get_image": timedelta(seconds=60),
+    }
+)
+
+# (method name, endpoint ID, request URL, query parameters)
+CacheKey = tuple[str, int | None, str, tuple[tuple[str, Any], ...]]
+
+
+@dataclass(slots=True)
+class _CacheEntry:
+    """A cached response body and the moment it expires."""
+
+    body: bytes | None
+    expires: float
+
+
+class PortainerResponseCache:
+    """Bounded LRU cache for the raw responses of read-only Portainer calls.
+
+    Each cacheable client method has its own time-to-live. Raw response bodies
+    are cached rather than models, so every caller still receives its own
+    freshly decoded objects. When the cache is full, the least recently used
+    entry is evicted.
+
+    Pass an instance to :class:`~pyportainer.Portainer` to enable caching.
+    Mutating calls on the client invalidate the affected entries automatically.
+
+    Every invalidation bumps a generation. A response read while its entries
+    were invalidated may predate the change, so it is not stored.
+    """
+
+    def __init__(self, *, max_size: int = 256, ttls: Mapping[str, timedelta] | None = None) -> None:
+        """Initialize the PortainerResponseCache.
+
+        Args:
+        ----
+            max_size: The maximum number of cached responses.
+            ttls: Time-to-live per client method name, e.g.
+                ``{"docker_info": timedelta(seconds=10)}``. Merged over
+                :data:`DEFAULT_CACHE_TTLS`; a zero TTL disables caching for
+                that method.
+
+        """
+        self._max_size = max_size
+        self._ttls = {**DEFAULT_CACHE_TTLS, **(ttls or {})}
+        self._entries: OrderedDict[CacheKey, _CacheEntry] = OrderedDict()
+        self._generation = 0
+        self._endpoint_generations: dict[int, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached responses."""
+        return len(self._entries)
+
+    def enabled(self, method: str) -> bool:
+        """Return whether responses of a client method are cached.
+
+        Args:
+        ----
+            method: The name of the client method.
+
+        """
+        ttl = self._ttls.get(method)
+        return ttl is not None and ttl.total_seconds() > 0
+
+    def generation(self, endpoint_id: int | None) -> int:
+        """Return the invalidation generation of the entries of an endpoint.
+
+        Take it before reading a response, and pass it to :meth:`set`.
+
+        Args:
+        ----
+            endpoint_id: The endpoint of the entries, or None for entries
+                that are not scoped to an endpoint.
+
+        """
+        if endpoint_id is None:
+            return self._generation
+        return self._generation + self._endpoint_generations.get(endpoint_id, 0)
+
+    def get(self, key: CacheKey) -> tuple[bool, bytes | None]:
+        """Look up a cached response body.
+
+        Args:
+        ----
+            key: The cache key of the request.
+
+        Returns:
+        -------
+            A ``(found, body)`` tuple. The body may be None for cached empty responses.
+
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry.expires <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, entry.body
+
+    def set(self, key: CacheKey, body: bytes | None, *, generation: int | None = None) -> None:
+        """Store a response body, evicting the least recently used entry when full.
+
+        Args:
+        ----
+            key: The cache key of the request.
+            body: The raw response body.
+            generation: The :meth:`generation` of the endpoint of the key,
+                taken before the response was read. If its entries were
+                invalidated since, the body is not stored.
+
+        """
+        if generation is not None and generation != self.generation(key[1]):
+            return
+
+        ttl = self._ttls[key[0]].total_seconds()
+        self._entries[key] = _CacheEntry(body=body, expires=time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, *, method: str | None = None, endpoint_id: int | None = None) -> None:
+        """Drop cached responses.
+
+        Without arguments, the whole cache is cleared. Otherwise only entries
+        matching every given filter are dropped.
+
+        Args:
+        ----
+            method: Only drop responses of this client method.
+            endpoint_id: Only drop responses for this endpoint.
+
+        """
+        if endpoint_id is None:
+            self._generation += 1
+        else:
+            self._endpoint_generations[endpoint_id] = self._endpoint_generations.get(endpoint_id, 0) + 1
+
+        if method is None and endpoint_id is None:
+            self._entries.clear()
+            return
+
+        for key in [key for key in self._entries if (method is None or key[0] == method) and (endpoint_id is None or key[1] == endpoint_id)]:
+            del self._entries[key]
@@ -0,0 +1,449 @@
+"""Background container stats collector."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from collections.abc import Awaitable, Callable, Mapping
+from contextlib import AbstractAsyncContextManager, nullcontext
+from dataclasses import dataclass, field
+from datetime import timedelta
+from types import MappingProxyType
+from typing import TYPE_CHECKING
+
+from pyportainer.exceptions import PortainerAuthenticationError, PortainerError, PortainerNotFoundError
+from pyportainer.listener import PortainerEventListener
+from pyportainer.models.docker import EndpointStatus
+from pyportainer.stats import ContainerStatsHistory, block_io_bytes, compute_stats_batch, memory_usage, network_bytes, read_time
+
+if TYPE_CHECKING:
+    from pyportainer.listener import PortainerEventListenerResult
+    from pyportainer.models.docker import DockerContainerStats
+    from pyportainer.pyportainer import Portainer
+
+
+_LOGGER = logging.getLogger(__name__)
+
+StatsCallback = Callable[["PortainerStatsSnapshot"], Awaitable[None] | None]
+
+
+@dataclass(frozen=True, slots=True)
+class PortainerContainerStatsResult:  # pylint: disable=too-many-instance-attributes
+    """Represents the resource usage of a single container, from its latest stats sample.
+
+    Network and block I/O bytes are cumulative since the container started.
+    Their rates are bytes per second since the previous tick, and 0.0 on the
+    first tick of a container.
+    """
+
+    endpoint_id: int
+    container_id: str
+    read: str = ""
+    cpu_percentage: float = 0.0
+    memory_usage: int = 0
+    memory_limit: int = 0
+    memory_percentage: float = 0.0
+    network_rx_bytes: int = 0
+    network_tx_bytes: int = 0
+    block_read_bytes: int = 0
+    block_write_bytes: int = 0
+    network_rx_rate: float = 0.0
+    network_tx_rate: float = 0.0
+    block_read_rate: float = 0.0
+    block_write_rate: float = 0.0
+
+
+@dataclass(frozen=True)
+class PortainerStatsSnapshot:
+    """Immutable view of the resource usage of all collected containers at a single tick."""
+
+    taken_at: float = 0.0
+    results: Mapping[tuple[int, str], PortainerContainerStatsResult] = field(default_factory=lambda: MappingProxyType({}))
+
+    def __len__(self) -> int:
+        """Return the number of containers."""
+        return len(self.results)
+
+    def get(self, endpoint_id: int, container_id: str) -> PortainerContainerStatsResult | None:
+        """Return the result of a container, or None if it has none."""
+        return self.results.get((endpoint_id, container_id))
+
+
+def container_stats_result(endpoint_id: int, container_id: str, stats: DockerContainerStats) -> PortainerContainerStatsResult:
+    """Summarize a stats sample the way ``docker stats`` does.
+
+    CPU usage is taken from the difference with ``precpu_stats``, which the
+    Docker daemon fills in on streamed samples. Memory usage excludes the
+    inactive page cache.
+
+    Args:
+    ----
+        endpoint_id: The ID of the endpoint of the container.
+        container_id: The ID of the container.
+        stats: The stats sample of the container.
+
+    Returns:
+    -------
+        The resource usage of the container.
+
+    """
+    cpu = stats.cpu_stats
+    cpu_percentage = 0.0
+    if stats.precpu_stats is not None:
+        cpu_delta = cpu.cpu_usage.total_usage - stats.precpu_stats.cpu_usage.total_usage
+        system_delta = cpu.system_cpu_usage - stats.precpu_stats.system_cpu_usage
+        if cpu_delta > 0 and system_delta > 0:
+            online_cpus = cpu.online_cpus or len(cpu.cpu_usage.percpu_usage) or 1
+            cpu_percentage = cpu_delta / system_delta * online_cpus * 100.0
+
+    usage = memory_usage(stats)
+    limit = stats.memory_stats.limit
+    network_rx, network_tx = network_bytes(stats)
+    block_read, block_write = block_io_bytes(stats)
+
+    return PortainerContainerStatsResult(
+        endpoint_id=endpoint_id,
+        container_id=container_id,
+        read=stats.read,
+        cpu_percentage=cpu_percentage,
+        memory_usage=usage,
+        memory_limit=limit,
+        memory_percentage=usage / limit * 100.0 if limit else 0.0,
+        network_rx_bytes=network_rx,
+        network_tx_bytes=network_tx,
+        block_read_bytes=block_read,
+        block_write_bytes=block_write,
+    )
+
+
+class PortainerStatsCollector:
+    """Collects the resource usage of every running container, on one or all endpoints.
+
+    Every running container gets its own long-lived stats stream. Containers
+    that start or stop are followed through the Docker events stream, and the
+    container list is reconciled every ``resync_interval`` in case an event
+    was missed. Once per ``interval``, the latest sample of every container is
+    summarized into a single :class:`PortainerStatsSnapshot`.
+
+    A stats stream that fails is reopened with exponential backoff, until the
+    container stops.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        portainer: Portainer,
+        endpoint_id: int | None = None,
+        interval: timedelta = timedelta(seconds=5),
+        *,
+        debug: bool = False,
+        max_concurrency: int | None = 10,
+        resync_interval: timedelta = timedelta(minutes=5),
+        history_size: int | None = None,
+        reconnect_interval: timedelta = timedelta(seconds=5),
+        max_reconnect_interval: timedelta = timedelta(minutes=5),
+    ) -> None:
+        """Initialize the PortainerStatsCollector.
+
+        Args:
+        ----
+            portainer: An authenticated Portainer client instance.
+            endpoint_id: The ID of the endpoint whose containers to collect. If
+                None, all endpoints that are not down are collected.
+            interval: How often to publish a snapshot. Defaults to 5 seconds.
+            debug: Enable debug logging.
+            max_concurrency: Maximum number of stats streams being opened at
+                once. Limits the burst of requests when hundreds of containers
+                are found at the same time. None means unlimited.
+            resync_interval: How often to reconcile the streams with the list
+                of running containers.
+            history_size: Keep the last this many samples of every container
+                in a :class:`~pyportainer.stats.ContainerStatsHistory`, for
+                rolling rates and averages. None keeps no history.
+            reconnect_interval: The shortest wait before reopening a stats
+                stream that failed.
+            max_reconnect_interval: The longest wait before reopening a stats
+                stream that failed.
+
+        """
+        self._portainer = portainer
+        self._endpoint_id = endpoint_id
+        self._interval = interval
+        self._resync_interval = resync_interval
+        self._reconnect_interval = reconnect_interval
+        self._max_reconnect_interval = max_reconnect_interval
+        self._connect_limit = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+        self._task: asyncio.Task[None] | None = None
+        self._resync_task: asyncio.Task[None] | None = None
+        self._streams: dict[tuple[int, str], asyncio.Task[None]] = {}
+        self._latest: dict[tuple[int, str], DockerContainerStats] = {}
+        self._ticked: dict[tuple[int, str], DockerContainerStats] = {}
+        self._history_size = history_size
+        self._histories: dict[tuple[int, str], ContainerStatsHistory] = {}
+        self._snapshot = PortainerStatsSnapshot()
+        self._callbacks: list[StatsCallback] = []
+        self._listener: PortainerEventListener | None = None
+
+        _LOGGER.setLevel(logging.DEBUG if debug else logging.INFO)
+
+    @property
+    def interval(self) -> timedelta:
+        """Snapshot interval."""
+        return self._interval
+
+    @interval.setter
+    def interval(self, value: timedelta) -> None:
+        """Update the snapshot interval. Takes effect after the next tick."""
+        self._interval = value
+
+    @property
+    def snapshot(self) -> PortainerStatsSnapshot:
+        """The snapshot published at the last tick."""
+        return self._snapshot
+
+    @property
+    def containers(self) -> set[tuple[int, str]]:
+        """The ``(endpoint_id, container_id)`` pairs with an open stats stream."""
+        return {key for key, task in self._streams.items() if not task.done()}
+
+    def history(self, endpoint_id: int, container_id: str) -> ContainerStatsHistory | None:
+        """Return the sample history of a container.
+
+        Only kept when ``history_size`` is set, and dropped when the container stops.
+        """
+        return self._histories.get((endpoint_id, container_id))
+
+    def start(self) -> None:
+        """Start collecting.
+
+        Must be called from within a running asyncio event loop.
+        """
+        if self._listener is None:
+            self._listener = PortainerEventListener(self._portainer, self._endpoint_id, event_types=["container"])
+            for action in ("start", "die", "destroy"):
+                self._listener.subscribe(self._on_event, event_type="container", action=action)
+        self._listener.start()
+
+        if self._resync_task is None or self._resync_task.done():
+            self._resync_task = asyncio.create_task(self._run_resync())
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        """Stop collecting and close all stats streams."""
+        for task in (self._task, self._resync_task):
+            if task and not task.done():
+                task.cancel()
+        if self._listener is not None:
+            self._listener.stop()
+        for key in list(self._streams):
+            self._close_stream(key)
+
+    def register_callback(self, callback: StatsCallback) -> None:
+        """Register a callback to be invoked with the snapshot of every tick.
+
+        Both synchronous and async callables are supported. The callback
+        receives a single :class:`PortainerStatsSnapshot` argument. Duplicate
+        registrations are silently ignored.
+
+        Args:
+        ----
+            callback: A sync or async callable that accepts a
+                :class:`PortainerStatsSnapshot`.
+
+        """
+        if callback not in self._callbacks:
+            self._callbacks.append(callback)
+
+    def unregister_callback(self, callback: StatsCallback) -> None:
+        """Remove a previously registered callback.
+
+        Args:
+        ----
+            callback: The callable to remove. Raises :exc:`ValueError` if it was not registered.
+
+        """
+        self._callbacks.remove(callback)
+
+    async def _fire_callbacks(self, snapshot: PortainerStatsSnapshot) -> None:
+        """Invoke all registered callbacks.
+
+        Exceptions raised by individual callbacks are logged but not blocking.
+        """
+        for callback in list(self._callbacks):
+            try:
+                ret = callback(snapshot)
+                if asyncio.iscoroutine(ret):
+                    await ret
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Stats callback raised an exception")
+
+    async def _tick(self) -> None:
+        """Summarize the latest sample of every container in one batch and publish the snapshot.
+
+        Rates are taken against the samples of the previous tick.
+        """
+        keys = list(self._latest)
+        samples = list(self._latest.values())
+        batch = compute_stats_batch(samples, [self._ticked.get(key) for key in keys])
+        self._ticked = dict(self._latest)
+
+        self._snapshot = PortainerStatsSnapshot(
+            taken_at=time.time(),
+            results=MappingProxyType(
+                {
+                    key: PortainerContainerStatsResult(
+                        endpoint_id=key[0],
+                        container_id=key[1],
+                        read=samples[index].read,
+                        cpu_percentage=batch.cpu_percentage[index],
+                        memory_usage=batch.memory_usage[index],
+                        memory_limit=batch.memory_limit[index],
+                        memory_percentage=batch.memory_percentage[index],
+                        network_rx_bytes=batch.network_rx_bytes[index],
+                        network_tx_bytes=batch.network_tx_bytes[index],
+                        block_read_bytes=batch.block_read_bytes[index],
+                        block_write_bytes=batch.block_write_bytes[index],
+                        network_rx_rate=batch.network_rx_rate[index],
+                        network_tx_rate=batch.network_tx_rate[index],
+                        block_read_rate=batch.block_read_rate[index],
+                        block_write_rate=batch.block_write_rate[index],
+                    )
+                    for index, key in enumerate(keys)
+                },
+            ),
+        )
+        await self._fire_callbacks(self._snapshot)
+
+    async def _run(self) -> None:
+        """Loop that publishes a snapshot every interval."""
+        while True:
+            await asyncio.sleep(self._interval.total_seconds())
+            await self._tick()
+
+    async def _run_resync(self) -> None:
+        """Loop that reconciles the streams with the running containers every ``resync_interval``."""
+        while True:
+            try:
+                await self._resync()
+            except PortainerError:
+                _LOGGER.exception("Error while listing the containers to collect stats for")
+            await asyncio.sleep(self._resync_interval.total_seconds())
+
+    async def _endpoint_ids(self) -> list[int]:
+        """Return the IDs of the endpoints to collect."""
+        if self._endpoint_id is not None:
+            return [self._endpoint_id]
+
+        endpoints = await self._portainer.get_endpoints()
+        return [endpoint.id for endpoint in endpoints if endpoint.status != EndpointStatus.DOWN]
+
+    async def _resync(self) -> None:
+        """Open streams for running containers without one and close those of all others.
+
+        All endpoints are listed concurrently. Streams on an endpoint whose
+        containers could not be listed are left as they are.
+        """
+        endpoint_ids = await self._endpoint_ids()
+        running: set[tuple[int, str]] = set()
+        unlisted: set[int] = set()
+        for endpoint_id, container_ids in zip(
+            endpoint_ids, await asyncio.gather(*(self._running_containers(endpoint_id) for endpoint_id in endpoint_ids)), strict=True
+        ):
+            if container_ids is None:
+                unlisted.add(endpoint_id)
+            else:
+                running.update((endpoint_id, container_id) for container_id in container_ids)
+
+        for key in self._streams.keys() - running:
+            if key[0] not in unlisted:
+                self._close_stream(key)
+        for key in running:
+            self._open_stream(key)
+
+        _LOGGER.debug("Collecting stats for %d containers", len(self._streams))
+
+    async def _running_containers(self, endpoint_id: int) -> list[str] | None:
+        """Return the IDs of the running containers of an endpoint, or None if they could not be listed."""
+        try:
+            containers = await self._portainer.get_containers(endpoint_id)
+        except PortainerError:
+            _LOGGER.warning("Failed to list the containers of endpoint %s, keeping its streams", endpoint_id)
+            return None
+        return [container.id for container in containers if container.state == "running"]
+
+    def _on_event(self, result: PortainerEventListenerResult) -> None:
+        """Open or close the stats stream of a container that started or stopped."""
+        event = result.event
+        if event.actor is None or event.actor.id is None:
+            return
+
+        key = (result.endpoint_id, event.actor.id)
+        if event.action == "start":
+            self._open_stream(key)
+        else:
+            self._close_stream(key)
+
+    def _open_stream(self, key: tuple[int, str]) -> None:
+        """Start the stats stream of a container, unless it is already open."""
+        task = self._streams.get(key)
+        if task is None or task.done():
+            self._streams[key] = asyncio.create_task(self._stream(key))
+
+    def _close_stream(self, key: tuple[int, str]) -> None:
+        """Cancel the stats stream of a container and drop its latest sample."""
+        if (task := self._streams.pop(key, None)) is not None:
+            task.cancel()
+        self._latest.pop(key, None)
+        self._histories.pop(key, None)
+
+    async def _stream(self, key: tuple[int, str]) -> None:
+        """Keep the latest stats sample of a container until its stream ends.
+
+        Only opening the stream counts against ``max_concurrency``; once the
+        first sample has arrived, the slot is released for the next container.
+
+        A stream that fails is reopened after a backoff with decorrelated
+        jitter between ``reconnect_interval`` and ``max_reconnect_interval``,
+        which restarts once samples flow again. Authentication errors and
+        containers that no longer exist end the stream.
+        """
+        endpoint_id, container_id = key
+        limit: AbstractAsyncContextManager[object] = self._connect_limit or nullcontext()
+        history = None
+        if self._history_size:
+            history = self._histories[key] = ContainerStatsHistory(self._history_size)
+        base = self._reconnect_interval.total_seconds()
+        delay = base
+        try:
+            while True:
+                received = False
+                samples = self._portainer.stream_container_stats(endpoint_id, container_id)
+                try:
+                    async with limit:
+                        stats = await anext(samples, None)
+                    while stats is not None:
+                        received = True
+                        self._latest[key] = stats
+                        if history is not None:
+                            history.append(stats, timestamp=read_time(stats) or None)
+                        stats = await anext(samples, None)
+                except (PortainerAuthenticationError, PortainerNotFoundError) as err:
+                    _LOGGER.debug("Stats stream of container %s on endpoint %s failed: %s", container_id, endpoint_id, err)
+                    return
+                except PortainerError as err:
+                    delay = min(self._max_reconnect_interval.total_seconds(), random.uniform(base, (base if received else delay) * 3))  # noqa: S311
+                    _LOGGER.debug("Stats stream of container %s on endpoint %s failed, reopening in %.1fs: %s", container_id, endpoint_id, delay, err)
+                else:
+                    return
+                finally:
+                    await samples.aclose()
+
+                self._latest.pop(key, None)
+                await asyncio.sleep(delay)
+        finally:
+            if self._streams.get(key) is asyncio.current_task():
+                del self._streams[key]
+                self._latest.pop(key, None)
+                self._histories.pop(key, None)
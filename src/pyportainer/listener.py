@@ -4,14 +4,22 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from collections.abc import Awaitable, Callable
-from dataclasses import dataclass
-from datetime import timedelta
+import random
+import time
+from collections import Counter, deque
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass, field, replace
+from datetime import UTC, datetime, timedelta
+from enum import StrEnum
+from types import MappingProxyType
 from typing import TYPE_CHECKING
 
 from pyportainer.exceptions import PortainerAuthenticationError, PortainerConnectionError, PortainerError, PortainerTimeoutError
+from pyportainer.models.docker import EndpointStatus
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+
     from pyportainer.models.docker import DockerEvent
     from pyportainer.pyportainer import Portainer
 
@@ -20,6 +28,35 @@ _LOGGER = logging.getLogger(__name__)
 
 EventListenerCallback = Callable[["PortainerEventListenerResult"], Awaitable[None] | None]
 
+# (type, action, actor ID) of an event
+_EventKey = tuple[str | None, str | None, str | None]
+# (endpoint ID, type, action, actor attribute) a subscription is indexed on
+_IndexKey = tuple[int | None, str | None, str | None, tuple[str, str] | None]
+
+
+class EventOverflowPolicy(StrEnum):
+    """What to do with a new event when the queue of an endpoint is full."""
+
+    BLOCK = "block"
+    """Stop reading the stream until the callbacks have caught up."""
+    DROP_OLDEST = "drop_oldest"
+    """Drop the oldest queued event to make room."""
+    COALESCE = "coalesce"
+    """Replace a queued event for the same actor and action, else drop the oldest."""
+
+
+class EventStreamState(StrEnum):
+    """Connection state of the event stream of an endpoint."""
+
+    CONNECTING = "connecting"
+    """The first connection attempt is in progress."""
+    CONNECTED = "connected"
+    """Events are being received."""
+    RECONNECTING = "reconnecting"
+    """The connection failed and is retried after a backoff."""
+    STOPPED = "stopped"
+    """The stream gave up after a fatal error, e.g. an authentication error."""
+
 
 @dataclass(frozen=True)
 class PortainerEventListenerResult:
@@ -29,12 +66,218 @@ class PortainerEventListenerResult:
     event: DockerEvent
 
 
+@dataclass(frozen=True)
+class PortainerEventStreamHealth:
+    """Represents the connection health of the event stream of a single endpoint."""
+
+    state: EventStreamState
+    failures: int = 0
+    last_error: str | None = None
+    retry_in: float | None = None
+
+
+@dataclass(frozen=True, eq=False)
+class PortainerEventSubscription:
+    """Represents a callback subscribed to a subset of the Docker events.
+
+    Fields that are None match any value. All ``attributes`` must be present
+    on the actor of an event, with the same value.
+    """
+
+    callback: EventListenerCallback
+    endpoint_id: int | None = None
+    event_type: str | None = None
+    action: str | None = None
+    attributes: Mapping[str, str] = field(default_factory=lambda: MappingProxyType({}))
+
+    def matches(self, endpoint_id: int, event: DockerEvent) -> bool:
+        """Return whether an event from an endpoint matches this subscription."""
+        if self.endpoint_id is not None and self.endpoint_id != endpoint_id:
+            return False
+        if self.event_type is not None and self.event_type != event.type:
+            return False
+        if self.action is not None and self.action != event.action:
+            return False
+        if not self.attributes:
+            return True
+        actor_attributes = (event.actor.attributes if event.actor else None) or {}
+        return all(actor_attributes.get(name) == value for name, value in self.attributes.items())
+
+
+@dataclass(frozen=True)
+class PortainerEventQueueStats:
+    """Represents the state of the event queue of a single endpoint."""
+
+    depth: int
+    peak: int
+    dropped: int
+    coalesced: int
+
+
+class _EventQueue:
+    """Bounded FIFO of events for one endpoint, applying an overflow policy when full."""
+
+    def __init__(self, maxsize: int, overflow: EventOverflowPolicy) -> None:
+        self._items: deque[PortainerEventListenerResult] = deque()
+        self._maxsize = maxsize
+        self._overflow = overflow
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+        self.peak = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    async def put(self, item: PortainerEventListenerResult) -> None:
+        while len(self._items) >= self._maxsize:
+            if self._overflow is EventOverflowPolicy.BLOCK:
+                self._not_full.clear()
+                await self._not_full.wait()
+                continue
+            if self._overflow is EventOverflowPolicy.COALESCE and self._coalesce(item):
+                return
+            self._items.popleft()
+            self.dropped += 1
+
+        self._items.append(item)
+        self.peak = max(self.peak, len(self._items))
+        self._not_empty.set()
+
+    def _coalesce(self, item: PortainerEventListenerResult) -> bool:
+        """Replace a queued event for the same actor and action, keeping its position."""
+        key = _event_key(item.event)
+        for index, queued in enumerate(self._items):
+            if _event_key(queued.event) == key:
+                self._items[index] = item
+                self.coalesced += 1
+                return True
+        return False
+
+    async def get(self) -> PortainerEventListenerResult:
+        while not self._items:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        item = self._items.popleft()
+        self._not_full.set()
+        return item
+
+    def stats(self) -> PortainerEventQueueStats:
+        return PortainerEventQueueStats(depth=len(self._items), peak=self.peak, dropped=self.dropped, coalesced=self.coalesced)
+
+
+class _SubscriptionIndex:
+    """Subscriptions indexed on endpoint, type, action and one actor attribute.
+
+    Each subscription is stored in a single bucket. An event only looks up the
+    buckets it can match, instead of testing every subscription.
+    """
+
+    def __init__(self) -> None:
+        self._buckets: dict[_IndexKey, dict[PortainerEventSubscription, int]] = {}
+        self._attribute_names: Counter[str] = Counter()
+        self._subscriptions: dict[PortainerEventSubscription, int] = {}
+        self._sequence = 0
+
+    def __len__(self) -> int:
+        return len(self._subscriptions)
+
+    def __iter__(self) -> Iterator[PortainerEventSubscription]:
+        return iter(self._subscriptions)
+
+    @staticmethod
+    def _key(subscription: PortainerEventSubscription) -> _IndexKey:
+        attribute = min(subscription.attributes.items()) if subscription.attributes else None
+        return subscription.endpoint_id, subscription.event_type, subscription.action, attribute
+
+    def add(self, subscription: PortainerEventSubscription) -> None:
+        self._sequence += 1
+        self._subscriptions[subscription] = self._sequence
+        key = self._key(subscription)
+        self._buckets.setdefault(key, {})[subscription] = self._sequence
+        if key[3] is not None:
+            self._attribute_names[key[3][0]] += 1
+
+    def remove(self, subscription: PortainerEventSubscription) -> None:
+        del self._subscriptions[subscription]
+        key = self._key(subscription)
+        bucket = self._buckets[key]
+        del bucket[subscription]
+        if not bucket:
+            del self._buckets[key]
+        if key[3] is not None:
+            self._attribute_names[key[3][0]] -= 1
+            if not self._attribute_names[key[3][0]]:
+                del self._attribute_names[key[3][0]]
+
+    def match(self, endpoint_id: int, event: DockerEvent) -> list[PortainerEventSubscription]:
+        """Return the subscriptions matching an event, in the order they were added."""
+        if not self._buckets:
+            return []
+
+        actor_attributes = (event.actor.attributes if event.actor else None) or {}
+        attributes: list[tuple[str, str] | None] = [None]
+        attributes.extend((name, actor_attributes[name]) for name in self._attribute_names if name in actor_attributes)
+
+        matched: dict[PortainerEventSubscription, int] = {}
+        for endpoint in dict.fromkeys((endpoint_id, None)):
+            for event_type in dict.fromkeys((event.type, None)):
+                for action in dict.fromkeys((event.action, None)):
+                    for attribute in attributes:
+                        bucket = self._buckets.get((endpoint, event_type, action, attribute))
+                        if bucket:
+                            matched.update(bucket)
+
+        if attributes[1:]:
+            matched = {subscription: order for subscription, order in matched.items() if subscription.matches(endpoint_id, event)}
+        return sorted(matched, key=matched.__getitem__)
+
+
+def _event_key(event: DockerEvent) -> _EventKey:
+    return event.type, event.action, event.actor.id if event.actor else None
+
+
+def _event_time(event: DockerEvent) -> int | None:
+    """Return the time of an event in nanoseconds, if known."""
+    if event.time_nano is not None:
+        return event.time_nano
+    if event.time is not None:
+        return event.time * 1_000_000_000
+    return None
+
+
+@dataclass(slots=True)
+class _EventCursor:
+    """Time of the last event seen on an endpoint, and the events seen at that exact time."""
+
+    time_nano: int
+    keys: set[_EventKey]
+
+    def seen(self, time_nano: int, key: _EventKey) -> bool:
+        """Return whether an event was already delivered before the stream was resumed."""
+        return time_nano < self.time_nano or (time_nano == self.time_nano and key in self.keys)
+
+    def advance(self, time_nano: int, key: _EventKey) -> None:
+        """Move the cursor to a newly delivered event."""
+        if time_nano > self.time_nano:
+            self.time_nano = time_nano
+            self.keys = {key}
+        elif time_nano == self.time_nano:
+            self.keys.add(key)
+
+
 class PortainerEventListener:
     """Maintains persistent streaming connections to Docker event endpoints.
 
-    One streaming connection is opened per endpoint. Events are delivered to
+    One streaming connection is opened per endpoint. When listening to all
+    endpoints, the endpoint list is reconciled every ``discovery_interval``:
+    streams are started for new endpoints and stopped for removed ones or
+    those that are down. Events are delivered to
     registered callbacks as they arrive, in real time. If a connection drops,
-    it is automatically re-established after ``reconnect_interval``.
+    it is automatically re-established with exponential backoff and resumes
+    from the last event received, so no events are missed.
     """
 
     def __init__(  # pylint: disable=too-many-arguments,too-many-instance-attributes
@@ -45,6 +288,11 @@ class PortainerEventListener:
         event_types: list[str] | None = None,
         reconnect_interval: timedelta = timedelta(seconds=5),
         debug: bool = False,
+        queue_size: int | None = None,
+        overflow: EventOverflowPolicy = EventOverflowPolicy.BLOCK,
+        resume: bool = True,
+        discovery_interval: timedelta = timedelta(seconds=60),
+        max_reconnect_interval: timedelta = timedelta(minutes=5),
     ) -> None:
         """Initialize the PortainerEventListener.
 
@@ -56,9 +304,21 @@ class PortainerEventListener:
             event_types: Docker event types to filter on, e.g.
                 ``["container", "image"]``. If None, all event types are
                 delivered.
-            reconnect_interval: How long to wait before reconnecting after a
-                dropped connection. Defaults to 5 seconds.
+            reconnect_interval: The shortest wait before reconnecting after a
+                dropped connection. Defaults to 5 seconds. Consecutive failures
+                back off exponentially with decorrelated jitter.
             debug: Enable debug logging.
+            queue_size: Decouple reading the stream from running the callbacks
+                with a queue of this size per endpoint. A worker task per
+                endpoint delivers the queued events in order. If None, callbacks
+                run inline and a slow callback delays reading the stream.
+            overflow: What to do with new events when a queue is full.
+            resume: After a reconnect, replay the events emitted while the
+                connection was down, skipping those already delivered.
+            discovery_interval: How often to refresh the endpoint list when
+                listening to all endpoints. Endpoints with status DOWN are
+                skipped until they come back up.
+            max_reconnect_interval: The longest wait before reconnecting.
 
         """
         self._portainer = portainer
@@ -67,6 +327,21 @@ class PortainerEventListener:
         self._reconnect_interval = reconnect_interval
         self._task: asyncio.Task[None] | None = None
         self._callbacks: list[EventListenerCallback] = []
+        self._queue_size = queue_size
+        self._overflow = EventOverflowPolicy(overflow)
+        self._queues: dict[int, _EventQueue] = {}
+        self._workers: dict[int, asyncio.Task[None]] = {}
+        self._resume = resume
+        self._cursors: dict[int, _EventCursor] = {}
+        self._discovery_interval = discovery_interval
+        self._streams: dict[int, asyncio.Task[None]] = {}
+        self._max_reconnect_interval = max_reconnect_interval
+        self._health: dict[int, PortainerEventStreamHealth] = {}
+        self._connected_at: dict[int, float] = {}
+        self._receiving: set[int] = set()
+        self._subscriptions = _SubscriptionIndex()
+        self._connections: dict[int, asyncio.Task[None]] = {}
+        self._active_filters: dict[int, dict[str, list[str]] | None] = {}
 
         _LOGGER.setLevel(logging.DEBUG if debug else logging.INFO)
 
@@ -83,6 +358,29 @@ class PortainerEventListener:
         """Stop all streaming connections."""
         if self._task and not self._task.done():
             self._task.cancel()
+        for endpoint_id in list(self._streams):
+            self._stop_stream(endpoint_id)
+        for worker in self._workers.values():
+            worker.cancel()
+        self._workers.clear()
+
+    @property
+    def endpoint_ids(self) -> set[int]:
+        """IDs of the endpoints with an active stream."""
+        return {endpoint_id for endpoint_id, task in self._streams.items() if not task.done()}
+
+    @property
+    def queue_stats(self) -> dict[int, PortainerEventQueueStats]:
+        """Depth, peak depth and overflow counters of the event queue per endpoint.
+
+        Empty unless ``queue_size`` is set.
+        """
+        return {endpoint_id: queue.stats() for endpoint_id, queue in self._queues.items()}
+
+    @property
+    def health(self) -> dict[int, PortainerEventStreamHealth]:
+        """Connection health of the event stream per endpoint."""
+        return dict(self._health)
 
     def register_callback(self, callback: EventListenerCallback) -> None:
         """Register a callback to be invoked for every Docker event received.
@@ -90,6 +388,8 @@ class PortainerEventListener:
         Both synchronous and async callables are supported. The callback
         receives a single :class:`PortainerEventListenerResult` argument.
         Each unique callable is only registered once; duplicates are ignored.
+        Open streams whose server-side filters were narrowed by subscriptions
+        reconnect to receive all events again.
 
         Args:
         ----
@@ -99,6 +399,7 @@ class PortainerEventListener:
         """
         if callback not in self._callbacks:
             self._callbacks.append(callback)
+            self._refilter()
 
     def unregister_callback(self, callback: EventListenerCallback) -> None:
         """Remove a previously registered callback.
@@ -110,14 +411,111 @@ class PortainerEventListener:
 
         """
         self._callbacks.remove(callback)
+        self._refilter()
+
+    def subscribe(
+        self,
+        callback: EventListenerCallback,
+        *,
+        endpoint_id: int | None = None,
+        event_type: str | None = None,
+        action: str | None = None,
+        attributes: Mapping[str, str] | None = None,
+    ) -> PortainerEventSubscription:
+        """Subscribe a callback to the events matching all given filters.
+
+        Unlike :meth:`register_callback`, the callback is only invoked for
+        matching events, which are looked up in an index rather than tested
+        against every subscription. While no plain callbacks are registered,
+        the event types and actions of the subscriptions are also passed to
+        Docker as server-side filters, so non-matching events are not sent at
+        all. Open streams reconnect to apply changed filters, resuming from
+        the last event received.
+
+        Args:
+        ----
+            callback: A sync or async callable that accepts a
+                :class:`PortainerEventListenerResult`.
+            endpoint_id: Only events from this endpoint.
+            event_type: Only events of this type, e.g. ``"container"``.
+            action: Only events with this action, e.g. ``"die"``.
+            attributes: Only events whose actor has all these attributes, e.g.
+                ``{"com.docker.compose.project": "media"}``.
+
+        Returns:
+        -------
+            The subscription, to pass to :meth:`unsubscribe`.
+
+        """
+        subscription = PortainerEventSubscription(
+            callback=callback,
+            endpoint_id=endpoint_id,
+            event_type=event_type,
+            action=action,
+            attributes=MappingProxyType(dict(attributes or {})),
+        )
+        self._subscriptions.add(subscription)
+        self._refilter()
+        return subscription
+
+    def unsubscribe(self, subscription: PortainerEventSubscription) -> None:
+        """Remove a subscription.
+
+        Args:
+        ----
+            subscription: The subscription returned by :meth:`subscribe`.
+                Raises :exc:`KeyError` if it is not subscribed.
+
+        """
+        self._subscriptions.remove(subscription)
+        self._refilter()
+
+    def _filters(self, endpoint_id: int) -> dict[str, list[str]] | None:
+        """Return the server-side event filters for an endpoint.
+
+        Subscriptions narrow the filters only when every subscription for the
+        endpoint sets the field and no plain callbacks need all events.
+        Docker requires all ``label`` filters to match, so only the attributes
+        shared by every subscription are sent. ``container`` filters match
+        any of their values, by ID or name prefix, and are sent when every
+        subscription is for a named container.
+        """
+        filters: dict[str, list[str]] = {}
+        if self._event_types:
+            filters["type"] = list(self._event_types)
+
+        subscriptions = [subscription for subscription in self._subscriptions if subscription.endpoint_id in {None, endpoint_id}]
+        if self._callbacks or not subscriptions:
+            return filters or None
+
+        event_types = {subscription.event_type for subscription in subscriptions if subscription.event_type is not None}
+        if all(subscription.event_type for subscription in subscriptions):
+            narrowed = sorted(event_types.intersection(self._event_types) if self._event_types else event_types)
+            if narrowed:
+                filters["type"] = narrowed
+        if all(subscription.action for subscription in subscriptions):
+            filters["event"] = sorted({subscription.action for subscription in subscriptions if subscription.action is not None})
+        if shared := set.intersection(*(set(subscription.attributes.items()) for subscription in subscriptions)):
+            filters["label"] = sorted(f"{name}={value}" for name, value in shared)
+        if all(subscription.event_type == "container" and "name" in subscription.attributes for subscription in subscriptions):
+            filters["container"] = sorted({subscription.attributes["name"] for subscription in subscriptions})
+        return filters or None
+
+    def _refilter(self) -> None:
+        """Reconnect the open streams whose server-side filters changed."""
+        for endpoint_id, connection in self._connections.items():
+            if not connection.done() and self._active_filters.get(endpoint_id) != self._filters(endpoint_id):
+                connection.cancel()
 
     async def _fire_callbacks(self, result: PortainerEventListenerResult) -> None:
-        """Invoke all registered callbacks for a single event.
+        """Invoke all registered callbacks and matching subscriptions for a single event.
 
         Exceptions raised by individual callbacks are logged but do not stop
         the listener.
         """
-        for callback in list(self._callbacks):
+        callbacks = list(self._callbacks)
+        callbacks.extend(subscription.callback for subscription in self._subscriptions.match(result.endpoint_id, result.event))
+        for callback in callbacks:
             try:
                 ret = callback(result)
                 if asyncio.iscoroutine(ret):
@@ -137,9 +535,73 @@ class PortainerEventListener:
             endpoint_id: The endpoint to stream events from.
 
         """
-        filters = {"type": self._event_types} if self._event_types else None
-        async for event in self._portainer.get_events(endpoint_id, filters=filters):
+        filters = self._active_filters[endpoint_id] = self._filters(endpoint_id)
+        queue = self._queue(endpoint_id) if self._queue_size else None
+
+        # Docker only accepts whole seconds, so the resumed stream overlaps the
+        # previous one and events up to the last one seen are skipped
+        cursor = self._cursors.get(endpoint_id) if self._resume else None
+        since = datetime.fromtimestamp(cursor.time_nano // 1_000_000_000, tz=UTC) if cursor else None
+        replaying = cursor is not None
+
+        self._connected_at.pop(endpoint_id, None)
+        self._receiving.discard(endpoint_id)
+
+        def connected() -> None:
+            # A quiet endpoint may not send an event for a long time, so the
+            # failures are only cleared once events flow
+            health = self._health.get(endpoint_id) or PortainerEventStreamHealth(state=EventStreamState.CONNECTING)
+            self._health[endpoint_id] = PortainerEventStreamHealth(state=EventStreamState.CONNECTED, failures=health.failures)
+            self._connected_at[endpoint_id] = time.monotonic()
+
+        async for event in self._portainer.get_events(endpoint_id, since=since, filters=filters, on_connect=connected):
+            if endpoint_id not in self._receiving:
+                self._receiving.add(endpoint_id)
+                self._health[endpoint_id] = PortainerEventStreamHealth(state=EventStreamState.CONNECTED)
+
+            event_time = _event_time(event)
+            if event_time is not None:
+                key = _event_key(event)
+                if replaying and cursor is not None and cursor.seen(event_time, key):
+                    continue
+                replaying = False
+                self._advance(endpoint_id, event_time, key)
+
+            if event.type == "container" and event.action == "destroy" and event.actor and event.actor.id:
+                self._portainer.forget_container_stats(endpoint_id, event.actor.id)
+
             result = PortainerEventListenerResult(endpoint_id=endpoint_id, event=event)
+            if queue is not None:
+                await queue.put(result)
+            else:
+                await self._fire_callbacks(result)
+
+    def _advance(self, endpoint_id: int, event_time: int, key: _EventKey) -> None:
+        """Record an event as the latest one seen on an endpoint."""
+        cursor = self._cursors.get(endpoint_id)
+        if cursor is None:
+            self._cursors[endpoint_id] = _EventCursor(time_nano=event_time, keys={key})
+        else:
+            cursor.advance(event_time, key)
+
+    def _queue(self, endpoint_id: int) -> _EventQueue:
+        """Return the event queue of an endpoint, starting its worker if needed.
+
+        The queue outlives reconnects, so events that were read but not yet
+        delivered are not lost when the stream drops.
+        """
+        queue = self._queues.get(endpoint_id)
+        if queue is None:
+            queue = self._queues[endpoint_id] = _EventQueue(self._queue_size or 1, self._overflow)
+        worker = self._workers.get(endpoint_id)
+        if worker is None or worker.done():
+            self._workers[endpoint_id] = asyncio.create_task(self._dispatch(queue))
+        return queue
+
+    async def _dispatch(self, queue: _EventQueue) -> None:
+        """Deliver the events of a queue to the callbacks, one at a time and in order."""
+        while True:
+            result = await queue.get()
             await self._fire_callbacks(result)
 
     async def _listen_with_reconnect(self, endpoint_id: int) -> None:
@@ -147,53 +609,134 @@ class PortainerEventListener:
 
         Authentication errors are treated as fatal and stop the listener for
         that endpoint. All other :class:`~pyportainer.exceptions.PortainerError`
-        subclasses trigger a reconnect after ``reconnect_interval``.
+        subclasses trigger a reconnect. Consecutive failures back off with
+        decorrelated jitter between ``reconnect_interval`` and
+        ``max_reconnect_interval``, so streams do not reconnect in lockstep
+        after a Portainer restart. The backoff resets once events flow again,
+        or once a stream stayed open for ``max_reconnect_interval``.
 
         Args:
         ----
             endpoint_id: The endpoint to stream events from.
 
         """
+        self._health[endpoint_id] = PortainerEventStreamHealth(state=EventStreamState.CONNECTING)
+        delay = self._reconnect_interval.total_seconds()
         while True:
+            connection = self._connections[endpoint_id] = asyncio.create_task(self._listen(endpoint_id))
             try:
-                await self._listen(endpoint_id)
-            except PortainerAuthenticationError:
+                await connection
+            except asyncio.CancelledError:
+                current = asyncio.current_task()
+                if not connection.cancelled() or (current is not None and current.cancelling()):
+                    raise
+                _LOGGER.debug("Event filters of endpoint %s changed, reconnecting", endpoint_id)
+                continue
+            except PortainerAuthenticationError as err:
                 _LOGGER.exception(
                     "Authentication error for endpoint %s, stopping listener",
                     endpoint_id,
                 )
+                self._failed(endpoint_id, err, None)
                 return
-            except PortainerTimeoutError:
-                _LOGGER.warning(
-                    "Timeout on endpoint %s, reconnecting in %ss",
-                    endpoint_id,
-                    self._reconnect_interval.total_seconds(),
-                )
-            except PortainerConnectionError:
-                _LOGGER.warning(
-                    "Connection lost on endpoint %s, reconnecting in %ss",
-                    endpoint_id,
-                    self._reconnect_interval.total_seconds(),
-                )
-            except PortainerError:
-                _LOGGER.exception(
-                    "Error on endpoint %s, reconnecting in %ss",
-                    endpoint_id,
-                    self._reconnect_interval.total_seconds(),
-                )
+            except PortainerError as err:
+                delay = self._backoff(endpoint_id, delay)
+                self._failed(endpoint_id, err, delay)
+                if isinstance(err, PortainerTimeoutError | PortainerConnectionError):
+                    _LOGGER.warning(
+                        "%s on endpoint %s, reconnecting in %.1fs",
+                        "Timeout" if isinstance(err, PortainerTimeoutError) else "Connection lost",
+                        endpoint_id,
+                        delay,
+                    )
+                else:
+                    _LOGGER.exception("Error on endpoint %s, reconnecting in %.1fs", endpoint_id, delay)
+            else:
+                # The stream was closed by the server without an error
+                delay = self._reconnect_interval.total_seconds()
+
+            await asyncio.sleep(delay)
+
+    def _backoff(self, endpoint_id: int, previous: float) -> float:
+        """Return the next reconnect delay, using decorrelated jitter.
+
+        The delay restarts from ``reconnect_interval`` when the stream was
+        healthy since the last failure.
+        """
+        base = self._reconnect_interval.total_seconds()
+        if self._was_healthy(endpoint_id):
+            previous = base
+        return min(self._max_reconnect_interval.total_seconds(), random.uniform(base, previous * 3))  # noqa: S311
 
-            await asyncio.sleep(self._reconnect_interval.total_seconds())
+    def _was_healthy(self, endpoint_id: int) -> bool:
+        """Return whether the last stream of an endpoint received events or stayed open long enough.
+
+        A server that accepts the connection and drops it right away is not
+        healthy, so its reconnects keep backing off.
+        """
+        if endpoint_id in self._receiving:
+            return True
+        connected_at = self._connected_at.get(endpoint_id)
+        return connected_at is not None and time.monotonic() - connected_at >= self._max_reconnect_interval.total_seconds()
+
+    def _failed(self, endpoint_id: int, err: PortainerError, retry_in: float | None) -> None:
+        """Record a failed connection attempt in the health of an endpoint."""
+        health = self._health.get(endpoint_id) or PortainerEventStreamHealth(state=EventStreamState.CONNECTING)
+        self._health[endpoint_id] = replace(
+            health,
+            state=EventStreamState.RECONNECTING if retry_in is not None else EventStreamState.STOPPED,
+            failures=1 if self._was_healthy(endpoint_id) else health.failures + 1,
+            last_error=str(err),
+            retry_in=retry_in,
+        )
 
     async def _run(self) -> None:
-        """Resolve endpoints and open a streaming connection to each.
+        """Open a streaming connection to each endpoint.
 
-        Runs all per-endpoint listeners concurrently via :func:`asyncio.gather`.
+        A single configured endpoint is streamed directly. Otherwise the
+        endpoint list is reconciled every ``discovery_interval``.
         """
         if self._endpoint_id is not None:
-            endpoint_ids: list[int] = [self._endpoint_id]
-        else:
-            _LOGGER.debug("No endpoint_id specified, fetching all endpoints to listen to.")
+            await self._listen_with_reconnect(self._endpoint_id)
+            return
+
+        try:
+            while True:
+                await self._reconcile()
+                await asyncio.sleep(self._discovery_interval.total_seconds())
+        finally:
+            for endpoint_id in list(self._streams):
+                self._stop_stream(endpoint_id)
+
+    async def _reconcile(self) -> None:
+        """Start streams for new endpoints and stop those of removed or down endpoints.
+
+        A stream that ended on its own, e.g. after an authentication error, is
+        not restarted while its endpoint stays listed.
+        """
+        try:
             endpoints = await self._portainer.get_endpoints()
-            endpoint_ids = [endpoint.id for endpoint in endpoints]
-
-        await asyncio.gather(*(self._listen_with_reconnect(ep_id) for ep_id in endpoint_ids))
+        except PortainerError:
+            _LOGGER.exception("Error while fetching endpoints to listen to")
+            return
+
+        wanted = {endpoint.id for endpoint in endpoints if endpoint.status != EndpointStatus.DOWN}
+        for endpoint_id in self._streams.keys() - wanted:
+            _LOGGER.debug("Endpoint %s was removed or is down, stopping its stream", endpoint_id)
+            self._stop_stream(endpoint_id)
+        for endpoint_id in wanted - self._streams.keys():
+            _LOGGER.debug("Starting stream for endpoint %s", endpoint_id)
+            self._streams[endpoint_id] = asyncio.create_task(self._listen_with_reconnect(endpoint_id))
+
+    def _stop_stream(self, endpoint_id: int) -> None:
+        """Cancel the stream of an endpoint and drop its state."""
+        self._streams.pop(endpoint_id).cancel()
+        if (worker := self._workers.pop(endpoint_id, None)) is not None:
+            worker.cancel()
+        self._queues.pop(endpoint_id, None)
+        self._cursors.pop(endpoint_id, None)
+        self._health.pop(endpoint_id, None)
+        self._connected_at.pop(endpoint_id, None)
+        self._receiving.discard(endpoint_id)
+        self._connections.pop(endpoint_id, None)
+        self._active_filters.pop(endpoint_id, None)
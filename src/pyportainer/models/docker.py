@@ -4,11 +4,14 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from enum import IntEnum, StrEnum
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from mashumaro import field_options
 from mashumaro.mixins.orjson import DataClassORJSONMixin
 
+if TYPE_CHECKING:
+    from pyportainer.stats import ContainerCPUSample
+
 
 class DockerContainerState(StrEnum):
     """Possible states of a Docker container."""
@@ -64,7 +67,11 @@ class DockerDFType(StrEnum):
 
 @dataclass(slots=True, kw_only=True)
 class DockerContainerCPUStats:
-    """Represents CPU statistics for a Docker container."""
+    """Represents CPU statistics for a Docker container.
+
+    ``container_prev_stats`` holds the CPU counters of the previous call for
+    the same container, or None on the first call.
+    """
 
     cpu_system_usage: float | None = None
     cpu_system_percentage: float | None = None
@@ -77,7 +84,7 @@ class DockerContainerCPUStats:
     cpu_user_percentage: float | None = None
 
     container_stats: Any = None
-    container_prev_stats: Any = None
+    container_prev_stats: ContainerCPUSample | None = None
 
 
 @dataclass
@@ -359,6 +366,34 @@ class DockerImagePruneResponse(DataClassORJSONMixin):
     space_reclaimed: int | None = field(default=0, metadata=field_options(alias="SpaceReclaimed"))
 
 
+@dataclass
+class DockerImagePullProgressDetail(DataClassORJSONMixin):
+    """Represents the byte counts of an image pull progress message."""
+
+    current: int | None = None
+    total: int | None = None
+
+
+@dataclass
+class DockerImagePullErrorDetail(DataClassORJSONMixin):
+    """Represents the error details of a failed image pull."""
+
+    code: int | None = None
+    message: str | None = None
+
+
+@dataclass
+class DockerImagePullProgress(DataClassORJSONMixin):
+    """Represents a single progress message of a Docker image pull."""
+
+    status: str | None = None
+    id: str | None = None
+    progress: str | None = None
+    progress_detail: DockerImagePullProgressDetail | None = field(default=None, metadata=field_options(alias="progressDetail"))
+    error: str | None = None
+    error_detail: DockerImagePullErrorDetail | None = field(default=None, metadata=field_options(alias="errorDetail"))
+
+
 @dataclass
 class DockerSystemDFAttribute(DataClassORJSONMixin):
     """Represents Docker system disk usage attribute."""
@@ -0,0 +1,97 @@
+"""Aggregation of Docker image pull progress."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from pyportainer.models.docker import DockerImagePullProgress
+
+# Statuses after which a layer has been fully downloaded
+_LAYER_DOWNLOADED = frozenset({"Download complete", "Verifying Checksum", "Extracting", "Pull complete"})
+
+
+@dataclass(slots=True)
+class ImagePullLayerProgress:
+    """Represents the download progress of a single image layer."""
+
+    id: str
+    status: str | None = None
+    current: int = 0
+    total: int = 0
+    complete: bool = False
+
+
+class ImagePullTracker:
+    """Aggregates image pull progress messages into per-layer and total byte counts.
+
+    Only the latest state of each layer is kept, so memory use is bounded by
+    the number of layers rather than the number of progress messages.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the ImagePullTracker."""
+        self._layers: dict[str, ImagePullLayerProgress] = {}
+        self._status: str | None = None
+        self._error: str | None = None
+
+    @property
+    def layers(self) -> Mapping[str, ImagePullLayerProgress]:
+        """Progress per layer, keyed by layer ID."""
+        return MappingProxyType(self._layers)
+
+    @property
+    def status(self) -> str | None:
+        """The latest status message that was not about a single layer."""
+        return self._status
+
+    @property
+    def error(self) -> str | None:
+        """The error reported by the Docker daemon, if the pull failed."""
+        return self._error
+
+    @property
+    def current(self) -> int:
+        """Number of bytes downloaded so far, over all layers."""
+        return sum(layer.current for layer in self._layers.values())
+
+    @property
+    def total(self) -> int:
+        """Total number of bytes to download, over all layers with a known size."""
+        return sum(layer.total for layer in self._layers.values())
+
+    def update(self, progress: DockerImagePullProgress) -> None:
+        """Apply a single progress message.
+
+        Args:
+        ----
+            progress: The progress message received from :meth:`~pyportainer.Portainer.pull_image`.
+
+        """
+        if progress.error:
+            self._error = progress.error
+            return
+
+        # Messages without progress details or known layer carry the overall status, e.g. "Pulling from library/nginx"
+        if progress.id is None or (progress.id not in self._layers and progress.progress_detail is None):
+            self._status = progress.status
+            return
+
+        layer = self._layers.get(progress.id)
+        if layer is None:
+            layer = self._layers[progress.id] = ImagePullLayerProgress(id=progress.id)
+        layer.status = progress.status
+
+        detail = progress.progress_detail
+        if progress.status == "Downloading" and detail is not None:
+            layer.current = detail.current or 0
+            layer.total = detail.total or layer.total
+        elif progress.status in _LAYER_DOWNLOADED:
+            layer.current = layer.total
+
+        if progress.status in {"Pull complete", "Already exists"}:
+            layer.complete = True
@@ -6,14 +6,20 @@ import asyncio
 import json
 import logging
 import socket
+import warnings
+from contextlib import aclosing
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
+from functools import lru_cache, partial
 from importlib import metadata
 from typing import TYPE_CHECKING, Any, Self
 from urllib.parse import urlparse
 
-from aiohttp import ClientError, ClientResponseError, ClientSession
+import orjson
+from aiohttp import ClientError, ClientResponse, ClientResponseError, ClientSession
 from aiohttp.hdrs import METH_DELETE, METH_GET, METH_POST
+from mashumaro.codecs.orjson import ORJSONDecoder
+from multidict import CIMultiDict, CIMultiDictProxy
 from tenacity import AsyncRetrying, retry_if_exception_type, stop_after_attempt, wait_exponential
 from yarl import URL
 
@@ -31,6 +37,7 @@ from pyportainer.models.docker import (
     DockerDFType,
     DockerEvent,
     DockerImagePruneResponse,
+    DockerImagePullProgress,
     DockerSystemDF,
     DockerVolume,
     ImageInformation,
@@ -40,17 +47,71 @@ from pyportainer.models.docker import (
 from pyportainer.models.docker_inspect import DockerInfo, DockerInspect, DockerVersion
 from pyportainer.models.portainer import Endpoint, PortainerSystemStatus
 from pyportainer.models.stacks import Stack
+from pyportainer.pull import ImagePullTracker
+from pyportainer.stats import ContainerCPUSample, ContainerSampleCache
+from pyportainer.streaming import NDJSONFramer
+from pyportainer.transport import PortainerTransportConfig
 
 _LOGGER = logging.getLogger(__name__)
 
 if TYPE_CHECKING:
-    from collections.abc import AsyncGenerator
+    from collections.abc import AsyncGenerator, Callable
+
+    from pyportainer.cache import CacheKey, PortainerResponseCache
 
 try:
     VERSION = metadata.version(__package__)
 except metadata.PackageNotFoundError:  # pragma: no cover
     VERSION = "DEV-0.0.0"  # pylint: disable=invalid-name
 
+URL_CACHE_SIZE = 512
+
+# (mutating requests sent before, request URL, query parameters)
+_InflightKey = tuple[int, str, tuple[tuple[str, Any], ...]]
+
+# Decoders for list responses, compiled once so bodies go from bytes to models in one pass
+_CONTAINERS_DECODER = ORJSONDecoder(list[DockerContainer])
+_ENDPOINTS_DECODER = ORJSONDecoder(list[Endpoint])
+_STACKS_DECODER = ORJSONDecoder(list[Stack])
+
+
+def _decode_json(body: bytes) -> Any:
+    """Decode a JSON document with orjson, treating an empty body as None.
+
+    Args:
+    ----
+        body: The raw response body.
+
+    Returns:
+    -------
+        The decoded JSON value, or None for an empty body.
+
+    """
+    if not body.strip():
+        return None
+    return orjson.loads(body)
+
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def _join_url(base_url: URL, uri: str) -> URL:
+    """Join a request URI onto an API base URL.
+
+    Cached per ``(base_url, uri)``, so URIs that are requested repeatedly
+    (endpoint-scoped listings, inspects, stats) are joined once. The cache
+    lives at module level, so it holds no reference to any client.
+
+    Args:
+    ----
+        base_url: The API base URL of a client.
+        uri: Request URI, without '/api/', for example, 'status'.
+
+    Returns:
+    -------
+        The absolute request URL.
+
+    """
+    return base_url.join(URL(uri))
+
 
 @dataclass
 class Portainer:
@@ -69,6 +130,10 @@ class Portainer:
         request_timeout: float = 10.0,
         session: ClientSession | None = None,
         max_retries: int = 3,
+        transport: PortainerTransportConfig | None = None,
+        response_cache: PortainerResponseCache | None = None,
+        coalesce_requests: bool = False,
+        stats_cache: ContainerSampleCache | None = None,
     ) -> None:
         """Initialize the Portainer object.
 
@@ -79,12 +144,32 @@ class Portainer:
             request_timeout: Timeout for requests (in seconds).
             session: Optional aiohttp session to use.
             max_retries: Maximum number of retry attempts on transient errors.
+                Event and stats streams are opened once; the event listener
+                and stats collector reopen them with a backoff of their own.
+            transport: Connection pool settings for internally created sessions.
+            response_cache: Optional cache for read-only calls. Caching is
+                disabled when not provided.
+            coalesce_requests: Share one HTTP call between identical GET
+                requests that are in flight at the same time. A GET sent
+                after a mutating request never joins a GET that was sent
+                before it. Disabled by default.
+            stats_cache: Cache of the previous CPU sample per container, used
+                by :meth:`get_container_cpu_usage`. Defaults to a
+                :class:`~pyportainer.stats.ContainerSampleCache` of 1024
+                containers with a 10 minute TTL.
 
         """
         self._api_key = api_key
         self._request_timeout = request_timeout
         self._session = session
+        self._stream_session: ClientSession | None = None
         self._max_retries = max_retries
+        self._transport = transport or PortainerTransportConfig()
+        self._response_cache = response_cache
+        self._coalesce_requests = coalesce_requests
+        self._inflight: dict[_InflightKey, asyncio.Task[bytes | None]] = {}
+        self._coalesced_requests = 0
+        self._writes = 0
 
         parsed_url = urlparse(api_url)
         self._api_host = parsed_url.hostname or ""
@@ -93,7 +178,105 @@ class Portainer:
 
         self._api_base_path = (parsed_url.path or "").rstrip("/")
 
-        self._prev_container_stats: dict[tuple[int, str], DockerContainerStats] | None = None
+        # Everything that is identical between requests is built once here
+        self._base_url = URL.build(
+            scheme=self._api_scheme,
+            host=self._api_host,
+            port=self._api_port,
+            path=f"{self._api_base_path}/api/",
+        )
+        self._headers = CIMultiDictProxy(
+            CIMultiDict(
+                {
+                    "Accept": "application/json, text/plain",
+                    "User-Agent": f"PythonPortainer/{VERSION}",
+                    "X-API-Key": api_key,
+                }
+            )
+        )
+
+        self._prev_container_stats = stats_cache if stats_cache is not None else ContainerSampleCache()
+
+    @property
+    def response_cache(self) -> PortainerResponseCache | None:
+        """The response cache for read-only calls, or None if caching is disabled."""
+        return self._response_cache
+
+    @property
+    def coalesced_requests(self) -> int:
+        """Number of GET requests that were answered by an identical request already in flight."""
+        return self._coalesced_requests
+
+    def invalidate_cache(self, *, method: str | None = None, endpoint_id: int | None = None) -> None:
+        """Drop cached responses.
+
+        Mutating calls invalidate the affected entries automatically; use this
+        after changes made outside of this client. Without arguments, the whole
+        cache is cleared.
+
+        Args:
+        ----
+            method: Only drop responses of this client method, e.g. ``"get_stacks"``.
+            endpoint_id: Only drop responses for this endpoint.
+
+        """
+        if self._response_cache is not None:
+            self._response_cache.invalidate(method=method, endpoint_id=endpoint_id)
+
+    def forget_container_stats(self, endpoint_id: int, container_id: str | None = None) -> None:
+        """Drop the previous CPU sample kept for :meth:`get_container_cpu_usage`.
+
+        Called for deleted containers, and by :class:`~pyportainer.PortainerEventListener`
+        when a container is destroyed.
+
+        Args:
+        ----
+            endpoint_id: The ID of the endpoint.
+            container_id: The ID of the container. If None, the samples of all
+                containers on the endpoint are dropped.
+
+        """
+        self._prev_container_stats.discard(endpoint_id, container_id)
+
+    def _url(self, uri: str) -> URL:
+        """Join a request URI onto the API base URL of this client.
+
+        Args:
+        ----
+            uri: Request URI, without '/api/', for example, 'status'.
+
+        Returns:
+        -------
+            The absolute request URL.
+
+        """
+        return _join_url(self._base_url, uri)
+
+    def _get_session(self, *, stream: bool = False) -> ClientSession:
+        """Return the session to use, creating the internal sessions on first use.
+
+        Long-lived streams get their own connection pool when the client owns
+        its sessions, so they never hold connections needed for API calls.
+
+        Args:
+        ----
+            stream: If True, return the session used for streaming requests.
+
+        Returns:
+        -------
+            The aiohttp session for the request.
+
+        """
+        if self._session is None:
+            self._session = ClientSession(connector=self._transport.create_connector())
+            self._close_session = True
+
+        if not stream or not self._close_session or not self._transport.separate_stream_pool:
+            return self._session
+
+        if self._stream_session is None:
+            self._stream_session = ClientSession(connector=self._transport.create_connector(stream=True))
+        return self._stream_session
 
     # pylint: disable=too-many-arguments, too-many-locals, too-many-branches
     async def _request(
@@ -105,9 +288,16 @@ class Portainer:
         json_body: dict[str, Any] | None = None,
         timeout: float | None = None,
         parse: bool = True,
+        decoder: Callable[[bytes], Any] | None = None,
+        cache: tuple[str, int | None] | None = None,
+        invalidate: tuple[str | None, int | None] | None = None,
     ) -> Any:
         """Handle a request to the Python Portainer API.
 
+        The response body is read as raw bytes and decoded with orjson. When a
+        ``decoder`` is given, the bytes are passed to it directly, so models can
+        be built without an intermediate dictionary.
+
         Args:
         ----
             uri: Request URI, without '/api/', for example, 'status'.
@@ -115,6 +305,12 @@ class Portainer:
             params: Extra options to improve or limit the response.
             timeout: Timeout for the request (in seconds).
             parse: Whether to parse the response as JSON.
+            decoder: Optional callable that turns the raw body into the result,
+                e.g. a model's ``from_json``.
+            cache: Optional ``(method name, endpoint ID)`` under which a GET
+                response may be served from the response cache.
+            invalidate: Optional ``(method name, endpoint ID)`` filter of cached
+                responses to drop once this request succeeds.
 
         Returns:
         -------
@@ -126,40 +322,209 @@ class Portainer:
             Python PortainerAuthenticationError: If the API key is invalid.
 
         """
-        url = URL.build(
-            scheme=self._api_scheme,
-            host=self._api_host,
-            port=self._api_port,
-            path=f"{self._api_base_path}/api/",
-        ).join(URL(uri))
+        url = self._url(uri)
 
-        headers = {
-            "Accept": "application/json, text/plain",
-            "User-Agent": f"PythonPortainer/{VERSION}",
-            "X-API-Key": self._api_key,
-        }
+        # Read events instead. Ideal for getting image pull progress
+        if not parse:
+            response = await self._send(method, url, params=params, json_body=json_body, timeout=timeout)
+            if invalidate is not None:
+                self.invalidate_cache(method=invalidate[0], endpoint_id=invalidate[1])
+            if response is None:
+                return None
+
+            framer = NDJSONFramer()
+            events: list[Any] = []
+            try:
+                async for chunk in response.content.iter_any():
+                    events.extend(orjson.loads(line) for line in framer.feed(chunk))
+                events.extend(orjson.loads(line) for line in framer.flush())
+            except orjson.JSONDecodeError as err:
+                msg = f"Invalid JSON response for {method} {url}: {err}"
+                raise PortainerError(msg) from err
+            return events
 
-        if self._session is None:
-            self._session = ClientSession()
-            self._close_session = True
+        if cache is not None and method == METH_GET and self._response_cache is not None and self._response_cache.enabled(cache[0]):
+            key: CacheKey = (cache[0], cache[1], str(url), tuple(sorted((params or {}).items())))
+            found, body = self._response_cache.get(key)
+            if not found:
+                # A write that completes while the response is read may have made it stale
+                generation = self._response_cache.generation(cache[1])
+                body = await self._read_shared(method, url, params=params, json_body=json_body, timeout=timeout)
+                self._response_cache.set(key, body, generation=generation)
+        else:
+            body = await self._read_shared(method, url, params=params, json_body=json_body, timeout=timeout)
+
+        if invalidate is not None:
+            self.invalidate_cache(method=invalidate[0], endpoint_id=invalidate[1])
+
+        if body is None:
+            return None
+
+        try:
+            if decoder is not None:
+                return decoder(body)
+            return _decode_json(body)
+        except orjson.JSONDecodeError as err:
+            msg = f"Invalid JSON response for {method} {url}: {err}"
+            raise PortainerError(msg) from err
+
+    async def _read_shared(
+        self,
+        method: str,
+        url: URL,
+        *,
+        params: dict[str, Any] | None,
+        json_body: dict[str, Any] | None,
+        timeout: float | None,
+    ) -> bytes | None:
+        """Read a response body, sharing the HTTP call with identical GET requests in flight.
+
+        Concurrent GETs for the same URL and parameters await a single task, so
+        the API is called once and every caller decodes the same raw body. The
+        task is shielded: a cancelled caller does not cancel the call for the
+        others. The timeout of the first caller applies to the shared call.
+
+        The key includes the number of mutating requests sent so far, so a GET
+        sent after a write never returns the response of a GET sent before it.
+
+        Returns
+        -------
+            The raw response body, or None for empty responses.
+
+        """
+        if method != METH_GET or not self._coalesce_requests:
+            return await self._read(method, url, params=params, json_body=json_body, timeout=timeout)
+
+        key: _InflightKey = (self._writes, str(url), tuple(sorted((params or {}).items())))
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._read(method, url, params=params, json_body=json_body, timeout=timeout))
+            self._inflight[key] = task
+            task.add_done_callback(partial(self._read_done, key))
+        else:
+            self._coalesced_requests += 1
+        return await asyncio.shield(task)
+
+    def _read_done(self, key: _InflightKey, task: asyncio.Task[bytes | None]) -> None:
+        """Forget a finished shared read."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Retrieve the exception, so it is not reported when every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    async def _read(
+        self,
+        method: str,
+        url: URL,
+        *,
+        params: dict[str, Any] | None,
+        json_body: dict[str, Any] | None,
+        timeout: float | None,
+    ) -> bytes | None:
+        """Send a request and read the full response body.
+
+        Returns
+        -------
+            The raw response body, or None for empty responses.
+
+        """
+        response = await self._send(method, url, params=params, json_body=json_body, timeout=timeout)
+        if response is None:
+            return None
+        return await response.read()
 
+    async def _send(
+        self,
+        method: str,
+        url: URL,
+        *,
+        params: dict[str, Any] | None,
+        json_body: dict[str, Any] | None,
+        timeout: float | None,
+    ) -> ClientResponse | None:
+        """Send a request, retrying transient errors, and validate the response.
+
+        Returns
+        -------
+            The response, or None for responses without content.
+
+        Raises
+        ------
+            PortainerTimeoutError: If the request times out.
+            PortainerAuthenticationError: If the API key is invalid.
+            PortainerNotFoundError: If the resource does not exist.
+            PortainerConnectionError: On network errors.
+            PortainerError: If the response is not JSON.
+
+        """
         # Only override timeout if a specific value is provided, else use default
         if timeout is None:
             timeout = self._request_timeout
 
+        response = await self._connect(
+            self._get_session(), method, url, params=params, json_body=json_body, timeout=timeout, retries=self._max_retries
+        )
+
+        if response.status in (204, 304):
+            return None
+
+        content_type = response.headers.get("Content-Type", "")
+        if "application/json" not in content_type:
+            text = await response.text()
+            msg = "Unexpected content type response from the Portainer API"
+            raise PortainerError(
+                msg,
+                {"Content-Type": content_type, "response": text},
+            )
+
+        return response
+
+    async def _connect(
+        self,
+        session: ClientSession,
+        method: str,
+        url: URL,
+        *,
+        params: dict[str, Any] | None,
+        json_body: dict[str, Any] | None,
+        timeout: float,
+        retries: int,
+    ) -> ClientResponse:
+        """Send a request and wait for the response headers, retrying transient errors.
+
+        The timeout applies to each attempt up to the response headers; reading
+        the body is up to the caller. Timeouts and connection errors are
+        retried up to ``retries`` times.
+
+        Returns
+        -------
+            The response, with a successful status.
+
+        Raises
+        ------
+            PortainerTimeoutError: If the request times out.
+            PortainerAuthenticationError: If the API key is invalid.
+            PortainerNotFoundError: If the resource does not exist.
+            PortainerConnectionError: On network errors.
+
+        """
+        if method != METH_GET:
+            self._writes += 1
+
         async for attempt in AsyncRetrying(
             retry=retry_if_exception_type((PortainerConnectionError, PortainerTimeoutError)),
             wait=wait_exponential(multiplier=1, min=1, max=10),
-            stop=stop_after_attempt(self._max_retries + 1),
+            stop=stop_after_attempt(retries + 1),
             reraise=True,
         ):
             with attempt:
                 try:
                     async with asyncio.timeout(timeout):
-                        response = await self._session.request(
+                        response = await session.request(
                             method,
                             url,
-                            headers=headers,
+                            headers=self._headers,
                             params=params,
                             json=json_body,
                         )
@@ -182,52 +547,43 @@ class Portainer:
                     msg = f"Unexpected error during {method} {url}: {err}"
                     raise PortainerConnectionError(msg) from err
 
-        if response.status in (204, 304):
-            return None
-
-        content_type = response.headers.get("Content-Type", "")
-        if "application/json" not in content_type:
-            text = await response.text()
-            msg = "Unexpected content type response from the Portainer API"
-            raise PortainerError(
-                msg,
-                {"Content-Type": content_type, "response": text},
-            )
-
-        # Read events instead. Ideal for getting image pull progress
-        events: list[Any] = []
-        if not parse:
-            async for chunk in response.content:
-                for line in chunk.splitlines():
-                    stripped_line = line.strip()
-                    if not stripped_line:
-                        continue
-                    events.append(json.loads(stripped_line))
-            return events
-
-        return await response.json()
+        return response
 
     async def _stream_request(
         self,
         uri: str,
         *,
+        method: str = METH_GET,
         params: dict[str, Any] | None = None,
-    ) -> AsyncGenerator[dict[str, Any], None]:
+        decoder: Callable[[bytes], Any] = orjson.loads,
+        on_connect: Callable[[], None] | None = None,
+        retries: int = 0,
+    ) -> AsyncGenerator[Any, None]:
         """Open a persistent streaming connection and yield JSON events as they arrive.
 
-        Unlike :meth:`_request`, this method does not buffer the full response.
+        Unlike :meth:`_request`, this method does not buffer the full response;
+        lines are split off incrementally by an :class:`NDJSONFramer`.
         The connection remains open until cancelled or the server closes it.
-        The connection-establishment step is subject to the normal request timeout;
-        the ongoing stream is not time-limited.
+        The connection-establishment step is subject to the normal request
+        timeout; the ongoing stream is not time-limited. Opening the stream is
+        attempted once by default: long-lived streams are reopened by their
+        callers, with a jittered backoff of their own.
 
         Args:
         ----
             uri: Request URI, without '/api/'.
+            method: HTTP method to use.
             params: Query parameters to include in the request.
+            decoder: Callable that decodes the raw bytes of a single line.
+                Defaults to :func:`orjson.loads`.
+            on_connect: Called once the stream is established, before the
+                first line arrives.
+            retries: How often a timeout or connection error while opening
+                the stream is retried.
 
         Yields:
         ------
-            Parsed JSON objects, one per newline-delimited event.
+            Decoded objects, one per newline-delimited event.
 
         Raises:
         ------
@@ -236,59 +592,25 @@ class Portainer:
             PortainerConnectionError: On network errors.
 
         """
-        url = URL.build(
-            scheme=self._api_scheme,
-            host=self._api_host,
-            port=self._api_port,
-            path=f"{self._api_base_path}/api/",
-        ).join(URL(uri))
-
-        headers = {
-            "Accept": "application/json, text/plain",
-            "User-Agent": f"PythonPortainer/{VERSION}",
-            "X-API-Key": self._api_key,
-        }
-
-        if self._session is None:
-            self._session = ClientSession()
-            self._close_session = True
-
-        try:
-            async with asyncio.timeout(self._request_timeout):
-                response = await self._session.request(
-                    METH_GET,
-                    url,
-                    headers=headers,
-                    params=params,
-                )
-                response.raise_for_status()
-        except TimeoutError as err:
-            msg = f"Timeout error while connecting to {url}: {err}"
-            raise PortainerTimeoutError(msg) from err
-        except ClientResponseError as err:
-            match err.status:
-                case 401:
-                    msg = f"Authentication failed for {url}: Invalid API key"
-                    raise PortainerAuthenticationError(msg) from err
-                case 404:
-                    msg = f"Resource not found at {url}: {err}"
-                    raise PortainerNotFoundError(msg) from err
-                case _:
-                    msg = f"Connection error for {url}: {err}"
-                    raise PortainerConnectionError(msg) from err
-        except (ClientError, socket.gaierror) as err:
-            msg = f"Unexpected error connecting to {url}: {err}"
-            raise PortainerConnectionError(msg) from err
-
+        url = self._url(uri)
+        response = await self._connect(
+            self._get_session(stream=True),
+            method,
+            url,
+            params=params,
+            json_body=None,
+            timeout=self._request_timeout,
+            retries=retries,
+        )
+        framer = NDJSONFramer()
         try:
-            buffer = b""
-            async for chunk in response.content:
-                buffer += chunk
-                while b"\n" in buffer:
-                    line, buffer = buffer.split(b"\n", 1)
-                    stripped = line.strip()
-                    if stripped:
-                        yield json.loads(stripped)
+            if on_connect is not None:
+                on_connect()
+            async for chunk in response.content.iter_any():
+                for line in framer.feed(chunk):
+                    yield decoder(line)
+            for line in framer.flush():
+                yield decoder(line)
         finally:
             response.release()
 
@@ -299,6 +621,7 @@ class Portainer:
         since: datetime | None = None,
         until: datetime | None = None,
         filters: dict[str, list[str]] | None = None,
+        on_connect: Callable[[], None] | None = None,
     ) -> AsyncGenerator[DockerEvent, None]:
         """Stream Docker events from an endpoint in real time.
 
@@ -317,6 +640,8 @@ class Portainer:
                 UTC is assumed. When supplied, the stream ends automatically.
             filters: Optional Docker event filters, e.g.
                 ``{"type": ["container"], "event": ["start", "die"]}``.
+            on_connect: Called once the stream is established, which can be
+                long before the first event on a quiet endpoint.
 
         Yields:
         ------
@@ -331,11 +656,13 @@ class Portainer:
         if filters is not None:
             params["filters"] = json.dumps(filters)
 
-        async for raw in self._stream_request(
+        async for event in self._stream_request(
             f"endpoints/{endpoint_id}/docker/events",
             params=params or None,
+            decoder=DockerEvent.from_json,
+            on_connect=on_connect,
         ):
-            yield DockerEvent.from_dict(raw)
+            yield event
 
     async def get_recent_events(
         self,
@@ -389,9 +716,9 @@ class Portainer:
             A list of Endpoint objects.
 
         """
-        endpoints = await self._request("endpoints")
+        endpoints: list[Endpoint] = await self._request("endpoints", decoder=_ENDPOINTS_DECODER.decode, cache=("get_endpoints", None))
 
-        return [Endpoint.from_dict(endpoint) for endpoint in endpoints]
+        return endpoints
 
     async def get_containers(self, endpoint_id: int) -> list[DockerContainer]:
         """Get the list of containers from the Portainer API.
@@ -406,9 +733,12 @@ class Portainer:
             A list of containers.
 
         """
-        containers = await self._request(f"endpoints/{endpoint_id}/docker/containers/json?all=1")
+        containers: list[DockerContainer] = await self._request(
+            f"endpoints/{endpoint_id}/docker/containers/json?all=1",
+            decoder=_CONTAINERS_DECODER.decode,
+        )
 
-        return [DockerContainer.from_dict(container) for container in containers]
+        return containers
 
     async def start_container(self, endpoint_id: int, container_id: str) -> Any:
         """Start a container on the specified endpoint.
@@ -423,6 +753,7 @@ class Portainer:
             f"endpoints/{endpoint_id}/docker/containers/{container_id}/start",
             method="POST",
             json_body={},
+            invalidate=(None, endpoint_id),
         )
 
     async def stop_container(self, endpoint_id: int, container_id: str) -> Any:
@@ -437,6 +768,7 @@ class Portainer:
         return await self._request(
             f"endpoints/{endpoint_id}/docker/containers/{container_id}/stop",
             method="POST",
+            invalidate=(None, endpoint_id),
         )
 
     async def restart_container(self, endpoint_id: int, container_id: str) -> Any:
@@ -451,6 +783,7 @@ class Portainer:
         return await self._request(
             f"endpoints/{endpoint_id}/docker/containers/{container_id}/restart",
             method="POST",
+            invalidate=(None, endpoint_id),
         )
 
     async def pause_container(self, endpoint_id: int, container_id: str) -> Any:
@@ -465,6 +798,7 @@ class Portainer:
         return await self._request(
             f"endpoints/{endpoint_id}/docker/containers/{container_id}/pause",
             method="POST",
+            invalidate=(None, endpoint_id),
         )
 
     async def unpause_container(self, endpoint_id: int, container_id: str) -> Any:
@@ -479,6 +813,7 @@ class Portainer:
         return await self._request(
             f"endpoints/{endpoint_id}/docker/containers/{container_id}/unpause",
             method="POST",
+            invalidate=(None, endpoint_id),
         )
 
     async def kill_container(self, endpoint_id: int, container_id: str) -> Any:
@@ -493,6 +828,7 @@ class Portainer:
         return await self._request(
             f"endpoints/{endpoint_id}/docker/containers/{container_id}/kill",
             method="POST",
+            invalidate=(None, endpoint_id),
         )
 
     async def delete_container(self, endpoint_id: int, container_id: str, *, force: bool = False) -> Any:
@@ -506,11 +842,14 @@ class Portainer:
 
         """
         params = {"force": str(force).lower()}
-        return await self._request(
+        result = await self._request(
             f"endpoints/{endpoint_id}/docker/containers/{container_id}",
             method="DELETE",
             params=params,
+            invalidate=(None, endpoint_id),
         )
+        self.forget_container_stats(endpoint_id, container_id)
+        return result
 
     async def inspect_container(self, endpoint_id: int, container_id: str, *, raw: bool = False) -> DockerInspect | Any:
         """Inspect a container on the specified endpoint.
@@ -526,11 +865,11 @@ class Portainer:
             A DockerContainer object with the inspected data.
 
         """
-        container = await self._request(f"endpoints/{endpoint_id}/docker/containers/{container_id}/json")
+        uri = f"endpoints/{endpoint_id}/docker/containers/{container_id}/json"
 
         if raw:
-            return container
-        return DockerInspect.from_dict(container)
+            return await self._request(uri)
+        return await self._request(uri, decoder=DockerInspect.from_json)
 
     async def docker_version(self, endpoint_id: int) -> DockerVersion:
         """Get the Docker version on the specified endpoint.
@@ -544,9 +883,13 @@ class Portainer:
             A DockerVersion object with the Docker version data.
 
         """
-        version = await self._request(f"endpoints/{endpoint_id}/docker/version")
+        version: DockerVersion = await self._request(
+            f"endpoints/{endpoint_id}/docker/version",
+            decoder=DockerVersion.from_json,
+            cache=("docker_version", endpoint_id),
+        )
 
-        return DockerVersion.from_dict(version)
+        return version
 
     async def docker_info(self, endpoint_id: int) -> DockerInfo:
         """Get the Docker info on the specified endpoint.
@@ -560,9 +903,13 @@ class Portainer:
             A DockerInfo object with the Docker info data.
 
         """
-        info = await self._request(f"endpoints/{endpoint_id}/docker/info")
+        info: DockerInfo = await self._request(
+            f"endpoints/{endpoint_id}/docker/info",
+            decoder=DockerInfo.from_json,
+            cache=("docker_info", endpoint_id),
+        )
 
-        return DockerInfo.from_dict(info)
+        return info
 
     async def container_stats(
         self,
@@ -578,21 +925,67 @@ class Portainer:
         ----
             endpoint_id: The ID of the endpoint.
             container_id: The ID of the container to get stats from.
-            stream: If True, stream the stats. If False, get a single snapshot.
-            one_shot: If True, get a single snapshot. If False, stream the stats.
+            stream: Deprecated. A streamed response never completes, so only
+                its first sample is returned. Use :meth:`stream_container_stats`
+                to receive every sample.
+            one_shot: If True, return right away with empty ``precpu_stats``,
+                instead of waiting for a second sample to fill them in.
 
         Returns:
         -------
             The stats of the container.
 
+        Raises:
+        ------
+            PortainerError: If ``stream`` is True and the stream ends without
+                sending a sample.
+
         """
-        params = {"stream": str(stream).lower(), "one-shot": str(one_shot).lower()}
-        stats = await self._request(
+        if stream:
+            warnings.warn(
+                "container_stats(stream=True) is deprecated, use stream_container_stats() to receive every sample",
+                DeprecationWarning,
+                stacklevel=2,
+            )
+            async with aclosing(self.stream_container_stats(endpoint_id, container_id)) as samples:
+                async for sample in samples:
+                    return sample
+            msg = f"No stats received for container {container_id}"
+            raise PortainerError(msg)
+
+        params = {"stream": "false", "one-shot": str(one_shot).lower()}
+        stats: DockerContainerStats = await self._request(
             f"endpoints/{endpoint_id}/docker/containers/{container_id}/stats",
             params=params,
+            decoder=DockerContainerStats.from_json,
         )
 
-        return DockerContainerStats.from_dict(stats)
+        return stats
+
+    async def stream_container_stats(self, endpoint_id: int, container_id: str) -> AsyncGenerator[DockerContainerStats, None]:
+        """Stream the stats of a container over a single persistent connection.
+
+        The Docker daemon sends a new sample about once per second until the
+        container stops or the generator is closed, so a long-lived stream
+        replaces polling :meth:`container_stats`. The first sample has empty
+        ``precpu_stats``.
+
+        Args:
+        ----
+            endpoint_id: The ID of the endpoint.
+            container_id: The ID of the container to stream stats from.
+
+        Yields:
+        ------
+            :class:`~pyportainer.models.docker.DockerContainerStats` samples.
+
+        """
+        async for stats in self._stream_request(
+            f"endpoints/{endpoint_id}/docker/containers/{container_id}/stats",
+            params={"stream": "true"},
+            decoder=DockerContainerStats.from_json,
+        ):
+            yield stats
 
     async def get_image_information(self, endpoint_id: int, image_id: str) -> ImageInformation:
         """Get information about a Docker image.
@@ -607,9 +1000,11 @@ class Portainer:
             An ImageInformation object with the image data.
 
         """
-        image = await self._request(f"endpoints/{endpoint_id}/docker/distribution/{image_id}/json")
+        image: ImageInformation = await self._request(
+            f"endpoints/{endpoint_id}/docker/distribution/{image_id}/json", decoder=ImageInformation.from_json
+        )
 
-        return ImageInformation.from_dict(image)
+        return image
 
     async def get_image(self, endpoint_id: int, image_id: str) -> LocalImageInformation:
         """Get information about a Docker image.
@@ -624,28 +1019,46 @@ class Portainer:
             A LocalImageInformation object with the image data.
 
         """
-        image = await self._request(f"endpoints/{endpoint_id}/docker/images/{image_id}/json")
+        image: LocalImageInformation = await self._request(
+            f"endpoints/{endpoint_id}/docker/images/{image_id}/json",
+            decoder=LocalImageInformation.from_json,
+            cache=("get_image", endpoint_id),
+        )
 
-        return LocalImageInformation.from_dict(image)
+        return image
 
-    async def container_image_status(self, endpoint_id: int, image: str) -> PortainerImageUpdateStatus:
+    async def container_image_status(
+        self,
+        endpoint_id: int,
+        image: str,
+        *,
+        registry_information: ImageInformation | None = None,
+    ) -> PortainerImageUpdateStatus:
         """Check whether a newer version of a Docker image is available in the registry.
 
         Args:
         ----
             endpoint_id: The ID of the endpoint.
             image: The image name (with optional tag) to check.
+            registry_information: Registry information for the image that was
+                already fetched, e.g. through another endpoint. When given,
+                only the local image is inspected.
 
         Returns:
         -------
             A PortainerImageUpdateStatus with the comparison result and digests.
 
         """
-        local, remote = await asyncio.gather(
-            self.get_image(endpoint_id, image),
-            self.get_image_information(endpoint_id, image),
-            return_exceptions=True,
-        )
+        local: LocalImageInformation | BaseException
+        remote: ImageInformation | BaseException
+        if registry_information is not None:
+            local, remote = await self.get_image(endpoint_id, image), registry_information
+        else:
+            local, remote = await asyncio.gather(
+                self.get_image(endpoint_id, image),
+                self.get_image_information(endpoint_id, image),
+                return_exceptions=True,
+            )
 
         if isinstance(local, BaseException):
             raise local
@@ -671,8 +1084,13 @@ class Portainer:
             registry_digest=registry_digest,
         )
 
-    async def image_recreate(self, endpoint_id: int, image_id: str, timeout: timedelta = timedelta(minutes=5)) -> Any:
-        """Recreate a Docker image.
+    async def image_recreate(self, endpoint_id: int, image_id: str, timeout: timedelta = timedelta(minutes=5)) -> ImagePullTracker:
+        """Recreate a Docker image by pulling it again.
+
+        The progress of the pull is streamed into an
+        :class:`~pyportainer.pull.ImagePullTracker` as it arrives, so memory
+        use stays flat regardless of the size of the image. Use
+        :meth:`pull_image` to follow the progress while it happens.
 
         Args:
         ----
@@ -682,17 +1100,54 @@ class Portainer:
 
         Returns:
         -------
-            An ImageInformation object with the recreated image data.
+            The tracker of the finished pull, with its per-layer and total byte
+            counts and the error reported by the Docker daemon, if any.
+
+        Raises:
+        ------
+            PortainerTimeoutError: If the pull does not finish within ``timeout``.
 
         """
-        params = {"fromImage": image_id}
-        return await self._request(
-            uri=f"endpoints/{endpoint_id}/docker/images/create?fromImage={image_id}",
-            timeout=timeout.total_seconds(),
-            method="POST",
-            params=params,
-            parse=False,
-        )
+        tracker = ImagePullTracker()
+        try:
+            async with asyncio.timeout(timeout.total_seconds()):
+                async for progress in self.pull_image(endpoint_id, image_id):
+                    tracker.update(progress)
+        except TimeoutError as err:
+            msg = f"Timeout error while pulling image {image_id}: {err}"
+            raise PortainerTimeoutError(msg) from err
+        return tracker
+
+    async def pull_image(self, endpoint_id: int, image: str) -> AsyncGenerator[DockerImagePullProgress, None]:
+        """Pull a Docker image and stream its progress as it happens.
+
+        Progress messages are not collected; each one is yielded as soon as
+        it arrives, so memory use stays flat regardless of the size of the
+        image. Feed the messages into an
+        :class:`~pyportainer.pull.ImagePullTracker` for per-layer and total
+        byte counts, as :meth:`image_recreate` does.
+
+        Args:
+        ----
+            endpoint_id: The ID of the endpoint.
+            image: The image to pull, e.g. ``nginx:1.27``.
+
+        Yields:
+        ------
+            :class:`~pyportainer.models.docker.DockerImagePullProgress` messages.
+
+        """
+        try:
+            async for progress in self._stream_request(
+                f"endpoints/{endpoint_id}/docker/images/create",
+                method=METH_POST,
+                params={"fromImage": image},
+                decoder=DockerImagePullProgress.from_json,
+                retries=self._max_retries,
+            ):
+                yield progress
+        finally:
+            self.invalidate_cache(endpoint_id=endpoint_id)
 
     async def container_recreate_helper(self, endpoint_id: int, container_id: str, image: str, timeout: timedelta = timedelta(minutes=5)) -> Any:
         """Recreate a Docker container service.
@@ -706,11 +1161,17 @@ class Portainer:
             endpoint_id: The ID of the endpoint.
             container_id: The ID of the container to recreate.
             image: The tag of the image to use for the new container.
+            timeout: The maximum time to wait for the image pull.
 
         Returns:
         -------
             The response from the Portainer API.
 
+        Raises:
+        ------
+            PortainerError: If the image cannot be pulled. The container is
+                left untouched.
+
         """
         container_inspect = await self.inspect_container(
             endpoint_id=endpoint_id,
@@ -722,11 +1183,12 @@ class Portainer:
             msg = "Failed to inspect container for recreation."
             raise PortainerError(msg)
 
-        await self.image_recreate(
-            endpoint_id=endpoint_id,
-            image_id=image,
-            timeout=timeout,
-        )
+        tracker = await self.image_recreate(endpoint_id, image, timeout)
+
+        # Leave the container alone rather than recreating it on an old or missing image
+        if tracker.error:
+            msg = f"Failed to pull image {image}: {tracker.error}"
+            raise PortainerError(msg)
 
         await self.stop_container(
             endpoint_id=endpoint_id,
@@ -797,6 +1259,7 @@ class Portainer:
             method="POST",
             json_body=params,
             timeout=timeout.total_seconds(),
+            invalidate=(None, endpoint_id),
         )
 
         if isinstance(container.get("State"), dict):
@@ -820,14 +1283,16 @@ class Portainer:
         params = {"name": name}
         json_body = {"Image": image}
         json_body.update(config)
-        container = await self._request(
+        container: DockerContainer = await self._request(
             uri=f"endpoints/{endpoint_id}/docker/containers/create",
             method="POST",
             params=params,
             json_body=json_body,
+            decoder=DockerContainer.from_json,
+            invalidate=(None, endpoint_id),
         )
 
-        return DockerContainer.from_dict(container)
+        return container
 
     async def images_prune(self, endpoint_id: int, until: timedelta | None, *, dangling: bool) -> Any:
         """Prune Docker images on the specified endpoint.
@@ -848,13 +1313,15 @@ class Portainer:
         if until is not None:
             params["until"] = int((datetime.now(UTC) - until).timestamp())
 
-        response = await self._request(
+        response: DockerImagePruneResponse = await self._request(
             f"endpoints/{endpoint_id}/docker/images/prune",
             method="POST",
             params=params,
+            decoder=DockerImagePruneResponse.from_json,
+            invalidate=(None, endpoint_id),
         )
 
-        return DockerImagePruneResponse.from_dict(response)
+        return response
 
     async def docker_system_df(self, endpoint_id: int, data_type: DockerDFType | None = None, *, verbose: bool = False) -> Any:
         """Get Docker system disk usage on the specified endpoint.
@@ -874,13 +1341,14 @@ class Portainer:
         if data_type is not None:
             params["type"] = data_type
 
-        response = await self._request(
+        response: DockerSystemDF = await self._request(
             f"endpoints/{endpoint_id}/docker/system/df",
             method="GET",
             params=params,
+            decoder=DockerSystemDF.from_json,
         )
 
-        return DockerSystemDF.from_dict(response)
+        return response
 
     async def portainer_system_status(self) -> PortainerSystemStatus:
         """Get the system status of the Portainer instance.
@@ -890,9 +1358,13 @@ class Portainer:
             A PortainerSystemStatus object with the system status data.
 
         """
-        status = await self._request("system/status")
+        status: PortainerSystemStatus = await self._request(
+            "system/status",
+            decoder=PortainerSystemStatus.from_json,
+            cache=("portainer_system_status", None),
+        )
 
-        return PortainerSystemStatus.from_dict(status)
+        return status
 
     async def get_stacks(
         self,
@@ -918,11 +1390,16 @@ class Portainer:
             filters["SwarmID"] = swarm_id
 
         params = filters and {"filters": json.dumps(filters)}
-        stacks = await self._request("stacks", params=params)
+        stacks: list[Stack] | None = await self._request(
+            "stacks",
+            params=params,
+            decoder=_STACKS_DECODER.decode,
+            cache=("get_stacks", endpoint_id),
+        )
 
         if stacks is None:  # 204 response = no stacks
             return []
-        return [Stack.from_dict(stack) for stack in stacks]
+        return stacks
 
     async def get_stack(self, stack_id: int) -> Stack:
         """Get details of a specific stack.
@@ -936,8 +1413,8 @@ class Portainer:
             Stack details.
 
         """
-        stack = await self._request(f"stacks/{stack_id}")
-        return Stack.from_dict(stack)
+        stack: Stack = await self._request(f"stacks/{stack_id}", decoder=Stack.from_json)
+        return stack
 
     async def get_stack_containers(
         self,
@@ -960,11 +1437,12 @@ class Portainer:
         """
         filters = {"label": [f"com.docker.compose.project={stack_name}"]}
         params = {"all": "1", "filters": json.dumps(filters)}
-        containers = await self._request(
+        containers: list[DockerContainer] = await self._request(
             f"endpoints/{endpoint_id}/docker/containers/json",
             params=params,
+            decoder=_CONTAINERS_DECODER.decode,
         )
-        return [DockerContainer.from_dict(container) for container in containers]
+        return containers
 
     async def start_stack(self, endpoint_id: int, stack_id: int, timeout: timedelta = timedelta(minutes=5)) -> Stack:
         """Start a stopped stack.
@@ -980,13 +1458,17 @@ class Portainer:
             Updated stack details.
 
         """
-        stack = await self._request(
+        stack: Stack = await self._request(
             f"stacks/{stack_id}/start",
             method=METH_POST,
             params={"endpointId": endpoint_id},
             timeout=timeout.total_seconds(),
+            decoder=Stack.from_json,
+            invalidate=("get_stacks", None),
         )
-        return Stack.from_dict(stack)
+        # The containers of the stack changed as well
+        self.invalidate_cache(endpoint_id=endpoint_id)
+        return stack
 
     async def stop_stack(self, endpoint_id: int, stack_id: int, timeout: timedelta = timedelta(minutes=5)) -> Stack:
         """Stop a running stack.
@@ -1002,13 +1484,17 @@ class Portainer:
             Updated stack details.
 
         """
-        stack = await self._request(
+        stack: Stack = await self._request(
             f"stacks/{stack_id}/stop",
             method=METH_POST,
             params={"endpointId": endpoint_id},
             timeout=timeout.total_seconds(),
+            decoder=Stack.from_json,
+            invalidate=("get_stacks", None),
         )
-        return Stack.from_dict(stack)
+        # The containers of the stack changed as well
+        self.invalidate_cache(endpoint_id=endpoint_id)
+        return stack
 
     async def delete_stack(
         self,
@@ -1034,7 +1520,9 @@ class Portainer:
             f"stacks/{stack_id}",
             method=METH_DELETE,
             params=params,
+            invalidate=("get_stacks", None),
         )
+        self.invalidate_cache(endpoint_id=endpoint_id)
 
     async def get_volumes(self, endpoint_id: int) -> list[DockerVolume]:
         """Get the list of volumes from the Portainer API.
@@ -1065,9 +1553,9 @@ class Portainer:
             A DockerVolume object with the inspected volume data.
 
         """
-        volume = await self._request(f"endpoints/{endpoint_id}/docker/volumes/{volume_name}")
+        volume: DockerVolume = await self._request(f"endpoints/{endpoint_id}/docker/volumes/{volume_name}", decoder=DockerVolume.from_json)
 
-        return DockerVolume.from_dict(volume)
+        return volume
 
     async def prune_volumes(self, endpoint_id: int, *, all_volumes: bool = False) -> Any:
         """Prune unused volumes on the specified endpoint.
@@ -1083,11 +1571,20 @@ class Portainer:
 
         """
         params = {"endpointId": endpoint_id, "all": str(all_volumes).lower()}
-        return await self._request(f"endpoints/{endpoint_id}/docker/volumes/prune", method=METH_POST, params=params)
+        return await self._request(
+            f"endpoints/{endpoint_id}/docker/volumes/prune",
+            method=METH_POST,
+            params=params,
+            invalidate=(None, endpoint_id),
+        )
 
     async def get_container_cpu_usage(self, endpoint_id: int, container_id: str) -> DockerContainerCPUStats:
         """Get the current CPU usage percentage for the specified container.
 
+        The percentages are computed against the previous call for the same
+        container, whose CPU counters are kept as a
+        :class:`~pyportainer.stats.ContainerCPUSample` in the ``stats_cache``.
+
         Args:
         ----
             endpoint_id: The ID of the endpoint.
@@ -1103,13 +1600,14 @@ class Portainer:
         docker_stats = DockerContainerCPUStats()
         num_cpus = len(stats.cpu_stats.cpu_usage.percpu_usage) if stats.cpu_stats.cpu_usage.percpu_usage else 1
 
-        if self._prev_container_stats is not None and (prev_stats := self._prev_container_stats.get((endpoint_id, container_id))):
-            docker_stats.container_prev_stats = prev_stats
+        sample = ContainerCPUSample.from_stats(stats)
+        if prev_sample := self._prev_container_stats.get(endpoint_id, container_id):
+            docker_stats.container_prev_stats = prev_sample
 
-            cpu_delta = stats.cpu_stats.cpu_usage.total_usage - prev_stats.cpu_stats.cpu_usage.total_usage
-            system_delta = stats.cpu_stats.system_cpu_usage - prev_stats.cpu_stats.system_cpu_usage
-            cpu_kernel_delta = stats.cpu_stats.cpu_usage.usage_in_kernelmode - prev_stats.cpu_stats.cpu_usage.usage_in_kernelmode
-            cpu_user_delta = stats.cpu_stats.cpu_usage.usage_in_usermode - prev_stats.cpu_stats.cpu_usage.usage_in_usermode
+            cpu_delta = sample.total_usage - prev_sample.total_usage
+            system_delta = sample.system_cpu_usage - prev_sample.system_cpu_usage
+            cpu_kernel_delta = sample.usage_in_kernelmode - prev_sample.usage_in_kernelmode
+            cpu_user_delta = sample.usage_in_usermode - prev_sample.usage_in_usermode
 
             if system_delta > 0:
                 scale = num_cpus * 100.0 / system_delta
@@ -1126,13 +1624,15 @@ class Portainer:
         docker_stats.cpu_user_usage = float(stats.cpu_stats.cpu_usage.usage_in_usermode)
         docker_stats.container_stats = stats
 
-        self._prev_container_stats = self._prev_container_stats or {}
-        self._prev_container_stats[(endpoint_id, container_id)] = stats
+        self._prev_container_stats.set(endpoint_id, container_id, sample)
 
         return docker_stats
 
     async def close(self) -> None:
-        """Close open client session."""
+        """Close open client sessions."""
+        if self._stream_session:
+            await self._stream_session.close()
+            self._stream_session = None
         if self._session and self._close_session:
             await self._session.close()
 
@@ -0,0 +1,499 @@
+"""Compact time series and batch computations of container stats."""
+
+from __future__ import annotations
+
+import time
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Literal
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    _HAS_NUMPY = False
+else:
+    _HAS_NUMPY = True
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from pyportainer.models.docker import DockerContainerStats
+
+StatsSeries = Literal[
+    "cpu_total",
+    "cpu_system",
+    "cpu_kernel",
+    "cpu_user",
+    "memory_usage",
+    "memory_limit",
+    "network_rx",
+    "network_tx",
+]
+
+_SERIES: tuple[StatsSeries, ...] = (
+    "cpu_total",
+    "cpu_system",
+    "cpu_kernel",
+    "cpu_user",
+    "memory_usage",
+    "memory_limit",
+    "network_rx",
+    "network_tx",
+)
+
+
+class ContainerStatsHistory:
+    """Fixed-size ring buffer of the numeric stats of a single container.
+
+    Only the counters below are kept, each in its own typed array, so memory
+    use is fixed by ``size`` no matter how long samples are appended. Once
+    full, every new sample overwrites the oldest one.
+
+    - ``cpu_total``, ``cpu_system``, ``cpu_kernel``, ``cpu_user``: cumulative
+      CPU time in nanoseconds of the container, of the host, and of the
+      container in kernel and user mode.
+    - ``memory_usage``, ``memory_limit``: memory usage without the inactive
+      page cache, as :func:`memory_usage` returns it, and limit in bytes.
+    - ``network_rx``, ``network_tx``: cumulative bytes received and sent,
+      over all networks.
+    """
+
+    __slots__ = ("_columns", "_count", "_head", "_size", "_timestamps", "online_cpus")
+
+    def __init__(self, size: int = 60) -> None:
+        """Initialize the ContainerStatsHistory.
+
+        Args:
+        ----
+            size: The number of samples to keep.
+
+        """
+        if size < 1:
+            msg = "size must be at least 1"
+            raise ValueError(msg)
+        self._size = size
+        self._head = 0
+        self._count = 0
+        self._timestamps = array("d", bytes(8 * size))
+        self._columns = {name: array("q", bytes(8 * size)) for name in _SERIES}
+        self.online_cpus = 1
+
+    def __len__(self) -> int:
+        """Return the number of samples held."""
+        return self._count
+
+    @property
+    def size(self) -> int:
+        """The maximum number of samples held."""
+        return self._size
+
+    def append(self, stats: DockerContainerStats, *, timestamp: float | None = None) -> None:
+        """Add a stats sample, overwriting the oldest one when full.
+
+        Args:
+        ----
+            stats: The stats sample of the container.
+            timestamp: When the sample was taken, in seconds since the epoch.
+                Defaults to now. Pass :func:`read_time` of the sample to
+                measure rates between the times the samples were taken.
+
+        """
+        cpu = stats.cpu_stats
+        head = self._head
+        self._timestamps[head] = time.time() if timestamp is None else timestamp
+        columns = self._columns
+        columns["cpu_total"][head] = cpu.cpu_usage.total_usage
+        columns["cpu_system"][head] = cpu.system_cpu_usage
+        columns["cpu_kernel"][head] = cpu.cpu_usage.usage_in_kernelmode
+        columns["cpu_user"][head] = cpu.cpu_usage.usage_in_usermode
+        columns["memory_usage"][head] = memory_usage(stats)
+        columns["memory_limit"][head] = stats.memory_stats.limit
+        columns["network_rx"][head], columns["network_tx"][head] = network_bytes(stats)
+        self.online_cpus = cpu.online_cpus or len(cpu.cpu_usage.percpu_usage) or 1
+
+        self._head = (head + 1) % self._size
+        self._count = min(self._count + 1, self._size)
+
+    def _index(self, age: int) -> int:
+        """Return the position of a sample, where age 0 is the newest."""
+        return (self._head - 1 - age) % self._size
+
+    def _window(self, samples: int | None) -> int:
+        """Return the age of the oldest sample in a window of ``samples`` samples."""
+        return min(self._count if samples is None else samples, self._count) - 1
+
+    def timestamps(self) -> list[float]:
+        """Return the timestamps of all samples, oldest first."""
+        return [self._timestamps[self._index(age)] for age in range(self._count - 1, -1, -1)]
+
+    def series(self, name: StatsSeries) -> list[int]:
+        """Return all values of a series, oldest first.
+
+        Args:
+        ----
+            name: The name of the series, e.g. ``"memory_usage"``.
+
+        """
+        column = self._columns[name]
+        return [column[self._index(age)] for age in range(self._count - 1, -1, -1)]
+
+    def latest(self, name: StatsSeries) -> int | None:
+        """Return the newest value of a series, or None when empty."""
+        return self._columns[name][self._index(0)] if self._count else None
+
+    def average(self, name: StatsSeries, samples: int | None = None) -> float:
+        """Return the average of a series over the newest samples.
+
+        Args:
+        ----
+            name: The name of the series, e.g. ``"memory_usage"``.
+            samples: The number of samples to average. Defaults to all.
+
+        """
+        oldest = self._window(samples)
+        if oldest < 0:
+            return 0.0
+        column = self._columns[name]
+        return sum(column[self._index(age)] for age in range(oldest + 1)) / (oldest + 1)
+
+    def rate(self, name: StatsSeries, samples: int | None = None) -> float:
+        """Return the average increase per second of a counter over the newest samples.
+
+        Args:
+        ----
+            name: The name of the counter, e.g. ``"network_rx"`` for bytes received per second.
+            samples: The number of samples to span. Defaults to all.
+
+        """
+        oldest = self._window(samples)
+        if oldest < 1:
+            return 0.0
+        newest, first = self._index(0), self._index(oldest)
+        elapsed = self._timestamps[newest] - self._timestamps[first]
+        if elapsed <= 0:
+            return 0.0
+        column = self._columns[name]
+        return max(column[newest] - column[first], 0) / elapsed
+
+    def cpu_percentage(self, samples: int | None = None) -> float:
+        """Return the CPU usage over the newest samples, where 100% is one full CPU.
+
+        Args:
+        ----
+            samples: The number of samples to span. Defaults to all.
+
+        """
+        oldest = self._window(samples)
+        if oldest < 1:
+            return 0.0
+        newest, first = self._index(0), self._index(oldest)
+        cpu_total, cpu_system = self._columns["cpu_total"], self._columns["cpu_system"]
+        cpu_delta = cpu_total[newest] - cpu_total[first]
+        system_delta = cpu_system[newest] - cpu_system[first]
+        if cpu_delta <= 0 or system_delta <= 0:
+            return 0.0
+        return cpu_delta / system_delta * self.online_cpus * 100.0
+
+
+@dataclass(frozen=True, slots=True)
+class ContainerCPUSample:
+    """The CPU counters of a stats sample, kept to compute CPU usage on the next sample."""
+
+    total_usage: int = 0
+    system_cpu_usage: int = 0
+    usage_in_kernelmode: int = 0
+    usage_in_usermode: int = 0
+
+    @classmethod
+    def from_stats(cls, stats: DockerContainerStats) -> ContainerCPUSample:
+        """Take the CPU counters of a stats sample."""
+        cpu = stats.cpu_stats
+        return cls(
+            total_usage=cpu.cpu_usage.total_usage,
+            system_cpu_usage=cpu.system_cpu_usage,
+            usage_in_kernelmode=cpu.cpu_usage.usage_in_kernelmode,
+            usage_in_usermode=cpu.cpu_usage.usage_in_usermode,
+        )
+
+
+class ContainerSampleCache:
+    """Bounded LRU cache of the previous CPU sample of every container.
+
+    Used by :meth:`~pyportainer.Portainer.get_container_cpu_usage`. Entries
+    expire after ``ttl``, and the least recently used entry is evicted when
+    the cache is full, so containers that are gone do not stay around.
+    """
+
+    def __init__(self, *, max_size: int = 1024, ttl: timedelta = timedelta(minutes=10)) -> None:
+        """Initialize the ContainerSampleCache.
+
+        Args:
+        ----
+            max_size: The maximum number of containers to keep a sample for.
+            ttl: How long a sample is kept without being replaced.
+
+        """
+        self._max_size = max_size
+        self._ttl = ttl.total_seconds()
+        self._entries: OrderedDict[tuple[int, str], tuple[ContainerCPUSample, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of cached samples."""
+        return len(self._entries)
+
+    def get(self, endpoint_id: int, container_id: str) -> ContainerCPUSample | None:
+        """Return the cached sample of a container, or None if there is none or it expired."""
+        key = (endpoint_id, container_id)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def set(self, endpoint_id: int, container_id: str, sample: ContainerCPUSample) -> None:
+        """Store the sample of a container, evicting the least recently used one when full."""
+        key = (endpoint_id, container_id)
+        self._entries[key] = (sample, time.monotonic() + self._ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def discard(self, endpoint_id: int, container_id: str | None = None) -> None:
+        """Drop the sample of a container, or of all containers on an endpoint."""
+        if container_id is not None:
+            self._entries.pop((endpoint_id, container_id), None)
+            return
+        for key in [key for key in self._entries if key[0] == endpoint_id]:
+            del self._entries[key]
+
+
+def network_bytes(stats: DockerContainerStats) -> tuple[int, int]:
+    """Return the bytes received and sent by a container, over all its networks."""
+    received = sent = 0
+    for network in stats.networks.values():
+        received += network.rx_bytes or 0
+        sent += network.tx_bytes or 0
+    return received, sent
+
+
+def block_io_bytes(stats: DockerContainerStats) -> tuple[int, int]:
+    """Return the bytes read from and written to block devices by a container."""
+    read = written = 0
+    for entry in stats.blkio_stats.get("io_service_bytes_recursive") or ():
+        operation = str(entry.get("op", "")).lower()
+        if operation == "read":
+            read += entry.get("value", 0)
+        elif operation == "write":
+            written += entry.get("value", 0)
+    return read, written
+
+
+def memory_usage(stats: DockerContainerStats) -> int:
+    """Return the memory usage of a container without the inactive page cache, like ``docker stats``."""
+    memory = stats.memory_stats
+    # cgroup v1 reports the inactive page cache as total_inactive_file, cgroup v2 as inactive_file
+    inactive_file = memory.stats.total_inactive_file or memory.stats.inactive_file
+    return memory.usage - inactive_file if inactive_file < memory.usage else memory.usage
+
+
+def read_time(stats: DockerContainerStats) -> float:
+    """Return when a sample was taken, in seconds since the epoch, or 0.0 if unknown."""
+    try:
+        return datetime.fromisoformat(stats.read).timestamp() if stats.read else 0.0
+    except ValueError:
+        return 0.0
+
+
+# Integer columns read from the samples, in this order
+_CPU_TOTAL, _PRECPU_TOTAL, _SYSTEM, _PRESYSTEM, _ONLINE_CPUS, _MEMORY_USAGE, _MEMORY_LIMIT = range(7)
+_NETWORK_RX, _NETWORK_TX, _BLOCK_READ, _BLOCK_WRITE = range(7, 11)
+_PREVIOUS = 11  # Offset of the I/O counters of the previous samples, in the same order
+
+
+def _columns(samples: Sequence[DockerContainerStats], previous: Sequence[DockerContainerStats | None]) -> list[Sequence[int]]:
+    """Read the integer columns of the samples, and the I/O counters of the previous samples.
+
+    Every column is read in a pass of its own, so it can be turned into an
+    array as is, and the counters stay exact integers.
+    """
+    cpu = [stats.cpu_stats for stats in samples]
+    precpu = [stats.precpu_stats for stats in samples]
+    return [
+        [stats.cpu_usage.total_usage for stats in cpu],
+        [stats.cpu_usage.total_usage if stats else 0 for stats in precpu],
+        [stats.system_cpu_usage for stats in cpu],
+        [stats.system_cpu_usage if stats else 0 for stats in precpu],
+        [stats.online_cpus or len(stats.cpu_usage.percpu_usage) or 1 for stats in cpu],
+        [memory_usage(stats) for stats in samples],
+        [stats.memory_stats.limit for stats in samples],
+        *_io_columns(samples),
+        *_io_columns(previous),
+    ]
+
+
+def _io_columns(samples: Sequence[DockerContainerStats | None]) -> tuple[Sequence[int], ...]:
+    """Return the network received and sent, and block read and written bytes columns, with 0 where there is no sample."""
+    if not samples:
+        return ((),) * 4
+    network = [network_bytes(stats) if stats is not None else (0, 0) for stats in samples]
+    block = [block_io_bytes(stats) if stats is not None else (0, 0) for stats in samples]
+    return (*zip(*network, strict=True), *zip(*block, strict=True))
+
+
+@dataclass(frozen=True, slots=True)
+class ContainerStatsBatch:  # pylint: disable=too-many-instance-attributes
+    """Resource usage of many containers, one column per metric, in the order of the samples.
+
+    Percentages follow ``docker stats``: CPU usage is relative to one full
+    CPU, memory usage excludes the inactive page cache. Byte counts are
+    cumulative; rates are bytes per second since the previous sample, and 0.0
+    for containers without one.
+    """
+
+    cpu_percentage: list[float]
+    memory_usage: list[int]
+    memory_limit: list[int]
+    memory_percentage: list[float]
+    network_rx_bytes: list[int]
+    network_tx_bytes: list[int]
+    block_read_bytes: list[int]
+    block_write_bytes: list[int]
+    network_rx_rate: list[float]
+    network_tx_rate: list[float]
+    block_read_rate: list[float]
+    block_write_rate: list[float]
+
+    def __len__(self) -> int:
+        """Return the number of containers."""
+        return len(self.cpu_percentage)
+
+
+def compute_stats_batch(
+    samples: Sequence[DockerContainerStats],
+    previous: Sequence[DockerContainerStats | None] | None = None,
+    *,
+    use_numpy: bool | None = None,
+) -> ContainerStatsBatch:
+    """Compute the resource usage of many containers at once.
+
+    The numbers of the samples are read one column at a time, as exact
+    integers, after which all percentages and rates are computed column by
+    column. With NumPy installed (``pip install pyportainer[numpy]``), the
+    columns are computed as int64 arrays and the read times are parsed in
+    one call; otherwise a pure Python fallback gives the same results.
+
+    Args:
+    ----
+        samples: The latest stats sample of every container.
+        previous: The preceding sample of every container, in the same
+            order, or None where there is none. Used for the I/O rates.
+        use_numpy: Force NumPy on or off. Defaults to using it when installed.
+
+    Returns:
+    -------
+        One column per metric, in the order of ``samples``.
+
+    """
+    if previous is None:
+        previous = [None] * len(samples)
+    elif len(previous) != len(samples):
+        msg = "samples and previous must have the same length"
+        raise ValueError(msg)
+
+    columns = _columns(samples, previous)
+    if use_numpy if use_numpy is not None else _HAS_NUMPY:
+        return _compute_numpy(columns, _read_times_numpy(samples), _read_times_numpy(previous))
+    return _compute_python(columns, _read_times(samples), _read_times(previous))
+
+
+def _read_times(samples: Sequence[DockerContainerStats | None]) -> list[float]:
+    """Return when every sample was taken, in seconds since the epoch, or 0.0 if unknown."""
+    return [read_time(stats) if stats is not None else 0.0 for stats in samples]
+
+
+def _compute_python(columns: list[Sequence[int]], times: list[float], previous_times: list[float]) -> ContainerStatsBatch:
+    """Compute the columns of a batch with plain Python."""
+    cpu_percentage = [
+        (total - previous_total) / (system - previous_system) * online_cpus * 100.0 if total > previous_total and system > previous_system else 0.0
+        for total, previous_total, system, previous_system, online_cpus in zip(*columns[: _ONLINE_CPUS + 1], strict=True)
+    ]
+    elapsed = [now - before if before > 0 else 0.0 for now, before in zip(times, previous_times, strict=True)]
+
+    def rate(column: int) -> list[float]:
+        counters = zip(columns[column], columns[_PREVIOUS + column - _NETWORK_RX], elapsed, strict=True)
+        return [max(current - before, 0) / seconds if seconds > 0 else 0.0 for current, before, seconds in counters]
+
+    return ContainerStatsBatch(
+        cpu_percentage=cpu_percentage,
+        memory_usage=list(columns[_MEMORY_USAGE]),
+        memory_limit=list(columns[_MEMORY_LIMIT]),
+        memory_percentage=[
+            usage / limit * 100.0 if limit else 0.0 for usage, limit in zip(columns[_MEMORY_USAGE], columns[_MEMORY_LIMIT], strict=True)
+        ],
+        network_rx_bytes=list(columns[_NETWORK_RX]),
+        network_tx_bytes=list(columns[_NETWORK_TX]),
+        block_read_bytes=list(columns[_BLOCK_READ]),
+        block_write_bytes=list(columns[_BLOCK_WRITE]),
+        network_rx_rate=rate(_NETWORK_RX),
+        network_tx_rate=rate(_NETWORK_TX),
+        block_read_rate=rate(_BLOCK_READ),
+        block_write_rate=rate(_BLOCK_WRITE),
+    )
+
+
+def _read_times_numpy(samples: Sequence[DockerContainerStats | None]) -> np.ndarray:
+    """Return when every sample was taken, in seconds since the epoch, or 0.0 if unknown.
+
+    Docker reports read times in UTC, which NumPy parses in one call once
+    the ``Z`` suffix is dropped. Anything else is parsed one by one.
+    """
+    reads = [stats.read if stats is not None else "" for stats in samples]
+    if all(not read or read.endswith("Z") for read in reads):
+        try:
+            parsed = np.array([read.removesuffix("Z") for read in reads], dtype="datetime64[us]")
+        except ValueError:
+            pass
+        else:
+            return np.where(np.isnat(parsed), 0.0, parsed.astype(np.int64) / 1_000_000)
+    return np.array(_read_times(samples), dtype=np.float64)
+
+
+def _compute_numpy(columns: list[Sequence[int]], times: np.ndarray, previous_times: np.ndarray) -> ContainerStatsBatch:
+    """Compute the columns of a batch with NumPy arrays.
+
+    Counters are kept as int64 and only their differences are divided, so
+    counters above 2**53 do not lose precision.
+    """
+    table = np.array(columns, dtype=np.int64).reshape(len(columns), len(times))
+
+    cpu_delta = table[_CPU_TOTAL] - table[_PRECPU_TOTAL]
+    system_delta = table[_SYSTEM] - table[_PRESYSTEM]
+    valid = (cpu_delta > 0) & (system_delta > 0)
+    cpu_percentage = np.where(valid, cpu_delta / np.where(valid, system_delta, 1) * table[_ONLINE_CPUS] * 100.0, 0.0)
+
+    limit = table[_MEMORY_LIMIT]
+    memory_percentage = np.where(limit > 0, table[_MEMORY_USAGE] / np.where(limit > 0, limit, 1) * 100.0, 0.0)
+
+    elapsed = np.where(previous_times > 0, times - previous_times, 0.0)
+    deltas = np.maximum(table[_NETWORK_RX : _BLOCK_WRITE + 1] - table[_PREVIOUS : _PREVIOUS + 4], 0)
+    rates = np.where(elapsed > 0, deltas / np.where(elapsed > 0, elapsed, 1.0), 0.0)
+
+    return ContainerStatsBatch(
+        cpu_percentage=cpu_percentage.tolist(),
+        memory_usage=table[_MEMORY_USAGE].tolist(),
+        memory_limit=table[_MEMORY_LIMIT].tolist(),
+        memory_percentage=memory_percentage.tolist(),
+        network_rx_bytes=table[_NETWORK_RX].tolist(),
+        network_tx_bytes=table[_NETWORK_TX].tolist(),
+        block_read_bytes=table[_BLOCK_READ].tolist(),
+        block_write_bytes=table[_BLOCK_WRITE].tolist(),
+        network_rx_rate=rates[0].tolist(),
+        network_tx_rate=rates[1].tolist(),
+        block_read_rate=rates[2].tolist(),
+        block_write_rate=rates[3].tolist(),
+    )
@@ -0,0 +1,179 @@
+"""Persistent storage of image watcher results."""
+
+from __future__ import annotations
+
+import sqlite3
+from contextlib import closing
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Protocol
+
+import orjson
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from os import PathLike
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class StoredImageStatus:
+    """Represents the persisted image status of a single container."""
+
+    endpoint_id: int
+    container_id: str
+    image: str | None = None
+    update_available: bool = False
+    local_digest: str | None = None
+    registry_digest: str | None = None
+    checked_at: float = 0.0
+
+
+class WatcherStore(Protocol):
+    """Storage backend for :class:`~pyportainer.watcher.PortainerImageWatcher` results.
+
+    Methods are synchronous and called from a worker thread, so backends are
+    free to use blocking file or database I/O.
+    """
+
+    def load(self) -> list[StoredImageStatus]:
+        """Return all stored image statuses."""
+
+    def replace(self, records: Iterable[StoredImageStatus]) -> None:
+        """Replace all stored image statuses, e.g. after a full sweep."""
+
+    def update(self, records: Iterable[StoredImageStatus]) -> None:
+        """Insert or update the given image statuses, keeping all others."""
+
+    def remove(self, keys: Iterable[tuple[int, str]]) -> None:
+        """Delete the image statuses of the given ``(endpoint_id, container_id)`` pairs, keeping all others."""
+
+
+class SQLiteWatcherStore:
+    """Stores image watcher results in a local SQLite database."""
+
+    def __init__(self, path: str | PathLike[str]) -> None:
+        """Initialize the SQLiteWatcherStore.
+
+        Args:
+        ----
+            path: Path of the database file. It is created when it does not exist.
+
+        """
+        self._path = Path(path)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection and make sure the table exists."""
+        connection = sqlite3.connect(self._path)
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS image_status ("
+            "endpoint_id INTEGER NOT NULL, "
+            "container_id TEXT NOT NULL, "
+            "image TEXT, "
+            "update_available INTEGER NOT NULL, "
+            "local_digest TEXT, "
+            "registry_digest TEXT, "
+            "checked_at REAL NOT NULL, "
+            "PRIMARY KEY (endpoint_id, container_id))"
+        )
+        return connection
+
+    def load(self) -> list[StoredImageStatus]:
+        """Return all stored image statuses."""
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                "SELECT endpoint_id, container_id, image, update_available, local_digest, registry_digest, checked_at FROM image_status"
+            ).fetchall()
+        return [
+            StoredImageStatus(
+                endpoint_id=endpoint_id,
+                container_id=container_id,
+                image=image,
+                update_available=bool(update_available),
+                local_digest=local_digest,
+                registry_digest=registry_digest,
+                checked_at=checked_at,
+            )
+            for endpoint_id, container_id, image, update_available, local_digest, registry_digest, checked_at in rows
+        ]
+
+    def replace(self, records: Iterable[StoredImageStatus]) -> None:
+        """Replace all stored image statuses."""
+        with closing(self._connect()) as connection, connection:
+            connection.execute("DELETE FROM image_status")
+            self._upsert(connection, records)
+
+    def update(self, records: Iterable[StoredImageStatus]) -> None:
+        """Insert or update the given image statuses, keeping all others."""
+        with closing(self._connect()) as connection, connection:
+            self._upsert(connection, records)
+
+    def remove(self, keys: Iterable[tuple[int, str]]) -> None:
+        """Delete the image statuses of the given containers, keeping all others."""
+        with closing(self._connect()) as connection, connection:
+            connection.executemany("DELETE FROM image_status WHERE endpoint_id = ? AND container_id = ?", keys)
+
+    @staticmethod
+    def _upsert(connection: sqlite3.Connection, records: Iterable[StoredImageStatus]) -> None:
+        connection.executemany(
+            "INSERT OR REPLACE INTO image_status "
+            "(endpoint_id, container_id, image, update_available, local_digest, registry_digest, checked_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                (
+                    record.endpoint_id,
+                    record.container_id,
+                    record.image,
+                    record.update_available,
+                    record.local_digest,
+                    record.registry_digest,
+                    record.checked_at,
+                )
+                for record in records
+            ),
+        )
+
+
+class JSONWatcherStore:
+    """Stores image watcher results in a local JSON file.
+
+    The file is rewritten atomically on every change, so a crash never
+    leaves a partially written file behind.
+    """
+
+    def __init__(self, path: str | PathLike[str]) -> None:
+        """Initialize the JSONWatcherStore.
+
+        Args:
+        ----
+            path: Path of the JSON file. It is created on the first write.
+
+        """
+        self._path = Path(path)
+
+    def load(self) -> list[StoredImageStatus]:
+        """Return all stored image statuses."""
+        try:
+            data = orjson.loads(self._path.read_bytes())
+        except FileNotFoundError:
+            return []
+        return [StoredImageStatus(**record) for record in data]
+
+    def replace(self, records: Iterable[StoredImageStatus]) -> None:
+        """Replace all stored image statuses."""
+        self._write(records)
+
+    def update(self, records: Iterable[StoredImageStatus]) -> None:
+        """Insert or update the given image statuses, keeping all others."""
+        merged = {(record.endpoint_id, record.container_id): record for record in self.load()}
+        merged.update({(record.endpoint_id, record.container_id): record for record in records})
+        self._write(merged.values())
+
+    def remove(self, keys: Iterable[tuple[int, str]]) -> None:
+        """Delete the image statuses of the given containers, keeping all others."""
+        removed = set(keys)
+        self._write([record for record in self.load() if (record.endpoint_id, record.container_id) not in removed])
+
+    def _write(self, records: Iterable[StoredImageStatus]) -> None:
+        temporary = self._path.with_name(f"{self._path.name}.tmp")
+        temporary.write_bytes(orjson.dumps([asdict(record) for record in records]))
+        temporary.replace(self._path)
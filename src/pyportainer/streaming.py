@@ -0,0 +1,118 @@
+"""Incremental framing of newline-delimited JSON streams."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from pyportainer.exceptions import PortainerError
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+DEFAULT_MAX_LINE_SIZE = 8 * 1024 * 1024
+
+
+class NDJSONFramer:
+    """Split a chunked byte stream into complete, newline-delimited lines.
+
+    Chunks are appended to a single buffer and scanned from a cursor, so every
+    byte is searched once and the buffer is compacted once per chunk, no
+    matter how many lines a chunk holds. Blank lines are skipped.
+
+    Used for every streaming endpoint: Docker events, image pull progress and
+    container stats.
+    """
+
+    __slots__ = ("_buffer", "_discarding", "_max_line_size", "_scan")
+
+    def __init__(self, max_line_size: int = DEFAULT_MAX_LINE_SIZE) -> None:
+        """Initialize the framer.
+
+        Args:
+        ----
+            max_line_size: The maximum size of a single line in bytes. A line
+                that grows beyond this raises a :class:`PortainerError`.
+
+        """
+        self._buffer = bytearray()
+        self._discarding = False
+        self._max_line_size = max_line_size
+        self._scan = 0
+
+    def feed(self, chunk: bytes) -> Iterator[bytes]:
+        """Add a chunk to the buffer and return all lines it completed.
+
+        The chunk is framed right away; only the delivery of the lines is
+        lazy, so that an oversized line is reported after the valid lines
+        before it. The rest of an oversized line is skipped up to the next
+        newline, so the framer can be fed again after the error.
+
+        Args:
+        ----
+            chunk: The next chunk of raw bytes from the stream.
+
+        Returns:
+        -------
+            An iterator over the complete, non-blank lines, without their newline.
+
+        Raises:
+        ------
+            PortainerError: When iterating past the last valid line, if a line
+                exceeds the maximum line size.
+
+        """
+        buffer = self._buffer
+        if self._discarding:
+            if (end := chunk.find(b"\n")) == -1:
+                return iter(())
+            self._discarding = False
+            chunk = chunk[end + 1 :]
+        buffer += chunk
+
+        lines: list[bytes] = []
+        overflow = False
+        start = 0
+        with memoryview(buffer) as view:
+            while (end := buffer.find(b"\n", self._scan)) != -1:
+                if end - start > self._max_line_size:
+                    overflow = True
+                else:
+                    line = bytes(view[start:end])
+                    if line and not line.isspace():
+                        lines.append(line)
+                start = self._scan = end + 1
+
+        if start:
+            del buffer[:start]
+        self._scan = len(buffer)
+
+        if self._scan > self._max_line_size:
+            buffer.clear()
+            self._scan = 0
+            self._discarding = overflow = True
+
+        if overflow:
+            return self._overflow(lines)
+        return iter(lines)
+
+    def _overflow(self, lines: list[bytes]) -> Iterator[bytes]:
+        """Yield the lines framed before an oversized line, then raise."""
+        yield from lines
+        msg = f"Stream line exceeds the maximum size of {self._max_line_size} bytes"
+        raise PortainerError(msg)
+
+    def flush(self) -> list[bytes]:
+        """Return the trailing line that was not terminated by a newline.
+
+        Returns
+        -------
+            A list with the remaining line, or an empty list if there is none.
+
+        """
+        line = bytes(self._buffer)
+        self._buffer.clear()
+        self._discarding = False
+        self._scan = 0
+        if line and not line.isspace():
+            return [line]
+        return []
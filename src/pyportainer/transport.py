@@ -0,0 +1,51 @@
+"""Connection pool configuration for the Portainer client."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from aiohttp import TCPConnector
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class PortainerTransportConfig:  # pylint: disable=too-many-instance-attributes
+    """Connection pool settings for the sessions created by :class:`~pyportainer.Portainer`.
+
+    Short API calls and long-lived streams (events, stats, image pulls) are
+    served from separate connection pools, so a large number of open streams
+    can never starve regular requests of connections.
+
+    These settings only apply to sessions the client creates itself; when an
+    existing ``ClientSession`` is passed to :class:`~pyportainer.Portainer`, its
+    connector is used as-is for all requests.
+    """
+
+    limit: int = 100
+    limit_per_host: int = 0
+    keepalive_timeout: float = 30.0
+    use_dns_cache: bool = True
+    ttl_dns_cache: int | None = 300
+
+    separate_stream_pool: bool = True
+    stream_limit: int = 0
+    stream_limit_per_host: int = 0
+
+    def create_connector(self, *, stream: bool = False) -> TCPConnector:
+        """Create a connector for either the API or the stream pool.
+
+        Args:
+        ----
+            stream: If True, create the connector for long-lived streams.
+
+        Returns:
+        -------
+            A new :class:`aiohttp.TCPConnector`.
+
+        """
+        return TCPConnector(
+            limit=self.stream_limit if stream else self.limit,
+            limit_per_host=self.stream_limit_per_host if stream else self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            use_dns_cache=self.use_dns_cache,
+            ttl_dns_cache=self.ttl_dns_cache,
+        )
@@ -4,23 +4,68 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import random
 import time
 from collections import defaultdict
-from collections.abc import Awaitable, Callable
-from dataclasses import dataclass
+from collections.abc import Awaitable, Callable, Collection, Container, Iterable, Mapping
+from contextlib import AsyncExitStack
+from dataclasses import dataclass, field
 from datetime import timedelta
-from typing import TYPE_CHECKING
+from functools import cached_property
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any
 
 from pyportainer.exceptions import PortainerAuthenticationError, PortainerConnectionError, PortainerError, PortainerTimeoutError
+from pyportainer.listener import PortainerEventListener
+from pyportainer.models.docker import PortainerImageUpdateStatus
+from pyportainer.store import StoredImageStatus
 
 if TYPE_CHECKING:
-    from pyportainer.models.docker import PortainerImageUpdateStatus
+    from pyportainer.listener import PortainerEventListenerResult
+    from pyportainer.models.docker import ImageInformation
     from pyportainer.pyportainer import Portainer
+    from pyportainer.store import WatcherStore
 
 
 _LOGGER = logging.getLogger(__name__)
 
 WatcherCallback = Callable[["PortainerImageWatcherResult"], Awaitable[None] | None]
+ChangeSetCallback = Callable[["PortainerImageWatcherChangeSet"], Awaitable[None] | None]
+
+DEFAULT_REGISTRY = "docker.io"
+
+# Docker events after which containers are checked again in event-driven mode
+_DIRTY_CONTAINER_ACTIONS = frozenset({"create", "start"})
+_DIRTY_IMAGE_ACTIONS = frozenset({"pull", "tag"})
+
+_RegistryLookups = dict[str, "asyncio.Task[ImageInformation]"]
+
+
+def _image_registry(image: str) -> str:
+    """Return the registry host of an image reference, e.g. ``ghcr.io`` for ``ghcr.io/owner/app:1``.
+
+    Follows the Docker reference rules: the first path component is only a
+    registry host if it contains a dot or a port, or is ``localhost``.
+    """
+    host, sep, _ = image.partition("/")
+    if sep and ("." in host or ":" in host or host == "localhost"):
+        return host
+    return DEFAULT_REGISTRY
+
+
+def _image_reference(image: str) -> str:
+    """Return the fully qualified form of an image reference.
+
+    ``nginx``, ``library/nginx:latest`` and ``docker.io/library/nginx:latest``
+    all name the same image and normalize to the last form.
+    """
+    registry = _image_registry(image)
+    path = image.removeprefix(f"{registry}/")
+    if registry == DEFAULT_REGISTRY and "/" not in path:
+        path = f"library/{path}"
+    if "@" not in path and ":" not in path.rpartition("/")[2]:
+        path = f"{path}:latest"
+    return f"{registry}/{path}"
 
 
 @dataclass(frozen=True)
@@ -32,19 +77,105 @@ class PortainerImageWatcherResult:
     status: PortainerImageUpdateStatus | None = None
 
 
+@dataclass(frozen=True)
+class PortainerImageWatcherChangeSet:
+    """Represents the results that changed in a single check.
+
+    Removed results are the last known results of containers that no longer run.
+    """
+
+    added: tuple[PortainerImageWatcherResult, ...] = ()
+    changed: tuple[PortainerImageWatcherResult, ...] = ()
+    removed: tuple[PortainerImageWatcherResult, ...] = ()
+
+    def __bool__(self) -> bool:
+        """Return whether anything changed."""
+        return bool(self.added or self.changed or self.removed)
+
+
+@dataclass(frozen=True)
+class PortainerImageWatcherSnapshot:
+    """Immutable view of all watcher results at a single point in time.
+
+    A new snapshot is published after every change, so a snapshot that is
+    held on to never changes. Reading it needs no copy; the indexes by
+    endpoint and image are built on first use and then reused.
+
+    ``stale`` holds the containers whose result was kept from an earlier
+    check, because their endpoint could not be listed or their image could
+    not be checked in the latest one.
+    """
+
+    results: Mapping[tuple[int, str], PortainerImageWatcherResult] = field(default_factory=lambda: MappingProxyType({}))
+    images: Mapping[tuple[int, str], str] = field(default_factory=lambda: MappingProxyType({}))
+    stale: frozenset[tuple[int, str]] = frozenset()
+
+    def __len__(self) -> int:
+        """Return the number of results."""
+        return len(self.results)
+
+    def get(self, endpoint_id: int, container_id: str) -> PortainerImageWatcherResult | None:
+        """Return the result of a container, or None if it has none."""
+        return self.results.get((endpoint_id, container_id))
+
+    def is_stale(self, endpoint_id: int, container_id: str) -> bool:
+        """Return whether the result of a container was kept from an earlier check."""
+        return (endpoint_id, container_id) in self.stale
+
+    def for_endpoint(self, endpoint_id: int) -> tuple[PortainerImageWatcherResult, ...]:
+        """Return the results of all containers on an endpoint."""
+        return self._by_endpoint.get(endpoint_id, ())
+
+    def for_image(self, image: str) -> tuple[PortainerImageWatcherResult, ...]:
+        """Return the results of all containers running an image, on any endpoint.
+
+        Equivalent references, such as ``nginx`` and ``docker.io/library/nginx:latest``,
+        return the same results.
+        """
+        return self._by_image.get(_image_reference(image), ())
+
+    @cached_property
+    def _by_endpoint(self) -> Mapping[int, tuple[PortainerImageWatcherResult, ...]]:
+        index: defaultdict[int, list[PortainerImageWatcherResult]] = defaultdict(list)
+        for (endpoint_id, _), result in self.results.items():
+            index[endpoint_id].append(result)
+        return {endpoint_id: tuple(results) for endpoint_id, results in index.items()}
+
+    @cached_property
+    def _by_image(self) -> Mapping[str, tuple[PortainerImageWatcherResult, ...]]:
+        index: defaultdict[str, list[PortainerImageWatcherResult]] = defaultdict(list)
+        for key, result in self.results.items():
+            if image := self.images.get(key):
+                index[_image_reference(image)].append(result)
+        return {image: tuple(results) for image, results in index.items()}
+
+
 class PortainerImageWatcher:
     """Periodically checks all containers on an endpoint for image updates.
 
     Results are stored and accessible via the `results` property after each check.
     """
 
-    def __init__(
+    def __init__(  # pylint: disable=too-many-arguments
         self,
         portainer: Portainer,
         endpoint_id: int | None = None,
         interval: timedelta = timedelta(hours=12),
         *,
         debug: bool = False,
+        max_concurrency: int | None = 10,
+        max_concurrency_per_endpoint: int | None = None,
+        max_concurrency_per_registry: int | None = None,
+        max_parallel_endpoints: int = 1,
+        share_registry_lookups: bool = True,
+        watch_events: bool = False,
+        event_debounce: timedelta = timedelta(seconds=5),
+        store: WatcherStore | None = None,
+        jitter: float = 0.0,
+        stagger: bool = False,
+        endpoint_intervals: Mapping[int, timedelta] | None = None,
+        only_changes: bool = False,
+        max_missed_checks: int | None = 3,
     ) -> None:
         """Initialize the PortainerImageWatcher.
 
@@ -53,15 +184,82 @@ class PortainerImageWatcher:
             portainer: An authenticated Portainer client instance.
             endpoint_id: The ID of the endpoint whose containers to monitor. If None, all endpoints are monitored.
             interval: How often to poll for updates. Defaults to 12 hours.
+            max_concurrency: Maximum number of image checks in flight at once,
+                over all endpoints. None means unlimited.
+            max_concurrency_per_endpoint: Maximum number of image checks in
+                flight per endpoint. None means unlimited.
+            max_concurrency_per_registry: Maximum number of image checks in
+                flight per registry host, e.g. ``docker.io``. None means unlimited.
+            max_parallel_endpoints: Number of endpoints swept at the same time.
+                Defaults to 1, which checks endpoints one after the other.
+            share_registry_lookups: Resolve the registry digest of each unique
+                image reference once per sweep and reuse it for every endpoint
+                running that image. The local image is still inspected per endpoint.
+            watch_events: Follow the Docker events stream and check containers
+                that were created or started, or whose image was pulled, as soon
+                as they change. Full sweeps still run every ``interval``, which
+                can then be set much longer.
+            event_debounce: How long to collect events before checking the
+                affected containers in one batch.
+            store: Optional persistent store for results, e.g. a
+                :class:`~pyportainer.store.SQLiteWatcherStore`. Stored results
+                are served as soon as the watcher starts and revalidated by
+                the first check.
+            jitter: Random variation applied to every wait, as a fraction of
+                it, e.g. ``0.1`` for up to 10% shorter or longer. Keeps watcher
+                instances that started together from staying in lockstep.
+            stagger: Instead of sweeping everything at once, give every endpoint
+                its own schedule and spread its image checks evenly over its
+                interval, for a steady, low request rate.
+            endpoint_intervals: Polling interval per endpoint ID, overriding
+                ``interval``. Only used when ``stagger`` is enabled.
+            only_changes: Only invoke callbacks for results that were added or
+                whose status changed, and for removed containers, instead of
+                for every result of every check.
+            max_missed_checks: Results of containers that could not be checked,
+                because their endpoint could not be listed or their image check
+                failed, are kept from the previous check and marked stale. They
+                are dropped after this many checks in a row that missed them.
+                None keeps them until a check succeeds.
 
         """
         self._portainer = portainer
         self._endpoint_id = endpoint_id
         self._interval = interval
         self._results: dict[tuple[int, str], PortainerImageWatcherResult] = {}
+        self._snapshot = PortainerImageWatcherSnapshot()
         self._task: asyncio.Task[None] | None = None
         self._last_check: float | None = None
         self._callbacks: list[WatcherCallback] = []
+        self._change_callbacks: list[ChangeSetCallback] = []
+        self._only_changes = only_changes
+        self._max_missed_checks = max_missed_checks
+        self._missed_checks: dict[tuple[int, str], int] = {}
+
+        self._max_concurrency_per_endpoint = max_concurrency_per_endpoint
+        self._max_concurrency_per_registry = max_concurrency_per_registry
+        self._global_limit = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+        self._endpoint_limits: dict[int, asyncio.Semaphore] = {}
+        self._registry_limits: dict[str, asyncio.Semaphore] = {}
+        self._max_parallel_endpoints = max(1, max_parallel_endpoints)
+        self._endpoint_durations: dict[int, float] = {}
+        self._share_registry_lookups = share_registry_lookups
+        self._staggered_lookups: _RegistryLookups = {}
+
+        self._watch_events = watch_events
+        self._event_debounce = event_debounce
+        self._listener: PortainerEventListener | None = None
+        self._event_task: asyncio.Task[None] | None = None
+        self._dirty = asyncio.Event()
+        self._dirty_containers: dict[tuple[int, str], str] = {}
+        self._dirty_images: set[tuple[int, str]] = set()
+        self._container_images: dict[tuple[int, str], str] = {}
+        self._removed_containers: set[tuple[int, str]] = set()
+        self._store = store
+        self._jitter = min(max(jitter, 0.0), 1.0)
+        self._stagger = stagger
+        self._endpoint_intervals = dict(endpoint_intervals or {})
+        self._endpoint_tasks: dict[int, asyncio.Task[None]] = {}
 
         _LOGGER.setLevel(logging.DEBUG if debug else logging.INFO)
 
@@ -80,11 +278,33 @@ class PortainerImageWatcher:
         """Timestamp of the last completed check, or None if no checks have completed yet."""
         return self._last_check
 
+    @property
+    def endpoint_durations(self) -> dict[int, float]:
+        """Duration in seconds of the last sweep per endpoint, including endpoints that failed."""
+        return self._endpoint_durations.copy()
+
     @property
     def results(self) -> dict[tuple[int, str], PortainerImageWatcherResult]:
-        """Latest update status as of the last check."""
+        """Latest update status as of the last check.
+
+        Returns a copy on every access. Use :attr:`snapshot` for frequent reads.
+        """
         return self._results.copy()
 
+    @property
+    def snapshot(self) -> PortainerImageWatcherSnapshot:
+        """Immutable, indexed view of the latest results. Reading it does not copy anything."""
+        return self._snapshot
+
+    def _set_results(self, results: dict[tuple[int, str], PortainerImageWatcherResult]) -> None:
+        """Replace the results and publish a new snapshot of them."""
+        self._results = results
+        self._snapshot = PortainerImageWatcherSnapshot(
+            results=MappingProxyType(results),
+            images=MappingProxyType({key: self._container_images[key] for key in results if key in self._container_images}),
+            stale=frozenset(key for key in self._missed_checks if key in results),
+        )
+
     def start(self) -> None:
         """Start the background polling loop.
 
@@ -94,10 +314,26 @@ class PortainerImageWatcher:
         if self._task is None or self._task.done():
             self._task = asyncio.create_task(self._run())
 
+        if self._watch_events:
+            if self._listener is None:
+                self._listener = PortainerEventListener(self._portainer, self._endpoint_id, event_types=["container", "image"])
+                # Only the actions below are sent by Docker, through server-side filters
+                for action in (*_DIRTY_CONTAINER_ACTIONS, "destroy"):
+                    self._listener.subscribe(self._on_event, event_type="container", action=action)
+                for action in _DIRTY_IMAGE_ACTIONS:
+                    self._listener.subscribe(self._on_event, event_type="image", action=action)
+            self._listener.start()
+            if self._event_task is None or self._event_task.done():
+                self._event_task = asyncio.create_task(self._run_events())
+
     def stop(self) -> None:
         """Cancel the background polling loop."""
         if self._task and not self._task.done():
             self._task.cancel()
+        if self._listener is not None:
+            self._listener.stop()
+        if self._event_task and not self._event_task.done():
+            self._event_task.cancel()
 
     def register_callback(self, callback: WatcherCallback) -> None:
         """Register a callback to be invoked for every result after each poll cycle.
@@ -106,6 +342,9 @@ class PortainerImageWatcher:
         single :class:`PortainerImageWatcherResult` argument. Each unique callable
         is only registered once; duplicate registrations are silently ignored.
 
+        With ``only_changes`` enabled, the callback is only invoked for new and
+        changed results, and with a result without status for every removed container.
+
         Args:
         ----
             callback: A sync or async callable that accepts a
@@ -125,6 +364,94 @@ class PortainerImageWatcher:
         """
         self._callbacks.remove(callback)
 
+    def register_change_callback(self, callback: ChangeSetCallback) -> None:
+        """Register a callback to be invoked once per check with everything that changed.
+
+        Both synchronous and async callables are supported. The callback receives a
+        single :class:`PortainerImageWatcherChangeSet` argument and is not invoked
+        when nothing changed. Duplicate registrations are silently ignored.
+
+        Args:
+        ----
+            callback: A sync or async callable that accepts a
+                :class:`PortainerImageWatcherChangeSet`.
+
+        """
+        if callback not in self._change_callbacks:
+            self._change_callbacks.append(callback)
+
+    def unregister_change_callback(self, callback: ChangeSetCallback) -> None:
+        """Remove a previously registered change set callback.
+
+        Args:
+        ----
+            callback: The callable to remove. Raises :exc:`ValueError` if it was not registered.
+
+        """
+        self._change_callbacks.remove(callback)
+
+    async def _fire_change_callbacks(self, changes: PortainerImageWatcherChangeSet) -> None:
+        """Invoke all registered change set callbacks.
+
+        Exceptions raised by individual callbacks are logged but not blocking.
+        """
+        for callback in list(self._change_callbacks):
+            try:
+                ret = callback(changes)
+                if asyncio.iscoroutine(ret):
+                    await ret
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Change set callback raised an exception")
+
+    async def _publish(
+        self,
+        updates: dict[tuple[int, str], PortainerImageWatcherResult],
+        *,
+        removed: Iterable[tuple[int, str]] = (),
+    ) -> None:
+        """Apply new results, store them and notify the callbacks.
+
+        Args:
+        ----
+            updates: The results of the containers that were checked.
+            removed: Containers whose results are dropped.
+
+        """
+        previous = self._results
+        removed = {key for key in removed if key in previous and key not in updates}
+        results = {key: result for key, result in previous.items() if key not in removed} | updates
+        for key in (*updates, *removed):
+            self._missed_checks.pop(key, None)
+
+        changes = PortainerImageWatcherChangeSet(
+            added=tuple(result for key, result in updates.items() if key not in previous),
+            changed=tuple(result for key, result in updates.items() if key in previous and previous[key].status != result.status),
+            removed=tuple(previous[key] for key in removed),
+        )
+        self._set_results(results)
+
+        # Only the containers that were checked or removed are written, so the
+        # stored check time of every other container stays true
+        if self._store is not None:
+            if removed:
+                await self._write_store(self._store.remove, list(removed))
+            if updates:
+                await self._persist(self._store, updates.values())
+
+        if self._only_changes:
+            notify = [
+                *changes.added,
+                *changes.changed,
+                *(PortainerImageWatcherResult(endpoint_id=result.endpoint_id, container_id=result.container_id) for result in changes.removed),
+            ]
+        else:
+            notify = list(updates.values())
+
+        if self._callbacks and notify:
+            await asyncio.gather(*(self._fire_callbacks(result) for result in notify))
+        if self._change_callbacks and changes:
+            await self._fire_change_callbacks(changes)
+
     async def _fire_callbacks(self, result: PortainerImageWatcherResult) -> None:
         """Invoke all registered callbacks for a single result.
 
@@ -138,11 +465,68 @@ class PortainerImageWatcher:
             except Exception:  # pylint: disable=broad-except
                 _LOGGER.exception("Callback raised an exception for container %s", result.container_id)
 
+    def _limits(self, endpoint_id: int, image: str) -> list[asyncio.Semaphore]:
+        """Return the semaphores an image check has to hold, in acquisition order.
+
+        Semaphores are always acquired from the narrowest to the widest scope,
+        so a check waiting for its registry never occupies a global slot.
+        """
+        limits: list[asyncio.Semaphore] = []
+        if self._max_concurrency_per_registry:
+            registry = _image_registry(image)
+            if registry not in self._registry_limits:
+                self._registry_limits[registry] = asyncio.Semaphore(self._max_concurrency_per_registry)
+            limits.append(self._registry_limits[registry])
+        if self._max_concurrency_per_endpoint:
+            if endpoint_id not in self._endpoint_limits:
+                self._endpoint_limits[endpoint_id] = asyncio.Semaphore(self._max_concurrency_per_endpoint)
+            limits.append(self._endpoint_limits[endpoint_id])
+        if self._global_limit is not None:
+            limits.append(self._global_limit)
+        return limits
+
+    async def _check_image(self, endpoint_id: int, image: str, lookups: _RegistryLookups) -> PortainerImageUpdateStatus:
+        """Check a single image once a slot is free within every concurrency limit."""
+        async with AsyncExitStack() as stack:
+            for limit in self._limits(endpoint_id, image):
+                await stack.enter_async_context(limit)
+            registry_information = await self._registry_information(endpoint_id, image, lookups) if self._share_registry_lookups else None
+            return await self._portainer.container_image_status(endpoint_id, image, registry_information=registry_information)
+
+    async def _registry_information(self, endpoint_id: int, image: str, lookups: _RegistryLookups) -> ImageInformation | None:
+        """Return the registry information of an image, looked up once per sweep for all endpoints.
+
+        The first endpoint that checks an image reference performs the lookup;
+        every other endpoint awaits the same task. Returns None if the lookup
+        failed, so each endpoint falls back to a lookup of its own, e.g. when
+        only some endpoints have access to the registry.
+        """
+        reference = _image_reference(image)
+        task = lookups.get(reference)
+        if task is None:
+            task = asyncio.create_task(self._portainer.get_image_information(endpoint_id, image))
+            lookups[reference] = task
+        else:
+            _LOGGER.debug("Reusing registry lookup of %s for endpoint %s", reference, endpoint_id)
+
+        try:
+            return await asyncio.shield(task)
+        except PortainerError:
+            return None
+
     async def _run(self) -> None:
         """Loop that checks immediately, then sleep for the interval, then repeat.
 
         Errors during checks are logged but don't stop the watcher, allowing recovery from transient issues.
+        Stored results, if any, are loaded before the first check.
         """
+        if self._store is not None and not self._results:
+            await self._load_store(self._store)
+
+        if self._stagger:
+            await self._run_staggered()
+            return
+
         while True:
             try:
                 await self._check_all()
@@ -157,55 +541,392 @@ class PortainerImageWatcher:
             finally:
                 self._last_check = time.time()
 
-            await asyncio.sleep(self._interval.total_seconds())
+            await asyncio.sleep(self._jittered(self._interval.total_seconds()))
+
+    def _jittered(self, seconds: float) -> float:
+        """Return a delay with up to ``jitter`` of random variation in either direction."""
+        if not self._jitter:
+            return seconds
+        return seconds * random.uniform(1 - self._jitter, 1 + self._jitter)  # noqa: S311
+
+    def _endpoint_interval(self, endpoint_id: int) -> float:
+        """Return the polling interval of an endpoint in seconds."""
+        return self._endpoint_intervals.get(endpoint_id, self._interval).total_seconds()
+
+    async def _endpoint_ids(self) -> list[int]:
+        """Return the IDs of the endpoints to check."""
+        if self._endpoint_id is not None:
+            return [self._endpoint_id]
+
+        _LOGGER.debug("No endpoint_id specified, fetching all endpoints to check.")
+        endpoints = await self._portainer.get_endpoints()
+        return [endpoint.id for endpoint in endpoints]
+
+    async def _run_staggered(self) -> None:
+        """Run an independent, staggered schedule for every endpoint.
+
+        The endpoint list is resolved again every ``interval``, so endpoints
+        that are added get a schedule of their own and those that are removed
+        are no longer checked. Registry lookups are shared by all endpoints
+        until then, and looked up again in the next interval.
+        """
+        try:
+            while True:
+                self._staggered_lookups = {}
+                try:
+                    await self._reconcile_endpoints(await self._endpoint_ids())
+                except PortainerError:
+                    _LOGGER.exception("Error while fetching endpoints to check")
+                await asyncio.sleep(self._jittered(self._interval.total_seconds()))
+        finally:
+            for task in self._endpoint_tasks.values():
+                task.cancel()
+            self._endpoint_tasks = {}
+
+    async def _reconcile_endpoints(self, endpoint_ids: list[int]) -> None:
+        """Start a schedule for every new endpoint and stop those of endpoints that are gone.
+
+        New endpoints start at evenly spread offsets within their interval, in
+        the order they are listed, so they are not all checked at once.
+        """
+        for index, endpoint_id in enumerate(endpoint_ids):
+            if endpoint_id not in self._endpoint_tasks:
+                offset = index * self._endpoint_interval(endpoint_id) / len(endpoint_ids)
+                self._endpoint_tasks[endpoint_id] = asyncio.create_task(self._run_endpoint(endpoint_id, offset))
+
+        gone = self._endpoint_tasks.keys() - set(endpoint_ids)
+        for endpoint_id in gone:
+            _LOGGER.debug("Endpoint %s was removed, no longer checking it", endpoint_id)
+            self._endpoint_tasks.pop(endpoint_id).cancel()
+
+        stale = [key for key in self._results if key[0] in gone]
+        if stale:
+            for key in stale:
+                self._container_images.pop(key, None)
+            await self._publish({}, removed=stale)
+
+    async def _run_endpoint(self, endpoint_id: int, offset: float = 0.0) -> None:
+        """Loop that checks a single endpoint, spreading its image checks over its interval.
+
+        The first round starts after ``offset`` seconds plus a random delay
+        within ``jitter`` of the interval, so endpoints and watcher instances
+        do not start in lockstep.
+        """
+        await asyncio.sleep(offset + random.uniform(0, self._jitter * self._endpoint_interval(endpoint_id)))  # noqa: S311
+
+        while True:
+            interval = self._endpoint_interval(endpoint_id)
+            started = time.monotonic()
+            try:
+                await self._check_endpoint_staggered(endpoint_id, interval)
+            except PortainerError:
+                _LOGGER.exception("Error during image check of endpoint %s", endpoint_id)
+            except Exception:  # pylint: disable=broad-except
+                # Keep checking the endpoint, as an error here would stop its schedule for good
+                _LOGGER.exception("Unexpected error during image check of endpoint %s", endpoint_id)
+            finally:
+                self._last_check = time.time()
+                self._endpoint_durations = {**self._endpoint_durations, endpoint_id: time.monotonic() - started}
+
+            await asyncio.sleep(self._jittered(max(interval - (time.monotonic() - started), 0.0)))
+
+    async def _check_endpoint_staggered(self, endpoint_id: int, interval: float) -> None:
+        """Check the images of an endpoint one at a time, evenly spaced over ``interval`` seconds.
+
+        Results and callbacks are updated after every image, and results of
+        containers that no longer run on the endpoint are dropped. Results that
+        could not be checked in this round are kept and marked stale, for up
+        to ``max_missed_checks`` rounds.
+        """
+        try:
+            containers = await self._portainer.get_containers(endpoint_id)
+        except PortainerError:
+            _LOGGER.warning("Failed to fetch containers for endpoint %s, skipping", endpoint_id)
+            await self._publish({}, removed=self._expire_missed([endpoint_id], ()))
+            return
+
+        image_containers: defaultdict[str, list[str]] = defaultdict(list)
+        for container in containers:
+            if container.image and container.state == "running":
+                image_containers[container.image].append(container.id)
+                self._container_images[(endpoint_id, container.id)] = container.image
+
+        running = {(endpoint_id, container_id) for container_ids in image_containers.values() for container_id in container_ids}
+        stale = [key for key in self._results if key[0] == endpoint_id and key not in running]
+        if stale:
+            for key in stale:
+                self._container_images.pop(key, None)
+            await self._publish({}, removed=stale)
+
+        _LOGGER.debug("Checking %d unique images for endpoint %s over %.0f seconds", len(image_containers), endpoint_id, interval)
+
+        checked: set[tuple[int, str]] = set()
+        spacing = interval / len(image_containers) if image_containers else 0.0
+        for index, (image, container_ids) in enumerate(image_containers.items()):
+            if index:
+                await asyncio.sleep(self._jittered(spacing))
+            updates = await self._check_images(endpoint_id, {image: container_ids}, self._staggered_lookups)
+            if updates:
+                checked.update(updates)
+                await self._publish(updates)
+
+        await self._publish({}, removed=self._expire_missed([endpoint_id], checked))
+
+    def _expire_missed(self, endpoint_ids: Collection[int], checked: Container[tuple[int, str]]) -> list[tuple[int, str]]:
+        """Count a missed check for every result of the endpoints that was not checked.
+
+        Returns
+        -------
+            The containers whose results were missed ``max_missed_checks`` times in a row.
+
+        """
+        expired = []
+        for key in self._results:
+            if key[0] in endpoint_ids and key not in checked:
+                missed = self._missed_checks[key] = self._missed_checks.get(key, 0) + 1
+                if self._max_missed_checks is not None and missed >= self._max_missed_checks:
+                    expired.append(key)
+        return expired
 
     async def _check_all(self) -> None:
-        """Fetch all containers and check each unique image concurrently.
+        """Fetch all containers and check each unique image concurrently, within the concurrency limits.
 
+        Up to ``max_parallel_endpoints`` endpoints are swept at the same time.
         Errors for individual images are logged but silently skipped so one
         failing image does not prevent the rest from being checked.
+
+        A result is dropped when its container is missing from a successful
+        listing, or its endpoint is no longer checked. Containers on an
+        endpoint that could not be listed, or whose image failed to check,
+        keep their previous result, marked stale, for up to
+        ``max_missed_checks`` sweeps.
         """
-        if self._endpoint_id is not None:
-            endpoint_ids: list[int] = [self._endpoint_id]
-        else:
-            _LOGGER.debug("No endpoint_id specified, fetching all endpoints to check.")
-            endpoints = await self._portainer.get_endpoints()
-            endpoint_ids = [endpoint.id for endpoint in endpoints]
+        endpoint_ids = await self._endpoint_ids()
+
+        durations: dict[int, float] = {}
+        lookups: _RegistryLookups = {}
+        container_images: dict[tuple[int, str], str] = {}
+        sweep_limit = asyncio.Semaphore(self._max_parallel_endpoints)
+
+        async def sweep(endpoint_id: int) -> dict[tuple[int, str], PortainerImageWatcherResult] | None:
+            async with sweep_limit:
+                started = time.monotonic()
+                try:
+                    return await self._check_endpoint(endpoint_id, lookups, container_images)
+                finally:
+                    durations[endpoint_id] = time.monotonic() - started
+                    _LOGGER.debug("Swept endpoint %s in %.2f seconds", endpoint_id, durations[endpoint_id])
 
         fresh: dict[tuple[int, str], PortainerImageWatcherResult] = {}
+        unlisted: set[int] = set()
+        # Results are merged in endpoint order, regardless of which sweep finished first
+        for endpoint_id, endpoint_results in zip(
+            endpoint_ids, await asyncio.gather(*(sweep(endpoint_id) for endpoint_id in endpoint_ids)), strict=True
+        ):
+            if endpoint_results is None:
+                unlisted.add(endpoint_id)
+            else:
+                fresh.update(endpoint_results)
+
+        removed = [
+            key
+            for key in self._results
+            if key not in fresh and key[0] not in unlisted and (key[0] not in endpoint_ids or key not in container_images)
+        ]
+        removed += self._expire_missed(endpoint_ids, fresh.keys() | set(removed))
+        self._endpoint_durations = durations
+        self._container_images = {key: image for key, image in self._container_images.items() if key[0] in unlisted} | container_images
+        await self._publish(fresh, removed=removed)
+
+    async def _check_endpoint(
+        self,
+        endpoint_id: int,
+        lookups: _RegistryLookups,
+        container_images: dict[tuple[int, str], str],
+    ) -> dict[tuple[int, str], PortainerImageWatcherResult] | None:
+        """Fetch the containers of a single endpoint and check each unique image.
+
+        The image of every running container is recorded in ``container_images``.
 
-        for endpoint_id in endpoint_ids:
+        Returns
+        -------
+            The results for the running containers of the endpoint, or None if
+            the containers could not be fetched.
+
+        """
+        try:
+            containers = await self._portainer.get_containers(endpoint_id)
+        except PortainerError:
+            _LOGGER.warning("Failed to fetch containers for endpoint %s, skipping", endpoint_id)
+            return None
+
+        image_containers = defaultdict(list)
+        for container in containers:
+            if container.image and container.state == "running":
+                image_containers[container.image].append(container.id)
+                container_images[(endpoint_id, container.id)] = container.image
+
+        _LOGGER.debug("Checking %d unique images for endpoint %s...", len(image_containers), endpoint_id)
+
+        return await self._check_images(endpoint_id, image_containers, lookups)
+
+    async def _check_images(
+        self,
+        endpoint_id: int,
+        image_containers: dict[str, list[str]],
+        lookups: _RegistryLookups,
+    ) -> dict[tuple[int, str], PortainerImageWatcherResult]:
+        """Check each image once and build a result for every container running it.
+
+        Returns
+        -------
+            The results per container. Images that failed to check are left out.
+
+        """
+        results: dict[tuple[int, str], PortainerImageWatcherResult] = {}
+        statuses = await asyncio.gather(
+            *(self._check_image(endpoint_id, image, lookups) for image in image_containers),
+            return_exceptions=True,
+        )
+        for image, status in zip(image_containers, statuses, strict=False):
+            if isinstance(status, BaseException):
+                _LOGGER.warning("Failed to check image %s on endpoint %s: %s", image, endpoint_id, status)
+                continue
+            for container_id in image_containers[image]:
+                results[(endpoint_id, container_id)] = PortainerImageWatcherResult(
+                    endpoint_id=endpoint_id,
+                    container_id=container_id,
+                    status=status,
+                )
+
+                _LOGGER.debug("Checked image %s on endpoint %s for container %s", image, endpoint_id, container_id)
+
+        return results
+
+    def _on_event(self, result: PortainerEventListenerResult) -> None:
+        """Mark the containers affected by a Docker event for a check."""
+        event = result.event
+        if event.actor is None or event.actor.id is None:
+            return
+
+        key = (result.endpoint_id, event.actor.id)
+        if event.type == "container" and event.action in _DIRTY_CONTAINER_ACTIONS:
+            image = (event.actor.attributes or {}).get("image")
+            if image:
+                self._dirty_containers[key] = image
+                self._dirty.set()
+        elif event.type == "container" and event.action == "destroy":
+            self._dirty_containers.pop(key, None)
+            self._container_images.pop(key, None)
+            self._removed_containers.add(key)
+            self._dirty.set()
+        elif event.type == "image" and event.action in _DIRTY_IMAGE_ACTIONS:
+            # The actor of a pull is the image reference, e.g. "nginx:1.27". A tag
+            # is reported on the image ID, with the new reference as its name.
+            reference = event.actor.id if event.action == "pull" else (event.actor.attributes or {}).get("name")
+            if reference:
+                self._dirty_images.add((result.endpoint_id, _image_reference(reference)))
+                self._dirty.set()
+
+    async def _run_events(self) -> None:
+        """Loop that checks the containers marked by Docker events, in debounced batches."""
+        while True:
+            await self._dirty.wait()
+            await asyncio.sleep(self._event_debounce.total_seconds())
+            self._dirty.clear()
             try:
-                containers = await self._portainer.get_containers(endpoint_id)
+                await self._check_dirty()
             except PortainerError:
-                _LOGGER.warning("Failed to fetch containers for endpoint %s, skipping", endpoint_id)
-                continue
-
-            image_containers = defaultdict(list)
-            for container in containers:
-                if container.image and container.state == "running":
-                    image_containers[container.image].append(container.id)
+                _LOGGER.exception("Error during event-driven image check")
 
-            _LOGGER.debug("Checking %d unique images for endpoint %s...", len(image_containers), endpoint_id)
+    async def _check_dirty(self) -> None:
+        """Check only the containers marked by Docker events since the last batch.
 
-            statuses = await asyncio.gather(
-                *(self._portainer.container_image_status(endpoint_id, image) for image in image_containers),
-                return_exceptions=True,
+        Containers running an image that was pulled are looked up from the
+        last full sweep, and results of destroyed containers are dropped.
+        Results of other containers are left untouched, and callbacks only
+        fire for the containers that were checked.
+        """
+        containers, self._dirty_containers = self._dirty_containers, {}
+        images, self._dirty_images = self._dirty_images, set()
+        removed, self._removed_containers = self._removed_containers, set()
+        for key, image in self._container_images.items():
+            if (key[0], _image_reference(image)) in images:
+                containers.setdefault(key, image)
+
+        if not containers:
+            if removed:
+                await self._publish({}, removed=removed)
+            return
+
+        by_endpoint: defaultdict[int, defaultdict[str, list[str]]] = defaultdict(lambda: defaultdict(list))
+        for (endpoint_id, container_id), image in containers.items():
+            by_endpoint[endpoint_id][image].append(container_id)
+
+        _LOGGER.debug("Checking %d containers marked by Docker events", len(containers))
+
+        lookups: _RegistryLookups = {}
+        updates: dict[tuple[int, str], PortainerImageWatcherResult] = {}
+        for results in await asyncio.gather(
+            *(self._check_images(endpoint_id, image_containers, lookups) for endpoint_id, image_containers in by_endpoint.items())
+        ):
+            updates.update(results)
+
+        self._container_images.update(containers)
+        await self._publish(updates, removed=removed)
+
+    async def _load_store(self, store: WatcherStore) -> None:
+        """Serve the results of a previous run from the store until the first check completes."""
+        try:
+            records = await asyncio.to_thread(store.load)
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Failed to load stored image watcher results")
+            return
+
+        results: dict[tuple[int, str], PortainerImageWatcherResult] = {}
+        for record in records:
+            key = (record.endpoint_id, record.container_id)
+            results[key] = PortainerImageWatcherResult(
+                endpoint_id=record.endpoint_id,
+                container_id=record.container_id,
+                status=PortainerImageUpdateStatus(
+                    update_available=record.update_available,
+                    local_digest=record.local_digest,
+                    registry_digest=record.registry_digest,
+                ),
+            )
+            if record.image:
+                self._container_images[key] = record.image
+
+        # A check may already have completed while the store was read
+        if not self._results:
+            self._set_results(results)
+            if records:
+                self._last_check = max(record.checked_at for record in records)
+        _LOGGER.debug("Loaded %d stored image watcher results", len(results))
+
+    async def _persist(self, store: WatcherStore, results: Iterable[PortainerImageWatcherResult]) -> None:
+        """Insert or update the stored results of the containers that were just checked."""
+        checked_at = time.time()
+        records = [
+            StoredImageStatus(
+                endpoint_id=result.endpoint_id,
+                container_id=result.container_id,
+                image=self._container_images.get((result.endpoint_id, result.container_id)),
+                update_available=result.status.update_available,
+                local_digest=result.status.local_digest,
+                registry_digest=result.status.registry_digest,
+                checked_at=checked_at,
             )
-            for image, status in zip(image_containers, statuses, strict=False):
-                if isinstance(status, BaseException):
-                    _LOGGER.warning("Failed to check image %s on endpoint %s: %s", image, endpoint_id, status)
-                    continue
-                for container_id in image_containers[image]:
-                    fresh[(endpoint_id, container_id)] = PortainerImageWatcherResult(
-                        endpoint_id=endpoint_id,
-                        container_id=container_id,
-                        status=status,
-                    )
-
-                    _LOGGER.debug("Checked image %s on endpoint %s for container %s", image, endpoint_id, container_id)
-
-        self._results = fresh
-
-        if self._callbacks and fresh:
-            await asyncio.gather(*(self._fire_callbacks(result) for result in fresh.values()))
+            for result in results
+            if result.endpoint_id is not None and result.container_id is not None and result.status is not None
+        ]
+        await self._write_store(store.update, records)
+
+    @staticmethod
+    async def _write_store(write: Callable[[list[Any]], None], items: list[Any]) -> None:
+        """Run a store write in a worker thread. Failures are logged, never raised."""
+        try:
+            await asyncio.to_thread(write, items)
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Failed to store image watcher results")
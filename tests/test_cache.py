@@ -0,0 +1,197 @@
+"""Tests for the response cache of the Portainer client."""
+
+import asyncio
+import json
+from datetime import timedelta
+
+import pytest
+from aiohttp.web import Request, Response
+from aresponses import ResponsesMockServer
+from freezegun import freeze_time
+
+from pyportainer import Portainer, PortainerResponseCache
+
+from . import load_fixtures
+
+
+def _add_docker_info(aresponses: ResponsesMockServer, repeat: int = 1) -> None:
+    aresponses.add(
+        "localhost:9000",
+        "/api/endpoints/1/docker/info",
+        "GET",
+        aresponses.Response(status=200, headers={"Content-Type": "application/json"}, text=load_fixtures("docker_info.json")),
+        repeat=repeat,
+    )
+
+
+async def test_cache_hit(aresponses: ResponsesMockServer) -> None:
+    """Test that a cached response is served without a second request."""
+    _add_docker_info(aresponses)
+
+    cache = PortainerResponseCache()
+    async with Portainer(api_url="http://localhost:9000", api_key="test-api-key", response_cache=cache) as client:
+        first = await client.docker_info(1)
+        second = await client.docker_info(1)
+
+    assert first == second
+    assert first is not second
+    assert cache.hits == 1
+    assert cache.misses == 1
+    aresponses.assert_plan_strictly_followed()
+
+
+async def test_cache_expiry(aresponses: ResponsesMockServer) -> None:
+    """Test that an expired response is fetched again."""
+    _add_docker_info(aresponses, repeat=2)
+
+    cache = PortainerResponseCache(ttls={"docker_info": timedelta(seconds=5)})
+    async with Portainer(api_url="http://localhost:9000", api_key="test-api-key", response_cache=cache) as client:
+        with freeze_time("2025-01-01T00:00:00Z") as frozen:
+            await client.docker_info(1)
+            frozen.tick(timedelta(seconds=6))
+            await client.docker_info(1)
+
+    assert cache.hits == 0
+    aresponses.assert_plan_strictly_followed()
+
+
+async def test_cache_disabled_by_zero_ttl(aresponses: ResponsesMockServer) -> None:
+    """Test that a zero TTL disables caching for a method."""
+    _add_docker_info(aresponses, repeat=2)
+
+    cache = PortainerResponseCache(ttls={"docker_info": timedelta(0)})
+    async with Portainer(api_url="http://localhost:9000", api_key="test-api-key", response_cache=cache) as client:
+        await client.docker_info(1)
+        await client.docker_info(1)
+
+    assert len(cache) == 0
+    aresponses.assert_plan_strictly_followed()
+
+
+async def test_cache_invalidated_by_mutation(aresponses: ResponsesMockServer) -> None:
+    """Test that a mutating call drops the cached responses of its endpoint."""
+    _add_docker_info(aresponses)
+    aresponses.add(
+        "localhost:9000",
+        "/api/endpoints/1/docker/containers/abc/stop",
+        "POST",
+        aresponses.Response(status=204),
+    )
+    _add_docker_info(aresponses)
+
+    cache = PortainerResponseCache()
+    async with Portainer(api_url="http://localhost:9000", api_key="test-api-key", response_cache=cache) as client:
+        await client.docker_info(1)
+        await client.stop_container(1, "abc")
+        assert len(cache) == 0
+        await client.docker_info(1)
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.parametrize("action", ["start", "stop"])
+async def test_cache_invalidated_by_stack_change(aresponses: ResponsesMockServer, action: str) -> None:
+    """Test that starting or stopping a stack drops the cached responses of its endpoint."""
+    _add_docker_info(aresponses)
+    aresponses.add(
+        "localhost:9000",
+        f"/api/stacks/1/{action}",
+        "POST",
+        aresponses.Response(status=200, headers={"Content-Type": "application/json"}, text=load_fixtures("stack.json")),
+        match_querystring=False,
+    )
+    _add_docker_info(aresponses)
+
+    cache = PortainerResponseCache()
+    async with Portainer(api_url="http://localhost:9000", api_key="test-api-key", response_cache=cache) as client:
+        await client.docker_info(1)
+        await getattr(client, f"{action}_stack")(1, 1)
+        await client.docker_info(1)
+
+    assert cache.hits == 0
+    aresponses.assert_plan_strictly_followed()
+
+
+async def test_cache_skips_response_read_across_invalidation(aresponses: ResponsesMockServer) -> None:
+    """Test that a response read while a write completes is not cached."""
+    release = asyncio.Event()
+    containers = 1
+
+    async def docker_info(_request: Request) -> Response:
+        """Answer with the number of containers when the request arrived."""
+        count = containers
+        await release.wait()
+        return Response(status=200, headers={"Content-Type": "application/json"}, text=json.dumps({"Containers": count}))
+
+    aresponses.add("localhost:9000", "/api/endpoints/1/docker/info", "GET", docker_info)
+    aresponses.add(
+        "localhost:9000",
+        "/api/endpoints/1/docker/containers/create",
+        "POST",
+        aresponses.Response(status=201, headers={"Content-Type": "application/json"}, text='{"Id": "web"}'),
+        match_querystring=False,
+    )
+    aresponses.add("localhost:9000", "/api/endpoints/1/docker/info", "GET", docker_info)
+
+    cache = PortainerResponseCache()
+    async with Portainer(api_url="http://localhost:9000", api_key="test-api-key", response_cache=cache) as client:
+        stale = asyncio.create_task(client.docker_info(1))
+        await asyncio.sleep(0.01)
+
+        await client.container_create(1, name="web", image="nginx", config={})
+        containers = 2
+        release.set()
+
+        assert (await stale).containers == 1
+        assert len(cache) == 0
+        assert (await client.docker_info(1)).containers == 2
+
+    aresponses.assert_plan_strictly_followed()
+
+
+def test_cache_set_skips_invalidated_generation() -> None:
+    """Test that a body read before an invalidation of its endpoint is not stored."""
+    cache = PortainerResponseCache()
+    key = ("docker_info", 1, "http://localhost:9000/api/endpoints/1/docker/info", ())
+    unscoped = ("get_endpoints", None, "http://localhost:9000/api/endpoints", ())
+
+    generation = cache.generation(1)
+    unscoped_generation = cache.generation(None)
+    cache.invalidate(endpoint_id=2)
+    cache.set(key, b"1", generation=generation)
+    assert cache.get(key) == (True, b"1")
+
+    generation = cache.generation(1)
+    cache.invalidate(endpoint_id=1)
+    cache.set(key, b"2", generation=generation)
+    assert cache.get(key) == (False, None)
+
+    cache.set(unscoped, b"[]", generation=unscoped_generation)
+    assert cache.get(unscoped) == (True, b"[]")
+    generation = cache.generation(1)
+    cache.invalidate()
+    cache.set(key, b"3", generation=generation)
+    assert cache.get(key) == (False, None)
+
+
+def test_cache_lru_eviction() -> None:
+    """Test that the least recently used entry is evicted when the cache is full."""
+    cache = PortainerResponseCache(max_size=2)
+    first = ("docker_info", 1, "http://localhost:9000/api/endpoints/1/docker/info", ())
+    second = ("docker_info", 2, "http://localhost:9000/api/endpoints/2/docker/info", ())
+    third = ("docker_info", 3, "http://localhost:9000/api/endpoints/3/docker/info", ())
+
+    cache.set(first, b"1")
+    cache.set(second, b"2")
+    assert cache.get(first) == (True, b"1")
+    cache.set(third, b"3")
+
+    assert len(cache) == 2
+    assert cache.get(second) == (False, None)
+    assert cache.get(first) == (True, b"1")
+    assert cache.get(third) == (True, b"3")
+
+    cache.invalidate(endpoint_id=1)
+    assert cache.get(first) == (False, None)
+    cache.invalidate()
+    assert len(cache) == 0
@@ -0,0 +1,356 @@
+"""Tests for the PortainerStatsCollector background task."""
+# pylint: disable=protected-access
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+from typing import TYPE_CHECKING
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from pyportainer import PortainerStatsCollector, PortainerStatsSnapshot
+from pyportainer.collector import container_stats_result
+from pyportainer.exceptions import PortainerConnectionError, PortainerError, PortainerNotFoundError
+from pyportainer.listener import PortainerEventListenerResult
+from pyportainer.models.docker import DockerContainerStats, DockerEvent, EndpointStatus
+from tests import load_fixtures
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
+
+ENDPOINT_ID = 1
+
+
+def _stats(fixture: str = "container_stats_2.json") -> DockerContainerStats:
+    """Load a stats sample fixture."""
+    return DockerContainerStats.from_json(load_fixtures(fixture))
+
+
+def _fake_portainer(running: list[str], stopped: list[str] | None = None) -> MagicMock:
+    """Build a fake client whose stats streams send one sample and then stay open."""
+    portainer = MagicMock()
+    portainer.get_containers = AsyncMock(
+        return_value=[MagicMock(id=container_id, state="running") for container_id in running]
+        + [MagicMock(id=container_id, state="exited") for container_id in stopped or []],
+    )
+
+    async def stream_container_stats(_endpoint_id: int, _container_id: str) -> AsyncGenerator[DockerContainerStats, None]:
+        yield _stats()
+        await asyncio.Event().wait()
+
+    portainer.stream_container_stats = stream_container_stats
+    return portainer
+
+
+def _event(action: str, container_id: str) -> PortainerEventListenerResult:
+    """Build a listener result for a container event."""
+    event = DockerEvent.from_dict({"Type": "container", "Action": action, "Actor": {"ID": container_id}})
+    return PortainerEventListenerResult(endpoint_id=ENDPOINT_ID, event=event)
+
+
+async def _settle() -> None:
+    """Let the stream tasks run until they wait for the next sample."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_container_stats_result() -> None:
+    """Test that a stats sample is summarized like docker stats does."""
+    result = container_stats_result(ENDPOINT_ID, "abc", _stats())
+
+    assert result.cpu_percentage == pytest.approx(0.0400216355)
+    assert result.memory_usage == 6537216
+    assert result.memory_limit == 67108864
+    assert result.memory_percentage == pytest.approx(9.7412109375)
+    assert result.network_rx_bytes == 9979
+    assert result.network_tx_bytes == 1338
+
+    stats = _stats()
+    stats.memory_stats.stats.inactive_file = 1048576
+    stats.blkio_stats = {
+        "io_service_bytes_recursive": [
+            {"major": 8, "minor": 0, "op": "read", "value": 4096},
+            {"major": 8, "minor": 0, "op": "write", "value": 8192},
+            {"major": 8, "minor": 16, "op": "Read", "value": 1024},
+        ],
+    }
+    result = container_stats_result(ENDPOINT_ID, "abc", stats)
+    assert result.memory_usage == 6537216 - 1048576
+    assert (result.block_read_bytes, result.block_write_bytes) == (5120, 8192)
+
+
+async def test_stats_collector_snapshot() -> None:
+    """Test that running containers are streamed and published in one snapshot per tick."""
+    collector = PortainerStatsCollector(_fake_portainer(["web", "db"], stopped=["old"]), endpoint_id=ENDPOINT_ID)
+    snapshots: list[PortainerStatsSnapshot] = []
+    collector.register_callback(snapshots.append)
+
+    await collector._resync()
+    await _settle()
+    await collector._tick()
+
+    assert collector.containers == {(ENDPOINT_ID, "web"), (ENDPOINT_ID, "db")}
+    assert snapshots == [collector.snapshot]
+    assert len(collector.snapshot) == 2
+    web = collector.snapshot.get(ENDPOINT_ID, "web")
+    assert web is not None
+    assert web.cpu_percentage == pytest.approx(0.0400216355)
+    assert collector.snapshot.get(ENDPOINT_ID, "old") is None
+
+    collector.stop()
+    await _settle()
+    assert not collector.containers
+
+
+async def test_stats_collector_follows_events() -> None:
+    """Test that containers that start or stop open and close their streams."""
+    collector = PortainerStatsCollector(_fake_portainer(["web"]), endpoint_id=ENDPOINT_ID)
+    await collector._resync()
+
+    collector._on_event(_event("start", "worker"))
+    collector._on_event(_event("die", "web"))
+    await _settle()
+    await collector._tick()
+
+    assert collector.containers == {(ENDPOINT_ID, "worker")}
+    assert set(collector.snapshot.results) == {(ENDPOINT_ID, "worker")}
+
+    collector.stop()
+
+
+async def test_stats_collector_concurrency_limit() -> None:
+    """Test that only max_concurrency streams are opened at once."""
+    portainer = MagicMock()
+    portainer.get_containers = AsyncMock(return_value=[MagicMock(id=str(index), state="running") for index in range(5)])
+    connected = asyncio.Event()
+    connecting = 0
+    peak = 0
+
+    async def stream_container_stats(_endpoint_id: int, _container_id: str) -> AsyncGenerator[DockerContainerStats, None]:
+        nonlocal connecting, peak
+        connecting += 1
+        peak = max(peak, connecting)
+        await connected.wait()
+        connecting -= 1
+        yield _stats()
+        await asyncio.Event().wait()
+
+    portainer.stream_container_stats = stream_container_stats
+    collector = PortainerStatsCollector(portainer, endpoint_id=ENDPOINT_ID, max_concurrency=2)
+
+    await collector._resync()
+    await _settle()
+    assert connecting == 2
+
+    connected.set()
+    await _settle()
+    await collector._tick()
+    assert peak == 2
+    assert len(collector.snapshot) == 5
+
+    collector.stop()
+
+
+async def test_stats_collector_history() -> None:
+    """Test that every sample is kept in the history of its container until it stops."""
+    collector = PortainerStatsCollector(_fake_portainer(["web"]), endpoint_id=ENDPOINT_ID, history_size=30)
+    await collector._resync()
+    await _settle()
+
+    history = collector.history(ENDPOINT_ID, "web")
+    assert history is not None
+    assert history.size == 30
+    assert history.series("memory_usage") == [6537216]
+    # Samples are placed at the time the daemon took them, not when they arrived
+    assert history.timestamps() == [pytest.approx(1420757852.547920)]
+
+    collector._on_event(_event("die", "web"))
+    assert collector.history(ENDPOINT_ID, "web") is None
+    assert PortainerStatsCollector(_fake_portainer([])).history(ENDPOINT_ID, "web") is None
+
+    collector.stop()
+
+
+async def test_stats_collector_start_stop() -> None:
+    """Test that start() resyncs and publishes snapshots until stop() cancels everything."""
+    collector = PortainerStatsCollector(_fake_portainer(["web"]), endpoint_id=ENDPOINT_ID, interval=timedelta(milliseconds=10))
+    listener = collector._listener = MagicMock()
+    snapshots: list[PortainerStatsSnapshot] = []
+    collector.register_callback(snapshots.append)
+
+    collector.start()
+    resync_task, task = collector._resync_task, collector._task
+    assert resync_task is not None
+    assert task is not None
+    listener.start.assert_called_once()
+
+    await asyncio.sleep(0.05)
+    assert collector.containers == {(ENDPOINT_ID, "web")}
+    assert snapshots
+    assert snapshots[-1].get(ENDPOINT_ID, "web") is not None
+
+    collector.start()
+    assert collector._resync_task is resync_task
+    assert collector._task is task
+
+    collector.stop()
+    await _settle()
+    assert resync_task.done()
+    assert task.done()
+    listener.stop.assert_called_once()
+    assert not collector.containers
+
+
+async def test_stats_collector_resync_error() -> None:
+    """Test that a failed resync is logged and retried at the next resync interval."""
+    portainer = _fake_portainer(["web"])
+    portainer.get_endpoints = AsyncMock(side_effect=PortainerError("boom"))
+    collector = PortainerStatsCollector(portainer, resync_interval=timedelta(milliseconds=10))
+
+    task = asyncio.create_task(collector._run_resync())
+    await _settle()
+    assert portainer.get_endpoints.await_count == 1
+    assert not collector.containers
+
+    portainer.get_endpoints.side_effect = None
+    portainer.get_endpoints.return_value = [MagicMock(id=ENDPOINT_ID, status=EndpointStatus.UP)]
+    await asyncio.sleep(0.05)
+    assert collector.containers == {(ENDPOINT_ID, "web")}
+
+    task.cancel()
+    collector.stop()
+
+
+async def test_stats_collector_all_endpoints() -> None:
+    """Test that every endpoint that is not down is collected, and failed listings keep their streams."""
+    portainer = _fake_portainer([])
+    portainer.get_endpoints = AsyncMock(
+        return_value=[
+            MagicMock(id=1, status=EndpointStatus.UP),
+            MagicMock(id=2, status=EndpointStatus.UP),
+            MagicMock(id=3, status=EndpointStatus.DOWN),
+        ],
+    )
+    listings: dict[int, list[MagicMock]] = {
+        1: [MagicMock(id="web", state="running")],
+        2: [MagicMock(id="db", state="running")],
+    }
+
+    async def get_containers(endpoint_id: int) -> list[MagicMock]:
+        if endpoint_id not in listings:
+            msg = "Endpoint unreachable"
+            raise PortainerConnectionError(msg)
+        return listings[endpoint_id]
+
+    portainer.get_containers = get_containers
+    collector = PortainerStatsCollector(portainer)
+
+    await collector._resync()
+    await _settle()
+    assert collector.containers == {(1, "web"), (2, "db")}
+
+    # Endpoint 2 can no longer be listed, and the container on endpoint 1 stopped
+    del listings[2]
+    listings[1] = []
+    await collector._resync()
+    await _settle()
+    assert collector.containers == {(2, "db")}
+
+    collector.stop()
+
+
+async def test_stats_collector_reopens_failed_stream() -> None:
+    """Test that a stream that fails is reopened after a backoff, and ended when the container is gone."""
+    portainer = _fake_portainer(["web"])
+    failures: list[PortainerError] = [PortainerConnectionError("Connection reset"), PortainerConnectionError("Connection reset")]
+    opened = 0
+
+    async def stream_container_stats(_endpoint_id: int, _container_id: str) -> AsyncGenerator[DockerContainerStats, None]:
+        nonlocal opened
+        opened += 1
+        yield _stats()
+        if failures:
+            raise failures.pop(0)
+        await asyncio.Event().wait()
+
+    portainer.stream_container_stats = stream_container_stats
+    collector = PortainerStatsCollector(
+        portainer,
+        endpoint_id=ENDPOINT_ID,
+        history_size=10,
+        reconnect_interval=timedelta(milliseconds=1),
+        max_reconnect_interval=timedelta(milliseconds=5),
+    )
+
+    await collector._resync()
+    await asyncio.sleep(0.05)
+
+    assert opened == 3
+    assert collector.containers == {(ENDPOINT_ID, "web")}
+    assert (ENDPOINT_ID, "web") in collector._latest
+    history = collector.history(ENDPOINT_ID, "web")
+    assert history is not None
+    assert len(history.series("memory_usage")) == 3
+
+    collector.stop()
+    await _settle()
+
+    failures.append(PortainerNotFoundError("No such container"))
+    await collector._resync()
+    await asyncio.sleep(0.05)
+
+    assert opened == 4
+    assert not collector.containers
+    assert collector.history(ENDPOINT_ID, "web") is None
+
+
+async def test_stats_collector_callbacks() -> None:
+    """Test that async callbacks are awaited, failing callbacks are skipped and callbacks can be removed."""
+    collector = PortainerStatsCollector(_fake_portainer([]), endpoint_id=ENDPOINT_ID)
+    collector.interval = timedelta(seconds=30)
+    assert collector.interval == timedelta(seconds=30)
+    received: list[PortainerStatsSnapshot] = []
+
+    async def on_snapshot(snapshot: PortainerStatsSnapshot) -> None:
+        received.append(snapshot)
+
+    def failing(_snapshot: PortainerStatsSnapshot) -> None:
+        msg = "boom"
+        raise RuntimeError(msg)
+
+    collector.register_callback(failing)
+    collector.register_callback(on_snapshot)
+    collector.register_callback(on_snapshot)
+    await collector._tick()
+    assert received == [collector.snapshot]
+
+    collector.unregister_callback(on_snapshot)
+    await collector._tick()
+    assert len(received) == 1
+
+    # Events without an actor are ignored
+    collector._on_event(PortainerEventListenerResult(endpoint_id=ENDPOINT_ID, event=DockerEvent.from_dict({"Action": "start"})))
+    assert not collector._streams
+
+
+async def test_stats_collector_stream_ends() -> None:
+    """Test that a stream that ends because its container stopped is not reopened."""
+    portainer = _fake_portainer(["web"])
+    opened = 0
+
+    async def stream_container_stats(_endpoint_id: int, _container_id: str) -> AsyncGenerator[DockerContainerStats, None]:
+        nonlocal opened
+        opened += 1
+        yield _stats()
+
+    portainer.stream_container_stats = stream_container_stats
+    collector = PortainerStatsCollector(portainer, endpoint_id=ENDPOINT_ID, reconnect_interval=timedelta(milliseconds=1))
+
+    await collector._resync()
+    await asyncio.sleep(0.02)
+
+    assert opened == 1
+    assert not collector.containers
+    assert not collector._latest
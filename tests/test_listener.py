@@ -5,16 +5,29 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
+import json
 import logging
+import time
 from datetime import timedelta
 from typing import TYPE_CHECKING
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from aiohttp.web import Request, Response
 from aresponses import ResponsesMockServer
 
-from pyportainer.exceptions import PortainerError
-from pyportainer.listener import PortainerEventListener, PortainerEventListenerResult
+from pyportainer.exceptions import PortainerAuthenticationError, PortainerConnectionError, PortainerError, PortainerTimeoutError
+from pyportainer.listener import (
+    EventOverflowPolicy,
+    EventStreamState,
+    PortainerEventListener,
+    PortainerEventListenerResult,
+    PortainerEventQueueStats,
+    PortainerEventStreamHealth,
+    _EventQueue,
+)
+from pyportainer.models.docker import DockerEvent, EndpointStatus
+from pyportainer.stats import ContainerCPUSample
 from tests import load_fixtures
 
 if TYPE_CHECKING:
@@ -352,3 +365,398 @@ async def test_event_listener_event_type_filter(
     assert len(received_params) == 1
     assert "filters" in received_params[0]
     assert "container" in received_params[0]
+
+
+def _result(action: str, actor_id: str = CONTAINER_ID) -> PortainerEventListenerResult:
+    """Build a listener result for a container event."""
+    event = DockerEvent.from_dict({"Type": "container", "Action": action, "Actor": {"ID": actor_id}})
+    return PortainerEventListenerResult(endpoint_id=ENDPOINT_ID, event=event)
+
+
+async def test_event_listener_queue_decouples_callbacks(
+    aresponses: ResponsesMockServer,
+    portainer_client: Portainer,
+) -> None:
+    """Test that a slow callback does not hold up reading the stream when a queue is used."""
+    event_line = load_fixtures("docker_event.json").strip()
+    _events_response(aresponses, body=f"{event_line}\n{event_line}\n{event_line}\n")
+
+    release = asyncio.Event()
+    received: list[PortainerEventListenerResult] = []
+
+    async def slow_callback(result: PortainerEventListenerResult) -> None:
+        """Wait until released before accepting the event."""
+        await release.wait()
+        received.append(result)
+
+    listener = PortainerEventListener(portainer_client, endpoint_id=ENDPOINT_ID, queue_size=10)
+    listener.register_callback(slow_callback)
+
+    # The whole stream is read while the callback is still blocked
+    await listener._listen(ENDPOINT_ID)
+    assert not received
+    assert listener.queue_stats[ENDPOINT_ID].peak == 3
+
+    release.set()
+    for _ in range(10):
+        await asyncio.sleep(0)
+    assert len(received) == 3
+    assert listener.queue_stats[ENDPOINT_ID].depth == 0
+
+    listener.stop()
+    assert not listener._workers
+
+
+async def test_event_queue_overflow_policies() -> None:
+    """Test the drop oldest, coalesce and block overflow policies."""
+    queue = _EventQueue(2, EventOverflowPolicy.DROP_OLDEST)
+    for action in ("create", "start", "die"):
+        await queue.put(_result(action))
+    assert [(await queue.get()).event.action for _ in range(2)] == ["start", "die"]
+    assert queue.stats() == PortainerEventQueueStats(depth=0, peak=2, dropped=1, coalesced=0)
+
+    queue = _EventQueue(2, EventOverflowPolicy.COALESCE)
+    await queue.put(_result("start", "a"))
+    await queue.put(_result("die", "b"))
+    await queue.put(_result("start", "a"))
+    await queue.put(_result("create", "c"))
+    assert [(await queue.get()).event.action for _ in range(2)] == ["die", "create"]
+    assert (queue.dropped, queue.coalesced) == (1, 1)
+
+    queue = _EventQueue(1, EventOverflowPolicy.BLOCK)
+    await queue.put(_result("start"))
+    put = asyncio.create_task(queue.put(_result("die")))
+    await asyncio.sleep(0)
+    assert not put.done()
+    assert (await queue.get()).event.action == "start"
+    await put
+    assert (await queue.get()).event.action == "die"
+    assert queue.dropped == 0
+
+
+def _timed_event(action: str, time_nano: int) -> str:
+    """Serialize a container event at the given time."""
+    return json.dumps(
+        {
+            "Type": "container",
+            "Action": action,
+            "Actor": {"ID": CONTAINER_ID},
+            "time": time_nano // 1_000_000_000,
+            "timeNano": time_nano,
+        }
+    )
+
+
+async def test_event_listener_resumes_after_reconnect(
+    aresponses: ResponsesMockServer,
+    portainer_client: Portainer,
+) -> None:
+    """Test that a reconnect resumes from the last event and skips the overlap."""
+    base = 1700000000_000000000
+    bodies = [
+        f"{_timed_event('create', base + 1)}\n{_timed_event('start', base + 2)}\n",
+        # Replays the whole second, including both events that were already delivered
+        f"{_timed_event('create', base + 1)}\n{_timed_event('start', base + 2)}\n{_timed_event('die', base + 3)}\n",
+    ]
+    queries: list[dict[str, str]] = []
+
+    async def handler(request: Request) -> Response:
+        """Return the next stream body and capture the query."""
+        queries.append(dict(request.query))
+        return Response(status=200, headers={"Content-Type": "application/json"}, text=bodies[len(queries) - 1])
+
+    aresponses.add("localhost:9000", f"/api/endpoints/{ENDPOINT_ID}/docker/events", "GET", handler, repeat=2)
+
+    received: list[str | None] = []
+    listener = PortainerEventListener(portainer_client, endpoint_id=ENDPOINT_ID)
+    listener.register_callback(lambda result: received.append(result.event.action))
+
+    await listener._listen(ENDPOINT_ID)
+    await listener._listen(ENDPOINT_ID)
+
+    assert received == ["create", "start", "die"]
+    assert "since" not in queries[0]
+    assert queries[1]["since"] == "1700000000"
+
+
+async def test_event_listener_resume_disabled(
+    aresponses: ResponsesMockServer,
+    portainer_client: Portainer,
+) -> None:
+    """Test that a reconnect without resume streams from now and delivers everything."""
+    _events_response(aresponses)
+    _events_response(aresponses)
+
+    received: list[PortainerEventListenerResult] = []
+    listener = PortainerEventListener(portainer_client, endpoint_id=ENDPOINT_ID, resume=False)
+    listener.register_callback(received.append)
+
+    await listener._listen(ENDPOINT_ID)
+    await listener._listen(ENDPOINT_ID)
+
+    assert len(received) == 2
+
+
+async def test_event_listener_forgets_destroyed_container_stats(
+    aresponses: ResponsesMockServer,
+    portainer_client: Portainer,
+) -> None:
+    """Test that a destroy event drops the cached CPU sample of the container."""
+    _events_response(aresponses, body=_timed_event("destroy", 1700000000_000000000))
+    sample = ContainerCPUSample(total_usage=100)
+    portainer_client._prev_container_stats.set(ENDPOINT_ID, CONTAINER_ID, sample)
+    portainer_client._prev_container_stats.set(ENDPOINT_ID, "other", sample)
+
+    listener = PortainerEventListener(portainer_client, endpoint_id=ENDPOINT_ID)
+    await listener._listen(ENDPOINT_ID)
+
+    assert portainer_client._prev_container_stats.get(ENDPOINT_ID, CONTAINER_ID) is None
+    assert portainer_client._prev_container_stats.get(ENDPOINT_ID, "other") == sample
+
+
+async def test_event_listener_reconciles_endpoints() -> None:
+    """Test that streams follow endpoints as they are added, go down and are removed."""
+    portainer = MagicMock()
+    portainer.get_endpoints = AsyncMock(
+        side_effect=[
+            [MagicMock(id=1, status=EndpointStatus.UP), MagicMock(id=2, status=EndpointStatus.DOWN)],
+            [MagicMock(id=1, status=EndpointStatus.UP), MagicMock(id=2, status=EndpointStatus.UP), MagicMock(id=3, status=EndpointStatus.UP)],
+            PortainerError("Portainer is restarting"),
+            [MagicMock(id=2, status=EndpointStatus.DOWN), MagicMock(id=3, status=EndpointStatus.UP)],
+        ]
+    )
+    listener = PortainerEventListener(portainer)
+
+    async def listen_forever(endpoint_id: int) -> None:  # noqa: ARG001
+        """Stand in for a stream that stays connected."""
+        await asyncio.Event().wait()
+
+    listener._listen_with_reconnect = listen_forever  # type: ignore[method-assign]
+
+    await listener._reconcile()
+    assert listener.endpoint_ids == {1}
+    await listener._reconcile()
+    assert listener.endpoint_ids == {1, 2, 3}
+    # A failed refresh keeps the current streams
+    await listener._reconcile()
+    assert listener.endpoint_ids == {1, 2, 3}
+    await listener._reconcile()
+    await asyncio.sleep(0)
+    assert listener.endpoint_ids == {3}
+
+    listener.stop()
+    assert not listener._streams
+
+
+def test_event_listener_backoff_bounds() -> None:
+    """Test that reconnect delays grow with decorrelated jitter, are capped and reset after events flowed."""
+    listener = PortainerEventListener(
+        MagicMock(),
+        reconnect_interval=timedelta(seconds=1),
+        max_reconnect_interval=timedelta(seconds=10),
+    )
+    listener._health[ENDPOINT_ID] = PortainerEventStreamHealth(state=EventStreamState.RECONNECTING)
+
+    delay = 1.0
+    for _ in range(20):
+        previous, delay = delay, listener._backoff(ENDPOINT_ID, delay)
+        assert 1.0 <= delay <= min(10.0, previous * 3)
+
+    listener._receiving.add(ENDPOINT_ID)
+    assert listener._backoff(ENDPOINT_ID, 10.0) <= 3.0
+
+
+async def test_event_listener_health() -> None:
+    """Test that the stream health tracks failures until a fatal error stops the stream."""
+    errors: list[PortainerError] = [
+        PortainerConnectionError("Connection refused"),
+        PortainerTimeoutError("Timed out"),
+        PortainerAuthenticationError("Unauthorized"),
+    ]
+    listener = PortainerEventListener(MagicMock(), endpoint_id=ENDPOINT_ID, reconnect_interval=timedelta(0))
+    states: list[PortainerEventStreamHealth] = []
+
+    async def failing_listen(endpoint_id: int) -> None:
+        """Record the current health and fail with the next error."""
+        states.append(listener.health[endpoint_id])
+        raise errors.pop(0)
+
+    listener._listen = failing_listen  # type: ignore[method-assign]
+    await listener._listen_with_reconnect(ENDPOINT_ID)
+
+    assert [state.state for state in states] == [EventStreamState.CONNECTING, EventStreamState.RECONNECTING, EventStreamState.RECONNECTING]
+    assert states[2].failures == 2
+    assert listener.health[ENDPOINT_ID] == PortainerEventStreamHealth(
+        state=EventStreamState.STOPPED,
+        failures=3,
+        last_error="Unauthorized",
+    )
+
+
+async def test_event_listener_connected_without_events(
+    aresponses: ResponsesMockServer,
+    portainer_client: Portainer,
+) -> None:
+    """Test that a quiet stream reports as connected before any event arrives, but keeps backing off."""
+    _events_response(aresponses, body="")
+    listener = PortainerEventListener(portainer_client, endpoint_id=ENDPOINT_ID)
+    listener._health[ENDPOINT_ID] = PortainerEventStreamHealth(state=EventStreamState.RECONNECTING, failures=3, last_error="Timed out", retry_in=10.0)
+
+    await listener._listen(ENDPOINT_ID)
+
+    assert listener.health[ENDPOINT_ID] == PortainerEventStreamHealth(state=EventStreamState.CONNECTED, failures=3)
+    with patch("pyportainer.listener.random.uniform", side_effect=lambda _low, high: high):
+        assert listener._backoff(ENDPOINT_ID, 60.0) == 180.0
+    listener._failed(ENDPOINT_ID, PortainerConnectionError("Connection lost"), 180.0)
+    assert listener.health[ENDPOINT_ID].failures == 4
+
+
+async def test_event_listener_backoff_resets_after_events(
+    aresponses: ResponsesMockServer,
+    portainer_client: Portainer,
+) -> None:
+    """Test that the backoff and failures reset once an event is received."""
+    _events_response(aresponses)
+    listener = PortainerEventListener(portainer_client, endpoint_id=ENDPOINT_ID)
+    listener._health[ENDPOINT_ID] = PortainerEventStreamHealth(state=EventStreamState.RECONNECTING, failures=3, last_error="Timed out", retry_in=10.0)
+
+    await listener._listen(ENDPOINT_ID)
+
+    assert listener.health[ENDPOINT_ID] == PortainerEventStreamHealth(state=EventStreamState.CONNECTED)
+    with patch("pyportainer.listener.random.uniform", side_effect=lambda _low, high: high):
+        assert listener._backoff(ENDPOINT_ID, 60.0) == 15.0
+    listener._failed(ENDPOINT_ID, PortainerConnectionError("Connection lost"), 15.0)
+    assert listener.health[ENDPOINT_ID].failures == 1
+
+
+def test_event_listener_backoff_resets_after_uptime() -> None:
+    """Test that a quiet stream that stayed open long enough resets the backoff."""
+    listener = PortainerEventListener(
+        MagicMock(),
+        reconnect_interval=timedelta(seconds=1),
+        max_reconnect_interval=timedelta(seconds=10),
+    )
+    listener._connected_at[ENDPOINT_ID] = time.monotonic() - 5
+
+    with patch("pyportainer.listener.random.uniform", side_effect=lambda _low, high: high):
+        assert listener._backoff(ENDPOINT_ID, 9.0) == 10.0
+        listener._connected_at[ENDPOINT_ID] = time.monotonic() - 10
+        assert listener._backoff(ENDPOINT_ID, 9.0) == 3.0
+
+
+def _labelled(action: str, project: str) -> PortainerEventListenerResult:
+    """Build a container event for a compose project."""
+    event = DockerEvent.from_dict(
+        {"Type": "container", "Action": action, "Actor": {"ID": CONTAINER_ID, "Attributes": {"com.docker.compose.project": project, "name": "web"}}}
+    )
+    return PortainerEventListenerResult(endpoint_id=ENDPOINT_ID, event=event)
+
+
+async def test_event_listener_subscriptions() -> None:
+    """Test that subscriptions only receive the events they match."""
+    listener = PortainerEventListener(MagicMock())
+    received: dict[str, list[str | None]] = {"die": [], "media": [], "other_endpoint": [], "all": []}
+
+    listener.subscribe(lambda result: received["die"].append(result.event.action), event_type="container", action="die")
+    media = listener.subscribe(
+        lambda result: received["media"].append(result.event.action),
+        attributes={"com.docker.compose.project": "media", "name": "web"},
+    )
+    listener.subscribe(lambda result: received["other_endpoint"].append(result.event.action), endpoint_id=2)
+    listener.register_callback(lambda result: received["all"].append(result.event.action))
+
+    for result in (_labelled("start", "media"), _labelled("die", "media"), _labelled("die", "backup")):
+        await listener._fire_callbacks(result)
+
+    assert received == {
+        "die": ["die", "die"],
+        "media": ["start", "die"],
+        "other_endpoint": [],
+        "all": ["start", "die", "die"],
+    }
+
+    listener.unsubscribe(media)
+    await listener._fire_callbacks(_labelled("stop", "media"))
+    assert received["media"] == ["start", "die"]
+    with pytest.raises(KeyError):
+        listener.unsubscribe(media)
+
+
+def test_event_listener_server_side_filters() -> None:
+    """Test that subscriptions narrow the server-side filters only when every subscription allows it."""
+    listener = PortainerEventListener(MagicMock(), event_types=["container", "image"])
+    assert listener._filters(ENDPOINT_ID) == {"type": ["container", "image"]}
+
+    listener.subscribe(print, event_type="container", action="die")
+    listener.subscribe(print, event_type="container", action="start")
+    listener.subscribe(print, endpoint_id=2)
+    assert listener._filters(ENDPOINT_ID) == {"type": ["container"], "event": ["die", "start"]}
+    assert listener._filters(2) == {"type": ["container", "image"]}
+
+    listener.register_callback(print)
+    assert listener._filters(ENDPOINT_ID) == {"type": ["container", "image"]}
+
+
+def test_event_listener_server_side_attribute_filters() -> None:
+    """Test that attributes shared by every subscription are sent as label and container filters."""
+    listener = PortainerEventListener(MagicMock())
+    media = listener.subscribe(print, event_type="container", attributes={"com.docker.compose.project": "media", "name": "plex"})
+    assert listener._filters(ENDPOINT_ID) == {
+        "type": ["container"],
+        "label": ["com.docker.compose.project=media", "name=plex"],
+        "container": ["plex"],
+    }
+
+    listener.subscribe(print, event_type="container", attributes={"com.docker.compose.project": "media", "name": "sonarr"})
+    assert listener._filters(ENDPOINT_ID) == {
+        "type": ["container"],
+        "label": ["com.docker.compose.project=media"],
+        "container": ["plex", "sonarr"],
+    }
+
+    listener.unsubscribe(media)
+    listener.subscribe(print, event_type="network", attributes={"name": "sonarr"})
+    assert listener._filters(ENDPOINT_ID) == {"type": ["container", "network"], "label": ["name=sonarr"]}
+
+    listener.subscribe(print, attributes={"com.docker.compose.project": "media"})
+    assert listener._filters(ENDPOINT_ID) is None
+
+
+async def test_event_listener_reconnects_when_filters_change() -> None:
+    """Test that an open stream reconnects to apply changed server-side filters."""
+    listener = PortainerEventListener(MagicMock(), endpoint_id=ENDPOINT_ID)
+    connected: list[dict[str, list[str]] | None] = []
+
+    async def listen_forever(endpoint_id: int) -> None:
+        """Stand in for a stream that stays connected with the current filters."""
+        filters = listener._active_filters[endpoint_id] = listener._filters(endpoint_id)
+        connected.append(filters)
+        await asyncio.Event().wait()
+
+    listener._listen = listen_forever  # type: ignore[method-assign]
+    task = asyncio.create_task(listener._listen_with_reconnect(ENDPOINT_ID))
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+    listener.subscribe(print, event_type="container", action="die")
+    for _ in range(5):
+        await asyncio.sleep(0)
+    # The same filters do not cause another reconnect
+    listener.subscribe(print, event_type="container", action="die", attributes={"name": "web"})
+    for _ in range(5):
+        await asyncio.sleep(0)
+    assert connected == [None, {"type": ["container"], "event": ["die"]}]
+
+    # A plain callback needs every event, so the filters are widened again
+    listener.register_callback(print)
+    for _ in range(5):
+        await asyncio.sleep(0)
+    listener.unregister_callback(print)
+    for _ in range(5):
+        await asyncio.sleep(0)
+    assert connected[2:] == [None, {"type": ["container"], "event": ["die"]}]
+
+    task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await task
+    assert task.cancelled()
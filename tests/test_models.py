@@ -9,6 +9,7 @@ from aresponses import ResponsesMockServer
 from freezegun import freeze_time
 from syrupy.assertion import SnapshotAssertion
 
+from pyportainer.models.docker import ImageInformation
 from tests import load_fixtures
 
 if TYPE_CHECKING:
@@ -313,6 +314,31 @@ async def test_container_image_status_up_to_date(
     assert status == snapshot
 
 
+async def test_container_image_status_with_registry_information(
+    aresponses: ResponsesMockServer,
+    portainer_client: Portainer,
+) -> None:
+    """Test container_image_status only inspects the local image when registry information is given."""
+    aresponses.add(
+        "localhost:9000",
+        "/api/endpoints/1/docker/images/nginx:latest/json",
+        "GET",
+        aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=load_fixtures("local_image_information.json"),
+        ),
+    )
+
+    registry_information = ImageInformation.from_json(load_fixtures("image_information.json"))
+    status = await portainer_client.container_image_status(endpoint_id=1, image="nginx:latest", registry_information=registry_information)
+
+    assert registry_information.descriptor is not None
+    assert status.registry_digest == registry_information.descriptor.digest
+    assert status.update_available
+    aresponses.assert_plan_strictly_followed()
+
+
 async def test_portainer_volumes(
     aresponses: ResponsesMockServer,
     snapshot: SnapshotAssertion,
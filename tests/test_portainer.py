@@ -2,12 +2,14 @@
 
 # pylint: disable=protected-access
 import asyncio
+import weakref
 from datetime import UTC, datetime
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-from aiohttp import ClientError, ClientResponseError, ClientSession
-from aiohttp.web import Request
+from aiohttp import ClientError, ClientResponse, ClientResponseError, ClientSession
+from aiohttp.web import Request, StreamResponse
 from aresponses import ResponsesMockServer
 
 from pyportainer import Portainer
@@ -64,6 +66,24 @@ async def test_timeout() -> None:
                 await client._request("test")
 
 
+async def test_request_url_and_headers_prepared_once() -> None:
+    """Test that the base URL and headers are built once and reused for every request."""
+    client = Portainer(api_url="https://portainer.local:9443/sub/", api_key="test_api_key")
+
+    url = client._url("endpoints/1/docker/containers/json?all=1")
+    assert str(url) == "https://portainer.local:9443/sub/api/endpoints/1/docker/containers/json?all=1"
+    assert client._url("endpoints/1/docker/containers/json?all=1") is url
+    assert client._headers["X-API-Key"] == "test_api_key"
+
+    with pytest.raises(TypeError):
+        client._headers["X-API-Key"] = "other"  # type: ignore[index]
+
+    # The URL cache keeps no reference to the client, so it is freed without a garbage collection
+    ref = weakref.ref(client)
+    del client
+    assert ref() is None
+
+
 async def test_content_type(
     aresponses: ResponsesMockServer,
     portainer_client: Portainer,
@@ -82,6 +102,115 @@ async def test_content_type(
         assert await portainer_client._request("test")
 
 
+async def test_empty_json_body(
+    aresponses: ResponsesMockServer,
+    portainer_client: Portainer,
+) -> None:
+    """Test that an empty JSON body is decoded as None."""
+    aresponses.add(
+        "localhost:9000",
+        "/api/test",
+        "POST",
+        aresponses.Response(status=200, headers={"Content-Type": "application/json"}, text=""),
+    )
+    assert await portainer_client._request("test", method="POST") is None
+
+
+async def test_invalid_json_body(
+    aresponses: ResponsesMockServer,
+    portainer_client: Portainer,
+) -> None:
+    """Test that a malformed JSON body raises a PortainerError."""
+    aresponses.add(
+        "localhost:9000",
+        "/api/endpoints/1/docker/info",
+        "GET",
+        aresponses.Response(status=200, headers={"Content-Type": "application/json"}, text="{not json"),
+    )
+    with pytest.raises(PortainerError, match="Invalid JSON response"):
+        await portainer_client.docker_info(1)
+
+
+async def test_concurrent_gets_are_coalesced(aresponses: ResponsesMockServer) -> None:
+    """Test that identical concurrent GET requests share a single HTTP call."""
+    calls = 0
+
+    async def slow_handler(_: Request) -> aresponses.Response:
+        """Count the call and answer after the other requests have joined."""
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return aresponses.Response(status=200, headers={"Content-Type": "application/json"}, text=load_fixtures("container_inspect.json"))
+
+    aresponses.add("localhost:9000", "/api/endpoints/1/docker/containers/abc/json", "GET", slow_handler)
+
+    async with Portainer(api_url="http://localhost:9000", api_key="test-api-key", coalesce_requests=True) as client:
+        results = await asyncio.gather(*(client.inspect_container(1, "abc") for _ in range(5)))
+
+        assert calls == 1
+        assert client.coalesced_requests == 4
+        assert all(result == results[0] for result in results)
+        assert len({id(result) for result in results}) == 5
+        assert not client._inflight
+
+
+async def test_get_after_write_is_not_coalesced(aresponses: ResponsesMockServer) -> None:
+    """Test that a GET sent after a mutating request does not join a GET sent before it."""
+    calls = 0
+
+    async def slow_handler(_: Request) -> aresponses.Response:
+        """Count the call and answer after the write was sent."""
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return aresponses.Response(status=200, headers={"Content-Type": "application/json"}, text=load_fixtures("container_inspect.json"))
+
+    aresponses.add("localhost:9000", "/api/endpoints/1/docker/containers/abc/json", "GET", slow_handler, repeat=2)
+    aresponses.add("localhost:9000", "/api/endpoints/1/docker/containers/abc/stop", "POST", aresponses.Response(status=204))
+
+    async with Portainer(api_url="http://localhost:9000", api_key="test-api-key", coalesce_requests=True) as client:
+        before = asyncio.create_task(client.inspect_container(1, "abc"))
+        await asyncio.sleep(0.01)
+        await client.stop_container(1, "abc")
+        await asyncio.gather(before, client.inspect_container(1, "abc"))
+
+        assert calls == 2
+        assert client.coalesced_requests == 0
+
+
+async def test_coalesced_error_reaches_every_caller(aresponses: ResponsesMockServer) -> None:
+    """Test that a failed shared request raises for every waiting caller."""
+
+    async def slow_not_found(_: Request) -> aresponses.Response:
+        """Answer with a 404 after the other requests have joined."""
+        await asyncio.sleep(0.05)
+        return aresponses.Response(status=404, headers={"Content-Type": "application/json"}, text="{}")
+
+    aresponses.add("localhost:9000", "/api/endpoints/1/docker/containers/abc/json", "GET", slow_not_found)
+
+    async with Portainer(api_url="http://localhost:9000", api_key="test-api-key", max_retries=0, coalesce_requests=True) as client:
+        results = await asyncio.gather(*(client.inspect_container(1, "abc") for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(result, PortainerNotFoundError) for result in results)
+
+
+async def test_concurrent_gets_not_coalesced_by_default(aresponses: ResponsesMockServer) -> None:
+    """Test that every GET request gets its own HTTP call unless coalescing is turned on."""
+    aresponses.add(
+        "localhost:9000",
+        "/api/endpoints/1/docker/containers/abc/json",
+        "GET",
+        aresponses.Response(status=200, headers={"Content-Type": "application/json"}, text=load_fixtures("container_inspect.json")),
+        repeat=2,
+    )
+
+    async with Portainer(api_url="http://localhost:9000", api_key="test-api-key") as client:
+        await asyncio.gather(*(client.inspect_container(1, "abc") for _ in range(2)))
+        assert client.coalesced_requests == 0
+
+    aresponses.assert_plan_strictly_followed()
+
+
 async def test_client_error() -> None:
     """Test request client error from Autarco API."""
     async with ClientSession() as session:
@@ -110,7 +239,7 @@ async def test_retry_succeeds_after_transient_failure() -> None:
         success_response = MagicMock()
         success_response.status = 200
         success_response.headers = {"Content-Type": "application/json"}
-        success_response.json = AsyncMock(return_value={"ok": True})
+        success_response.read = AsyncMock(return_value=b'{"ok": true}')
         success_response.raise_for_status = MagicMock()
 
         call_count = 0
@@ -333,9 +462,9 @@ async def test_image_recreate(
             """,
         ),
     )
-    response = await portainer_client.image_recreate(1, "adguard/adguardhome:latest")
-    assert isinstance(response, list)
-    assert response[0]["status"] == "Pulling from adguard/adguardhome"
+    tracker = await portainer_client.image_recreate(1, "adguard/adguardhome:latest")
+    assert tracker.status == "Status: Image is up to date for adguard/adguardhome:latest"
+    assert tracker.error is None
 
 
 async def test_container_recreate_helper(
@@ -570,3 +699,55 @@ async def test_get_events_with_filters(
     assert "filters" in received_params[0]
     # The filter values should be URL-encoded in the query string
     assert "container" in received_params[0]
+
+
+async def test_get_events_opens_once(aresponses: ResponsesMockServer) -> None:
+    """Test that an event stream is not retried by the client, so callers can back off with jitter."""
+    aresponses.add("localhost:9000", "/api/endpoints/1/docker/events", "GET", aresponses.Response(status=503))
+
+    sleep = AsyncMock()
+    with patch("asyncio.sleep", sleep):
+        async with Portainer(api_url="http://localhost:9000", api_key="test_api_key", max_retries=3) as client:
+            with pytest.raises(PortainerConnectionError):
+                async for _ in client.get_events(1):
+                    pass
+
+    sleep.assert_not_awaited()
+    aresponses.assert_plan_strictly_followed()
+
+
+async def test_get_events_releases_connection_when_on_connect_fails(aresponses: ResponsesMockServer) -> None:
+    """Test that the stream connection is released when the on_connect callback raises."""
+    done = asyncio.Event()
+
+    async def open_stream(request: Request) -> StreamResponse:
+        """Keep the stream open until the test is done."""
+        response = StreamResponse(headers={"Content-Type": "application/json"})
+        await response.prepare(request)
+        await response.write(b"{}\n")
+        await done.wait()
+        return response
+
+    aresponses.add("localhost:9000", "/api/endpoints/1/docker/events", "GET", open_stream)
+
+    def on_connect() -> None:
+        msg = "callback failed"
+        raise RuntimeError(msg)
+
+    async with Portainer(api_url="http://localhost:9000", api_key="test_api_key") as client:
+        responses: list[ClientResponse] = []
+        connect = client._connect
+
+        async def recording_connect(*args: Any, **kwargs: Any) -> ClientResponse:
+            response = await connect(*args, **kwargs)
+            responses.append(response)
+            return response
+
+        client._connect = recording_connect  # type: ignore[method-assign]
+        with pytest.raises(RuntimeError, match="callback failed"):
+            async for _ in client.get_events(1, on_connect=on_connect):
+                pass
+
+        assert len(responses) == 1
+        assert responses[0].closed
+        done.set()
@@ -0,0 +1,115 @@
+"""Tests for streaming image pulls and the pull progress tracker."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from aresponses import ResponsesMockServer
+
+from pyportainer import ImagePullTracker, Portainer
+from pyportainer.exceptions import PortainerError
+from pyportainer.models.docker import DockerImagePullProgress
+from tests import load_fixtures
+
+
+def _pull_response(aresponses: ResponsesMockServer, body: str) -> None:
+    """Register a mock response for the image create endpoint."""
+    aresponses.add(
+        "localhost:9000",
+        "/api/endpoints/1/docker/images/create",
+        "POST",
+        aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=body,
+        ),
+    )
+
+
+async def test_pull_image_streams_progress(
+    aresponses: ResponsesMockServer,
+    portainer_client: Portainer,
+) -> None:
+    """Test that pull_image yields typed progress messages."""
+    _pull_response(aresponses, load_fixtures("image_pull.json"))
+
+    messages = [progress async for progress in portainer_client.pull_image(1, "nginx:1.27")]
+
+    assert len(messages) == 12
+    assert all(isinstance(message, DockerImagePullProgress) for message in messages)
+    assert messages[4].progress_detail is not None
+    assert messages[4].progress_detail.current == 1024
+    assert messages[4].progress_detail.total == 4096
+
+
+async def test_image_pull_tracker(
+    aresponses: ResponsesMockServer,
+    portainer_client: Portainer,
+) -> None:
+    """Test that the tracker aggregates per-layer and total byte counts."""
+    _pull_response(aresponses, load_fixtures("image_pull.json"))
+
+    tracker = ImagePullTracker()
+    async for progress in portainer_client.pull_image(1, "nginx:1.27"):
+        tracker.update(progress)
+
+    assert set(tracker.layers) == {"a2318d6c47ec", "095d327c79ae", "bbfaa25db775"}
+    assert tracker.layers["a2318d6c47ec"].complete
+    assert tracker.layers["095d327c79ae"].complete
+    assert tracker.layers["095d327c79ae"].current == 4096
+    assert not tracker.layers["bbfaa25db775"].complete
+    assert tracker.current == 4096 + 512
+    assert tracker.total == 4096 + 2048
+    assert tracker.status == "Status: Downloaded newer image for nginx:1.27"
+    assert tracker.error is None
+
+
+async def test_image_pull_tracker_error(
+    aresponses: ResponsesMockServer,
+    portainer_client: Portainer,
+) -> None:
+    """Test that an error message from the daemon is recorded."""
+    _pull_response(
+        aresponses,
+        '{"status":"Pulling from library/nginx","id":"nope"}\n{"errorDetail":{"message":"manifest unknown"},"error":"manifest unknown"}\n',
+    )
+
+    tracker = ImagePullTracker()
+    async for progress in portainer_client.pull_image(1, "nginx:nope"):
+        tracker.update(progress)
+
+    assert tracker.error == "manifest unknown"
+    assert not tracker.layers
+
+
+async def test_pull_image_retries_connect(aresponses: ResponsesMockServer) -> None:
+    """Test that a transient error while connecting the pull stream is retried."""
+    aresponses.add("localhost:9000", "/api/endpoints/1/docker/images/create", "POST", aresponses.Response(status=503))
+    _pull_response(aresponses, load_fixtures("image_pull.json"))
+
+    with patch("asyncio.sleep", new_callable=AsyncMock):
+        async with Portainer(api_url="http://localhost:9000", api_key="test-api-key", max_retries=1) as client:
+            messages = [progress async for progress in client.pull_image(1, "nginx:1.27")]
+
+    assert len(messages) == 12
+    aresponses.assert_plan_strictly_followed()
+
+
+async def test_container_recreate_helper_pull_failure(
+    aresponses: ResponsesMockServer,
+    portainer_client: Portainer,
+) -> None:
+    """Test that a failed pull raises before the container is stopped or removed."""
+    aresponses.add(
+        "localhost:9000",
+        "/api/endpoints/1/docker/containers/container_id/json",
+        "GET",
+        aresponses.Response(status=200, headers={"Content-Type": "application/json"}, text=load_fixtures("container_inspect.json")),
+    )
+    _pull_response(aresponses, '{"errorDetail":{"message":"manifest unknown"},"error":"manifest unknown"}\n')
+
+    with pytest.raises(PortainerError, match="manifest unknown"):
+        await portainer_client.container_recreate_helper(1, "container_id", "nginx:nope")
+
+    aresponses.assert_plan_strictly_followed()
@@ -0,0 +1,267 @@
+"""Tests for streaming container stats and their history."""
+# pylint: disable=protected-access
+
+from __future__ import annotations
+
+import json
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+import pytest
+from aiohttp.web import Request, Response
+from aresponses import ResponsesMockServer
+from freezegun import freeze_time
+
+from pyportainer.exceptions import PortainerError
+from pyportainer.models.docker import DockerContainerStats
+from pyportainer.stats import ContainerCPUSample, ContainerSampleCache, ContainerStatsHistory, compute_stats_batch, memory_usage
+from tests import load_fixtures
+
+if TYPE_CHECKING:
+    from pyportainer import Portainer
+
+
+def _stats_line(fixture: str) -> str:
+    """Return a stats fixture as a single NDJSON line."""
+    return json.dumps(json.loads(load_fixtures(fixture)))
+
+
+async def test_stream_container_stats(
+    aresponses: ResponsesMockServer,
+    portainer_client: Portainer,
+) -> None:
+    """Test that every sample of a stats stream is yielded from a single request."""
+    queries: list[dict[str, str]] = []
+
+    async def handler(request: Request) -> Response:
+        """Return two stats samples and capture the query."""
+        queries.append(dict(request.query))
+        return Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=f"{_stats_line('container_stats.json')}\n{_stats_line('container_stats_2.json')}\n",
+        )
+
+    aresponses.add("localhost:9000", "/api/endpoints/1/docker/containers/test_container/stats", "GET", handler)
+
+    samples = [stats async for stats in portainer_client.stream_container_stats(1, "test_container")]
+
+    assert queries == [{"stream": "true"}]
+    assert len(samples) == 2
+    assert all(isinstance(sample, DockerContainerStats) for sample in samples)
+    assert samples[0] == DockerContainerStats.from_json(load_fixtures("container_stats.json"))
+    assert samples[1].cpu_stats.cpu_usage.total_usage > samples[0].cpu_stats.cpu_usage.total_usage
+
+
+async def test_container_stats_stream_deprecated(
+    aresponses: ResponsesMockServer,
+    portainer_client: Portainer,
+) -> None:
+    """Test that container_stats(stream=True) warns and returns the first sample instead of hanging."""
+    aresponses.add(
+        "localhost:9000",
+        "/api/endpoints/1/docker/containers/test_container/stats",
+        "GET",
+        aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=f"{_stats_line('container_stats.json')}\n{_stats_line('container_stats_2.json')}\n",
+        ),
+    )
+    aresponses.add(
+        "localhost:9000",
+        "/api/endpoints/1/docker/containers/test_container/stats",
+        "GET",
+        aresponses.Response(status=200, headers={"Content-Type": "application/json"}, text=""),
+    )
+
+    with pytest.warns(DeprecationWarning, match="stream_container_stats"):
+        stats = await portainer_client.container_stats(1, "test_container", stream=True)
+    assert stats == DockerContainerStats.from_json(load_fixtures("container_stats.json"))
+
+    with pytest.warns(DeprecationWarning, match="stream_container_stats"), pytest.raises(PortainerError, match="No stats received"):
+        await portainer_client.container_stats(1, "test_container", stream=True)
+
+
+def _sample(index: int) -> DockerContainerStats:
+    """Build a stats sample whose counters grow linearly with the index."""
+    return DockerContainerStats.from_dict(
+        {
+            "cpu_stats": {
+                "cpu_usage": {"total_usage": index * 500, "usage_in_kernelmode": index * 100, "usage_in_usermode": index * 400},
+                "system_cpu_usage": index * 4000,
+                "online_cpus": 2,
+            },
+            "memory_stats": {"usage": 1000 + index * 10, "limit": 4096},
+            "networks": {"eth0": {"rx_bytes": index * 300, "tx_bytes": index * 100}, "eth1": {"rx_bytes": index * 100}},
+        },
+    )
+
+
+def test_stats_history_ring_buffer() -> None:
+    """Test that the history keeps only the newest samples, oldest first."""
+    history = ContainerStatsHistory(size=3)
+    assert len(history) == 0
+    assert history.latest("memory_usage") is None
+    assert history.rate("network_rx") == 0.0
+
+    for index in range(5):
+        history.append(_sample(index), timestamp=100.0 + index)
+
+    assert len(history) == history.size == 3
+    assert history.timestamps() == [102.0, 103.0, 104.0]
+    assert history.series("memory_usage") == [1020, 1030, 1040]
+    assert history.series("network_rx") == [800, 1200, 1600]
+    assert history.latest("cpu_kernel") == 400
+    assert history.average("memory_usage") == 1030.0
+    assert history.average("memory_usage", samples=2) == 1035.0
+
+
+def test_stats_history_rates() -> None:
+    """Test rolling rates and CPU usage over a window of samples."""
+    history = ContainerStatsHistory(size=10)
+    for index in range(6):
+        history.append(_sample(index), timestamp=2.0 * index)
+
+    assert history.rate("network_rx") == 200.0
+    assert history.rate("network_tx", samples=2) == 50.0
+    # 500 of 4000 system nanoseconds on 2 CPUs
+    assert history.cpu_percentage() == 25.0
+    assert history.cpu_percentage(samples=1) == 0.0
+
+
+def test_stats_history_memory_usage() -> None:
+    """Test that the memory usage history excludes the inactive page cache, like the snapshots do."""
+    history = ContainerStatsHistory(size=3)
+    stats = _sample(1)
+    stats.memory_stats.stats.inactive_file = 10
+    history.append(stats, timestamp=100.0)
+
+    assert history.series("memory_usage") == [memory_usage(stats)] == [1000]
+
+
+def test_stats_history_size() -> None:
+    """Test that a history needs room for at least one sample."""
+    with pytest.raises(ValueError, match="at least 1"):
+        ContainerStatsHistory(size=0)
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+def test_compute_stats_batch(backend: str) -> None:
+    """Test that percentages and rates are computed for a whole batch, with and without NumPy."""
+    if backend == "numpy":
+        pytest.importorskip("numpy")
+
+    first = DockerContainerStats.from_json(load_fixtures("container_stats.json"))
+    second = DockerContainerStats.from_json(load_fixtures("container_stats_2.json"))
+    busy = DockerContainerStats.from_json(load_fixtures("container_stats_2.json"))
+    busy.networks["eth0"].rx_bytes = 5338 + 2000
+    busy.blkio_stats = {"io_service_bytes_recursive": [{"op": "write", "value": 4096}]}
+    idle = DockerContainerStats.from_dict({"read": "2015-01-08T22:57:32Z", "memory_stats": {"usage": 512}})
+
+    batch = compute_stats_batch([second, busy, idle], [first, first, None], use_numpy=backend == "numpy")
+
+    assert len(batch) == 3
+    assert batch.cpu_percentage == pytest.approx([0.0400216355, 0.0400216355, 0.0])
+    assert batch.memory_usage == [6537216, 6537216, 512]
+    assert batch.memory_percentage == pytest.approx([9.7412109375, 9.7412109375, 0.0])
+    assert batch.network_rx_bytes == [9979, 11979, 0]
+    # The samples were read one second apart
+    assert batch.network_rx_rate == pytest.approx([0.0, 2000.0, 0.0])
+    assert batch.block_write_bytes == [0, 4096, 0]
+    assert batch.block_write_rate == pytest.approx([0.0, 4096.0, 0.0])
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+def test_compute_stats_batch_large_counters(backend: str) -> None:
+    """Test that counters above 2**53 keep their precision, and read times in any format are parsed."""
+    if backend == "numpy":
+        pytest.importorskip("numpy")
+
+    total = 2**62
+    previous = DockerContainerStats.from_dict(
+        {"read": "2015-01-08T22:57:31+00:00", "networks": {"eth0": {"rx_bytes": total}}, "memory_stats": {"usage": total + 1, "limit": total + 2}}
+    )
+    stats = DockerContainerStats.from_dict(
+        {
+            "read": "2015-01-08T23:57:33+01:00",
+            "cpu_stats": {"cpu_usage": {"total_usage": total + 10}, "system_cpu_usage": total + 1000, "online_cpus": 1},
+            "precpu_stats": {"cpu_usage": {"total_usage": total}, "system_cpu_usage": total},
+            "networks": {"eth0": {"rx_bytes": total + 3}},
+            "memory_stats": {"usage": total + 1, "limit": total + 2},
+        }
+    )
+
+    batch = compute_stats_batch([stats], [previous], use_numpy=backend == "numpy")
+
+    assert batch.cpu_percentage == pytest.approx([1.0])
+    assert batch.memory_usage == [total + 1]
+    assert batch.memory_limit == [total + 2]
+    assert batch.network_rx_bytes == [total + 3]
+    assert batch.network_rx_rate == pytest.approx([1.5])
+
+
+def test_compute_stats_batch_length_mismatch() -> None:
+    """Test that previous samples must line up with the samples."""
+    with pytest.raises(ValueError, match="same length"):
+        compute_stats_batch([DockerContainerStats()], [])
+
+
+def test_container_sample_cache_lru() -> None:
+    """Test that the least recently used sample is evicted when the cache is full."""
+    cache = ContainerSampleCache(max_size=2)
+    sample = ContainerCPUSample.from_stats(DockerContainerStats.from_json(load_fixtures("container_stats.json")))
+
+    cache.set(1, "web", sample)
+    cache.set(1, "db", sample)
+    assert cache.get(1, "web") == sample
+    cache.set(2, "web", sample)
+
+    assert len(cache) == 2
+    assert cache.get(1, "db") is None
+    assert cache.get(1, "web") == sample
+
+    cache.discard(1)
+    assert cache.get(1, "web") is None
+    cache.discard(2, "web")
+    assert len(cache) == 0
+
+
+def test_container_sample_cache_ttl() -> None:
+    """Test that a sample expires when it is not replaced within the TTL."""
+    cache = ContainerSampleCache(ttl=timedelta(seconds=30))
+    with freeze_time("2025-01-01T00:00:00Z") as frozen:
+        cache.set(1, "web", ContainerCPUSample(total_usage=100))
+        frozen.tick(timedelta(seconds=20))
+        assert cache.get(1, "web") == ContainerCPUSample(total_usage=100)
+        frozen.tick(timedelta(seconds=20))
+        assert cache.get(1, "web") is None
+    assert len(cache) == 0
+
+
+async def test_delete_container_forgets_sample(
+    aresponses: ResponsesMockServer,
+    portainer_client: Portainer,
+) -> None:
+    """Test that the sample of a container is only dropped once it was deleted."""
+    aresponses.add(
+        "localhost:9000",
+        "/api/endpoints/1/docker/containers/web",
+        "DELETE",
+        aresponses.Response(status=409, text="You cannot remove a running container"),
+    )
+    aresponses.add(
+        "localhost:9000",
+        "/api/endpoints/1/docker/containers/web",
+        "DELETE",
+        aresponses.Response(status=204),
+    )
+    sample = ContainerCPUSample(total_usage=100)
+    portainer_client._prev_container_stats.set(1, "web", sample)
+
+    with pytest.raises(PortainerError):
+        await portainer_client.delete_container(1, "web")
+    assert portainer_client._prev_container_stats.get(1, "web") == sample
+
+    await portainer_client.delete_container(1, "web")
+    assert portainer_client._prev_container_stats.get(1, "web") is None
@@ -0,0 +1,106 @@
+"""Tests for the persistent image watcher stores."""
+# pylint: disable=protected-access
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from pyportainer import JSONWatcherStore, SQLiteWatcherStore
+from pyportainer.models.docker import DockerContainer, PortainerImageUpdateStatus
+from pyportainer.store import StoredImageStatus
+from pyportainer.watcher import PortainerImageWatcher
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pyportainer.store import WatcherStore
+
+WEB = StoredImageStatus(
+    endpoint_id=1,
+    container_id="web",
+    image="nginx:1.27",
+    update_available=True,
+    local_digest="sha256:old",
+    registry_digest="sha256:new",
+    checked_at=1700000000.0,
+)
+CACHE = StoredImageStatus(endpoint_id=2, container_id="cache", image="redis:7", checked_at=1700000100.0)
+
+
+@pytest.fixture(params=["sqlite", "json"])
+def store(request: pytest.FixtureRequest, tmp_path: Path) -> WatcherStore:
+    """Return an empty store for every backend."""
+    if request.param == "sqlite":
+        return SQLiteWatcherStore(tmp_path / "watcher.db")
+    return JSONWatcherStore(tmp_path / "watcher.json")
+
+
+def test_store_replace_and_update(store: WatcherStore) -> None:
+    """Test that replace overwrites all records and update only upserts."""
+    assert store.load() == []
+
+    store.replace([WEB, CACHE])
+    assert sorted(store.load(), key=lambda record: record.endpoint_id) == [WEB, CACHE]
+
+    updated = StoredImageStatus(endpoint_id=1, container_id="web", image="nginx:1.28", checked_at=1700000200.0)
+    store.update([updated])
+    assert sorted(store.load(), key=lambda record: record.endpoint_id) == [updated, CACHE]
+
+    store.replace([CACHE])
+    assert store.load() == [CACHE]
+
+
+def test_store_remove(store: WatcherStore) -> None:
+    """Test that remove deletes only the given containers."""
+    store.replace([WEB, CACHE])
+
+    store.remove([(1, "web"), (1, "missing")])
+    assert store.load() == [CACHE]
+    store.remove([])
+    assert store.load() == [CACHE]
+
+
+async def test_watcher_warm_start(store: WatcherStore) -> None:
+    """Test that stored results are served before the first check completes."""
+    store.replace([WEB])
+    watcher = PortainerImageWatcher(MagicMock(), store=store)
+
+    await watcher._load_store(store)
+
+    result = watcher.results[(1, "web")]
+    assert result.status == PortainerImageUpdateStatus(update_available=True, local_digest="sha256:old", registry_digest="sha256:new")
+    assert watcher.last_check == WEB.checked_at
+    assert watcher._container_images == {(1, "web"): "nginx:1.27"}
+
+
+async def test_watcher_persists_results(store: WatcherStore) -> None:
+    """Test that a full check stores its results and drops those of containers that are gone."""
+    store.replace([CACHE])
+
+    portainer = MagicMock()
+    portainer.get_containers = AsyncMock(return_value=[DockerContainer.from_dict({"Id": "web", "Image": "nginx:1.27", "State": "running"})])
+    portainer.get_image_information = AsyncMock(return_value=MagicMock())
+    portainer.container_image_status = AsyncMock(return_value=PortainerImageUpdateStatus(update_available=False, local_digest="sha256:new"))
+
+    watcher = PortainerImageWatcher(portainer, endpoint_id=1, store=store)
+    await watcher._load_store(store)
+    await watcher._check_all()
+
+    [record] = store.load()
+    assert (record.endpoint_id, record.container_id, record.image) == (1, "web", "nginx:1.27")
+    assert record.local_digest == "sha256:new"
+    assert record.checked_at > CACHE.checked_at
+
+
+async def test_watcher_removal_keeps_other_records(store: WatcherStore) -> None:
+    """Test that dropping a container deletes only its record and keeps the check time of the others."""
+    store.replace([WEB, CACHE])
+    watcher = PortainerImageWatcher(MagicMock(), store=store)
+    await watcher._load_store(store)
+
+    await watcher._publish({}, removed=[(1, "web")])
+
+    assert store.load() == [CACHE]
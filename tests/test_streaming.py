@@ -0,0 +1,90 @@
+"""Tests for the NDJSON stream framer."""
+
+import pytest
+
+from pyportainer.exceptions import PortainerError
+from pyportainer.streaming import NDJSONFramer
+
+
+def test_framer_many_lines_in_one_chunk() -> None:
+    """Test that a chunk holding many lines yields all of them in order."""
+    framer = NDJSONFramer()
+    chunk = b"".join(b'{"n": %d}\n' % i for i in range(1000))
+
+    lines = list(framer.feed(chunk))
+
+    assert len(lines) == 1000
+    assert lines[0] == b'{"n": 0}'
+    assert lines[-1] == b'{"n": 999}'
+    assert framer.flush() == []
+
+
+def test_framer_line_split_across_chunks() -> None:
+    """Test that a line split over several chunks is reassembled."""
+    framer = NDJSONFramer()
+
+    assert list(framer.feed(b'{"status": "Pull')) == []
+    assert list(framer.feed(b"ing fs layer")) == []
+    assert list(framer.feed(b'"}\n{"status"')) == [b'{"status": "Pulling fs layer"}']
+    assert list(framer.feed(b': "Done"}\n')) == [b'{"status": "Done"}']
+
+
+def test_framer_skips_blank_lines() -> None:
+    """Test that empty and whitespace-only lines are skipped."""
+    framer = NDJSONFramer()
+
+    assert list(framer.feed(b'\n  \r\n{"a": 1}\r\n\n')) == [b'{"a": 1}\r']
+
+
+def test_framer_flush_trailing_line() -> None:
+    """Test that flush returns a final line without a trailing newline."""
+    framer = NDJSONFramer()
+
+    assert list(framer.feed(b'{"a": 1}\n{"b": 2}')) == [b'{"a": 1}']
+    assert framer.flush() == [b'{"b": 2}']
+    assert framer.flush() == []
+
+
+def test_framer_max_line_size() -> None:
+    """Test that a line larger than the maximum line size raises an error."""
+    framer = NDJSONFramer(max_line_size=16)
+
+    assert list(framer.feed(b'{"a": 1}\n')) == [b'{"a": 1}']
+    with pytest.raises(PortainerError):
+        list(framer.feed(b"x" * 17))
+
+    # The rest of the oversized line is skipped up to the next newline
+    assert list(framer.feed(b"x" * 8)) == []
+    assert list(framer.feed(b'xxx\n{"b": 2}\n')) == [b'{"b": 2}']
+
+
+def test_framer_max_line_size_complete_line() -> None:
+    """Test that a complete but oversized line also raises an error."""
+    framer = NDJSONFramer(max_line_size=16)
+
+    with pytest.raises(PortainerError):
+        list(framer.feed(b"x" * 32 + b"\n"))
+
+
+def test_framer_max_line_size_keeps_framed_lines() -> None:
+    """Test that the lines before an oversized line are delivered before the error."""
+    framer = NDJSONFramer(max_line_size=16)
+    received: list[bytes] = []
+
+    with pytest.raises(PortainerError):
+        received.extend(framer.feed(b'{"a": 1}\n{"b": 2}\n' + b"x" * 17))
+
+    assert received == [b'{"a": 1}', b'{"b": 2}']
+    assert list(framer.feed(b'x\n{"c": 3}\n')) == [b'{"c": 3}']
+
+
+def test_framer_skips_oversized_complete_line() -> None:
+    """Test that the lines after an oversized complete line are kept."""
+    framer = NDJSONFramer(max_line_size=16)
+    received: list[bytes] = []
+
+    with pytest.raises(PortainerError):
+        received.extend(framer.feed(b'{"a": 1}\n' + b"x" * 32 + b'\n{"b": 2}\n{"c"'))
+
+    assert received == [b'{"a": 1}', b'{"b": 2}']
+    assert list(framer.feed(b": 3}\n")) == [b'{"c": 3}']
@@ -0,0 +1,64 @@
+"""Tests for the transport configuration of the Portainer client."""
+
+# pylint: disable=protected-access
+from aiohttp import ClientSession
+from aresponses import ResponsesMockServer
+
+from pyportainer import Portainer, PortainerTransportConfig
+
+
+async def test_transport_connector_settings() -> None:
+    """Test that the connectors reflect the configured pool limits."""
+    transport = PortainerTransportConfig(limit=50, limit_per_host=10, stream_limit=5, stream_limit_per_host=2)
+
+    connector = transport.create_connector()
+    stream_connector = transport.create_connector(stream=True)
+    try:
+        assert connector.limit == 50
+        assert connector.limit_per_host == 10
+        assert stream_connector.limit == 5
+        assert stream_connector.limit_per_host == 2
+    finally:
+        await connector.close()
+        await stream_connector.close()
+
+
+async def test_internal_sessions_use_separate_pools(aresponses: ResponsesMockServer) -> None:
+    """Test that streams and API calls use separate internal sessions."""
+    aresponses.add(
+        "localhost:9000",
+        "/api/test",
+        "GET",
+        aresponses.Response(status=200, headers={"Content-Type": "application/json"}, text="{}"),
+    )
+
+    transport = PortainerTransportConfig(limit_per_host=4)
+    async with Portainer(api_url="http://localhost:9000", api_key="test-api-key", transport=transport) as client:
+        await client._request("test")
+        api_session = client._get_session()
+        stream_session = client._get_session(stream=True)
+
+        assert api_session is not stream_session
+        assert api_session.connector is not None
+        assert api_session.connector.limit_per_host == 4
+        assert client._get_session(stream=True) is stream_session
+
+    assert api_session.closed
+    assert stream_session.closed
+
+
+async def test_shared_stream_pool() -> None:
+    """Test that streams reuse the API session when pool separation is disabled."""
+    transport = PortainerTransportConfig(separate_stream_pool=False)
+    async with Portainer(api_url="http://localhost:9000", api_key="test-api-key", transport=transport) as client:
+        assert client._get_session(stream=True) is client._get_session()
+
+
+async def test_external_session_used_for_streams() -> None:
+    """Test that a user-supplied session is used for all requests and left open."""
+    async with ClientSession() as session:
+        async with Portainer(api_url="http://localhost:9000", api_key="test-api-key", session=session) as client:
+            assert client._get_session() is session
+            assert client._get_session(stream=True) is session
+
+        assert not session.closed
@@ -4,14 +4,20 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import logging
-from typing import TYPE_CHECKING
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from aresponses import ResponsesMockServer
 from syrupy.assertion import SnapshotAssertion
 
-from pyportainer.watcher import PortainerImageWatcher, PortainerImageWatcherResult
+from pyportainer.exceptions import PortainerConnectionError
+from pyportainer.listener import PortainerEventListenerResult
+from pyportainer.models.docker import DockerContainer, DockerEvent, PortainerImageUpdateStatus
+from pyportainer.watcher import PortainerImageWatcher, PortainerImageWatcherChangeSet, PortainerImageWatcherResult, _image_reference, _image_registry
 from tests import load_fixtures
 
 if TYPE_CHECKING:
@@ -147,13 +153,15 @@ async def test_image_watcher_start_stop(
     )
 
     watcher = PortainerImageWatcher(portainer_client, endpoint_id=1)
+    checked = asyncio.Event()
+    watcher.register_callback(lambda _result: checked.set())
     assert watcher._task is None
 
     watcher.start()
     assert watcher._task is not None
     assert not watcher._task.done()
 
-    await asyncio.sleep(0.05)
+    await asyncio.wait_for(checked.wait(), timeout=5)
     assert watcher.results == snapshot
 
     watcher.stop()
@@ -385,3 +393,557 @@ async def test_image_watcher_callback_exception_logged(
 
     assert watcher.results  # Results still populated despite callback failure
     assert "Callback raised an exception" in caplog.text
+
+
+@pytest.mark.parametrize(
+    ("image", "registry"),
+    [
+        ("nginx:1.27", "docker.io"),
+        ("library/nginx", "docker.io"),
+        ("docker.io/library/ubuntu:latest", "docker.io"),
+        ("ghcr.io/owner/app:1", "ghcr.io"),
+        ("registry.local:5000/app", "registry.local:5000"),
+        ("localhost/app", "localhost"),
+    ],
+)
+def test_image_registry(image: str, registry: str) -> None:
+    """Test that the registry host is derived from an image reference."""
+    assert _image_registry(image) == registry
+
+
+async def test_image_watcher_concurrency_limits() -> None:
+    """Test that image checks never exceed the global, per-endpoint and per-registry limits."""
+    images = [f"ghcr.io/owner/app-{index}:1" for index in range(6)] + [f"nginx-{index}:1" for index in range(6)]
+    containers = [DockerContainer.from_dict({"Id": f"c{index}", "Image": image, "State": "running"}) for index, image in enumerate(images)]
+
+    in_flight: dict[str, int] = {"total": 0, "ghcr.io": 0, "docker.io": 0}
+    peak: dict[str, int] = dict.fromkeys(in_flight, 0)
+
+    async def container_image_status(_: int, image: str, **__: Any) -> PortainerImageUpdateStatus:
+        """Track how many checks run at once, in total and per registry."""
+        registry = _image_registry(image)
+        for key in ("total", registry):
+            in_flight[key] += 1
+            peak[key] = max(peak[key], in_flight[key])
+        await asyncio.sleep(0.01)
+        for key in ("total", registry):
+            in_flight[key] -= 1
+        return PortainerImageUpdateStatus(update_available=False)
+
+    portainer = MagicMock()
+    portainer.get_containers = AsyncMock(return_value=containers)
+    portainer.get_image_information = AsyncMock(return_value=MagicMock())
+    portainer.container_image_status = container_image_status
+
+    watcher = PortainerImageWatcher(portainer, endpoint_id=1, max_concurrency=4, max_concurrency_per_registry=1)
+    await watcher._check_all()
+
+    assert len(watcher.results) == 12
+    assert peak == {"total": 2, "ghcr.io": 1, "docker.io": 1}
+
+    watcher = PortainerImageWatcher(portainer, endpoint_id=1, max_concurrency=None, max_concurrency_per_endpoint=3)
+    await watcher._check_all()
+
+    assert peak["total"] == 3
+
+
+async def test_image_watcher_parallel_endpoints() -> None:
+    """Test that endpoints are swept concurrently, up to the configured limit."""
+    in_flight = 0
+    peak = 0
+
+    async def get_containers(endpoint_id: int) -> list[DockerContainer]:
+        """Track how many endpoints are swept at once."""
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return [DockerContainer.from_dict({"Id": f"c{endpoint_id}", "Image": "nginx:1.27", "State": "running"})]
+
+    portainer = MagicMock()
+    portainer.get_endpoints = AsyncMock(return_value=[MagicMock(id=endpoint_id) for endpoint_id in range(1, 6)])
+    portainer.get_containers = get_containers
+    portainer.get_image_information = AsyncMock(return_value=MagicMock())
+    portainer.container_image_status = AsyncMock(return_value=PortainerImageUpdateStatus(update_available=True))
+
+    watcher = PortainerImageWatcher(portainer, max_parallel_endpoints=2)
+    await watcher._check_all()
+
+    assert peak == 2
+    assert list(watcher.results) == [(endpoint_id, f"c{endpoint_id}") for endpoint_id in range(1, 6)]
+    assert set(watcher.endpoint_durations) == {1, 2, 3, 4, 5}
+    assert all(duration > 0 for duration in watcher.endpoint_durations.values())
+
+
+@pytest.mark.parametrize(
+    ("image", "reference"),
+    [
+        ("nginx", "docker.io/library/nginx:latest"),
+        ("nginx:1.27", "docker.io/library/nginx:1.27"),
+        ("library/nginx:1.27", "docker.io/library/nginx:1.27"),
+        ("docker.io/library/nginx:1.27", "docker.io/library/nginx:1.27"),
+        ("ghcr.io/owner/app", "ghcr.io/owner/app:latest"),
+        ("registry.local:5000/app:2", "registry.local:5000/app:2"),
+        ("nginx@sha256:abc", "docker.io/library/nginx@sha256:abc"),
+    ],
+)
+def test_image_reference(image: str, reference: str) -> None:
+    """Test that equivalent image references normalize to the same form."""
+    assert _image_reference(image) == reference
+
+
+async def test_image_watcher_shares_registry_lookups() -> None:
+    """Test that each image reference is resolved in the registry once per sweep across endpoints."""
+    images = {1: "nginx:1.27", 2: "docker.io/library/nginx:1.27", 3: "nginx:1.27", 4: "redis:7"}
+    registry_information = MagicMock()
+
+    portainer = MagicMock()
+    portainer.get_endpoints = AsyncMock(return_value=[MagicMock(id=endpoint_id) for endpoint_id in images])
+    portainer.get_containers = AsyncMock(
+        side_effect=lambda endpoint_id: [DockerContainer.from_dict({"Id": f"c{endpoint_id}", "Image": images[endpoint_id], "State": "running"})]
+    )
+    portainer.get_image_information = AsyncMock(return_value=registry_information)
+    portainer.container_image_status = AsyncMock(return_value=PortainerImageUpdateStatus(update_available=False))
+
+    watcher = PortainerImageWatcher(portainer, max_parallel_endpoints=4)
+    await watcher._check_all()
+
+    assert portainer.get_image_information.await_count == 2
+    assert portainer.container_image_status.await_count == 4
+    for call in portainer.container_image_status.await_args_list:
+        assert call.kwargs["registry_information"] is registry_information
+
+    # A new sweep resolves the digests again
+    await watcher._check_all()
+    assert portainer.get_image_information.await_count == 4
+
+
+async def test_image_watcher_shared_lookup_failure_falls_back() -> None:
+    """Test that endpoints do their own registry lookup when the shared one failed."""
+    portainer = MagicMock()
+    portainer.get_endpoints = AsyncMock(return_value=[MagicMock(id=1), MagicMock(id=2)])
+    portainer.get_containers = AsyncMock(return_value=[DockerContainer.from_dict({"Id": "c", "Image": "nginx:1.27", "State": "running"})])
+    portainer.get_image_information = AsyncMock(side_effect=PortainerConnectionError("forbidden"))
+    portainer.container_image_status = AsyncMock(return_value=PortainerImageUpdateStatus(update_available=False))
+
+    watcher = PortainerImageWatcher(portainer)
+    await watcher._check_all()
+
+    assert portainer.get_image_information.await_count == 1
+    assert [call.kwargs["registry_information"] for call in portainer.container_image_status.await_args_list] == [None, None]
+    assert len(watcher.results) == 2
+
+
+def _event(endpoint_id: int, event_type: str, action: str, actor_id: str, image: str | None = None) -> PortainerEventListenerResult:
+    """Build a listener result for a Docker event."""
+    attributes = {"image": image} if image else {}
+    event = DockerEvent.from_dict({"Type": event_type, "Action": action, "Actor": {"ID": actor_id, "Attributes": attributes}})
+    return PortainerEventListenerResult(endpoint_id=endpoint_id, event=event)
+
+
+async def test_image_watcher_checks_only_dirty_containers() -> None:
+    """Test that Docker events mark only the affected containers for a check."""
+    containers = [
+        DockerContainer.from_dict({"Id": "web", "Image": "nginx:1.27", "State": "running"}),
+        DockerContainer.from_dict({"Id": "cache", "Image": "redis:7", "State": "running"}),
+    ]
+    portainer = MagicMock()
+    portainer.get_containers = AsyncMock(return_value=containers)
+    portainer.get_image_information = AsyncMock(return_value=MagicMock())
+    portainer.container_image_status = AsyncMock(return_value=PortainerImageUpdateStatus(update_available=False))
+
+    received: list[PortainerImageWatcherResult] = []
+    watcher = PortainerImageWatcher(portainer, endpoint_id=1, watch_events=True)
+    await watcher._check_all()
+    watcher.register_callback(received.append)
+
+    portainer.container_image_status.reset_mock()
+    portainer.container_image_status.return_value = PortainerImageUpdateStatus(update_available=True)
+    watcher._on_event(_event(1, "container", "start", "worker", image="python:3.13"))
+    watcher._on_event(_event(1, "image", "pull", "docker.io/library/nginx:1.27"))
+    watcher._on_event(_event(1, "container", "die", "cache", image="redis:7"))
+    await watcher._check_dirty()
+
+    checked = sorted(call.args[1] for call in portainer.container_image_status.await_args_list)
+    assert checked == ["nginx:1.27", "python:3.13"]
+    assert {result.container_id for result in received} == {"web", "worker"}
+
+    results = watcher.results
+    assert results[(1, "web")].status == PortainerImageUpdateStatus(update_available=True)
+    assert results[(1, "worker")].status == PortainerImageUpdateStatus(update_available=True)
+    assert results[(1, "cache")].status == PortainerImageUpdateStatus(update_available=False)
+
+    watcher._on_event(_event(1, "container", "destroy", "worker", image="python:3.13"))
+    await watcher._check_dirty()
+    assert (1, "worker") not in watcher.results
+
+
+async def test_image_watcher_tag_event() -> None:
+    """Test that a tag event marks the containers running the new reference, not the image ID."""
+    portainer = MagicMock()
+    portainer.get_containers = AsyncMock(return_value=[DockerContainer.from_dict({"Id": "web", "Image": "nginx:1.27", "State": "running"})])
+    portainer.get_image_information = AsyncMock(return_value=MagicMock())
+    portainer.container_image_status = AsyncMock(return_value=PortainerImageUpdateStatus(update_available=False))
+
+    watcher = PortainerImageWatcher(portainer, endpoint_id=1, watch_events=True)
+    await watcher._check_all()
+    portainer.container_image_status.reset_mock()
+
+    # As sent by Docker for "docker tag <image> nginx:1.27"
+    event = DockerEvent.from_dict(
+        {
+            "Type": "image",
+            "Action": "tag",
+            "Actor": {"ID": "sha256:4cad75abc83d5ca6ee22053d85850676eaef657ee9d723d7bef61179e1e1e485", "Attributes": {"name": "nginx:1.27"}},
+        }
+    )
+    watcher._on_event(PortainerEventListenerResult(endpoint_id=1, event=event))
+    assert watcher._dirty_images == {(1, "docker.io/library/nginx:1.27")}
+
+    await watcher._check_dirty()
+    assert [call.args[1] for call in portainer.container_image_status.await_args_list] == ["nginx:1.27"]
+
+
+async def test_image_watcher_event_loop(aresponses: ResponsesMockServer, portainer_client: Portainer) -> None:
+    """Test that start() follows Docker events and checks marked containers after the debounce."""
+    aresponses.add(
+        "localhost:9000",
+        "/api/endpoints/1/docker/events",
+        "GET",
+        aresponses.Response(status=200, headers={"Content-Type": "application/json"}, text=load_fixtures("docker_event.json")),
+    )
+
+    watcher = PortainerImageWatcher(portainer_client, endpoint_id=1, watch_events=True, event_debounce=timedelta(0))
+    checked = asyncio.Event()
+
+    async def check_all() -> None:
+        """Skip the full sweep."""
+
+    async def check_dirty() -> None:
+        """Record the dirty containers instead of checking them."""
+        assert watcher._dirty_containers == {(1, CONTAINER_ID): IMAGE}
+        checked.set()
+
+    watcher._check_all = check_all  # type: ignore[method-assign]
+    watcher._check_dirty = check_dirty  # type: ignore[method-assign]
+
+    watcher.start()
+    try:
+        await asyncio.wait_for(checked.wait(), timeout=1)
+    finally:
+        watcher.stop()
+
+
+def test_image_watcher_jitter() -> None:
+    """Test that waits vary within the configured jitter and intervals can differ per endpoint."""
+    watcher = PortainerImageWatcher(MagicMock(), interval=timedelta(hours=1), jitter=0.2, endpoint_intervals={2: timedelta(minutes=10)})
+
+    delays = [watcher._jittered(100) for _ in range(200)]
+    assert all(80 <= delay <= 120 for delay in delays)
+    assert len(set(delays)) > 1
+    assert PortainerImageWatcher(MagicMock())._jittered(100) == 100
+
+    assert watcher._endpoint_interval(1) == 3600
+    assert watcher._endpoint_interval(2) == 600
+
+
+async def test_image_watcher_staggered_endpoint_check() -> None:
+    """Test that a staggered round spaces image checks evenly and drops containers that are gone."""
+    containers = [
+        DockerContainer.from_dict({"Id": "web", "Image": "nginx:1.27", "State": "running"}),
+        DockerContainer.from_dict({"Id": "cache", "Image": "redis:7", "State": "running"}),
+        DockerContainer.from_dict({"Id": "db", "Image": "postgres:17", "State": "running"}),
+    ]
+    portainer = MagicMock()
+    portainer.get_containers = AsyncMock(return_value=containers)
+    portainer.get_image_information = AsyncMock(return_value=MagicMock())
+    portainer.container_image_status = AsyncMock(return_value=PortainerImageUpdateStatus(update_available=False))
+
+    received: list[PortainerImageWatcherResult] = []
+    watcher = PortainerImageWatcher(portainer, stagger=True)
+    watcher.register_callback(received.append)
+    watcher._results = {(1, "gone"): PortainerImageWatcherResult(endpoint_id=1, container_id="gone")}
+
+    delays: list[float] = []
+
+    def jittered(seconds: float) -> float:
+        """Record the spacing between image checks without waiting."""
+        delays.append(seconds)
+        return 0
+
+    watcher._jittered = jittered  # type: ignore[method-assign]
+    await watcher._check_endpoint_staggered(1, 300)
+
+    assert delays == [100, 100]
+    assert set(watcher.results) == {(1, "web"), (1, "cache"), (1, "db")}
+    assert [result.container_id for result in received] == ["web", "cache", "db"]
+
+
+async def test_image_watcher_staggered_endpoints() -> None:
+    """Test that staggered endpoints start at spread offsets and follow the endpoint list."""
+    watcher = PortainerImageWatcher(MagicMock(), interval=timedelta(minutes=10), stagger=True, endpoint_intervals={3: timedelta(minutes=30)})
+    watcher._results = {
+        (2, "web"): PortainerImageWatcherResult(endpoint_id=2, container_id="web"),
+        (3, "db"): PortainerImageWatcherResult(endpoint_id=3, container_id="db"),
+    }
+    started: dict[int, float] = {}
+
+    async def run_endpoint(endpoint_id: int, offset: float = 0.0) -> None:
+        """Record the start offset instead of checking."""
+        started[endpoint_id] = offset
+        await asyncio.Event().wait()
+
+    watcher._run_endpoint = run_endpoint  # type: ignore[method-assign]
+
+    await watcher._reconcile_endpoints([1, 2, 3])
+    await asyncio.sleep(0)
+    assert started == {1: 0, 2: 200, 3: 1200}
+
+    started.clear()
+    await watcher._reconcile_endpoints([1, 3, 4])
+    await asyncio.sleep(0)
+    assert started == {4: 400}
+    assert set(watcher._endpoint_tasks) == {1, 3, 4}
+    assert set(watcher.results) == {(3, "db")}
+
+    for task in watcher._endpoint_tasks.values():
+        task.cancel()
+
+
+async def test_image_watcher_staggered_shares_registry_lookups() -> None:
+    """Test that staggered endpoints share registry lookups until the endpoints are resolved again."""
+    portainer = MagicMock()
+    portainer.get_containers = AsyncMock(return_value=[DockerContainer.from_dict({"Id": "web", "Image": "nginx:1.27", "State": "running"})])
+    portainer.get_endpoints = AsyncMock(return_value=[])
+    portainer.get_image_information = AsyncMock(return_value=MagicMock())
+    portainer.container_image_status = AsyncMock(return_value=PortainerImageUpdateStatus(update_available=False))
+    watcher = PortainerImageWatcher(portainer, stagger=True)
+
+    await watcher._check_endpoint_staggered(1, 300)
+    await watcher._check_endpoint_staggered(2, 300)
+    assert portainer.get_image_information.await_count == 1
+
+    # The next interval looks the image up again
+    task = asyncio.create_task(watcher._run_staggered())
+    await asyncio.sleep(0)
+    await watcher._check_endpoint_staggered(1, 300)
+    assert portainer.get_image_information.await_count == 2
+
+    task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await task
+
+
+async def test_image_watcher_staggered_endpoint_survives_errors(caplog: pytest.LogCaptureFixture) -> None:
+    """Test that an unexpected error is logged and does not stop the schedule of an endpoint."""
+    watcher = PortainerImageWatcher(MagicMock(), interval=timedelta(milliseconds=1), stagger=True)
+    checked = asyncio.Event()
+    calls = 0
+
+    async def check_endpoint_staggered(endpoint_id: int, interval: float) -> None:
+        """Fail on the first round, as a broken store or callback would."""
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            msg = f"Store of endpoint {endpoint_id} is broken, {interval}"
+            raise RuntimeError(msg)
+        checked.set()
+
+    watcher._check_endpoint_staggered = check_endpoint_staggered  # type: ignore[method-assign]
+    task = asyncio.create_task(watcher._run_endpoint(1))
+    await asyncio.wait_for(checked.wait(), timeout=1)
+
+    assert "Unexpected error during image check of endpoint 1" in caplog.text
+    task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await task
+
+
+async def test_image_watcher_only_changes() -> None:
+    """Test that only added, changed and removed results are delivered when change detection is enabled."""
+    statuses = {
+        "nginx:1.27": PortainerImageUpdateStatus(update_available=False, local_digest="sha256:a"),
+        "redis:7": PortainerImageUpdateStatus(update_available=False, local_digest="sha256:b"),
+    }
+    containers = [
+        DockerContainer.from_dict({"Id": "web", "Image": "nginx:1.27", "State": "running"}),
+        DockerContainer.from_dict({"Id": "cache", "Image": "redis:7", "State": "running"}),
+    ]
+    portainer = MagicMock()
+    portainer.get_containers = AsyncMock(side_effect=lambda _: list(containers))
+    portainer.get_image_information = AsyncMock(return_value=MagicMock())
+    portainer.container_image_status = AsyncMock(side_effect=lambda _, image, **__: statuses[image])
+
+    received: list[PortainerImageWatcherResult] = []
+    change_sets: list[PortainerImageWatcherChangeSet] = []
+    watcher = PortainerImageWatcher(portainer, endpoint_id=1, only_changes=True)
+    watcher.register_callback(received.append)
+    watcher.register_change_callback(change_sets.append)
+
+    await watcher._check_all()
+    assert [result.container_id for result in received] == ["web", "cache"]
+    assert [len(change_sets[0].added), len(change_sets[0].changed), len(change_sets[0].removed)] == [2, 0, 0]
+
+    # Nothing changed: no callbacks at all
+    received.clear()
+    await watcher._check_all()
+    assert not received
+    assert len(change_sets) == 1
+
+    # One status changed and one container is gone
+    statuses["nginx:1.27"] = PortainerImageUpdateStatus(update_available=True, local_digest="sha256:a", registry_digest="sha256:c")
+    del containers[1]
+    await watcher._check_all()
+
+    assert received == [
+        PortainerImageWatcherResult(endpoint_id=1, container_id="web", status=statuses["nginx:1.27"]),
+        PortainerImageWatcherResult(endpoint_id=1, container_id="cache"),
+    ]
+    changes = change_sets[-1]
+    assert [result.container_id for result in changes.changed] == ["web"]
+    assert [result.container_id for result in changes.removed] == ["cache"]
+    assert not changes.added
+    assert set(watcher.results) == {(1, "web")}
+
+    watcher.unregister_change_callback(change_sets.append)
+    assert not watcher._change_callbacks
+
+
+async def test_image_watcher_keeps_results_of_failed_checks() -> None:
+    """Test that a failed listing or image check keeps the previous results instead of removing them."""
+    containers = {
+        1: [
+            DockerContainer.from_dict({"Id": "web", "Image": "nginx:1.27", "State": "running"}),
+            DockerContainer.from_dict({"Id": "cache", "Image": "redis:7", "State": "running"}),
+        ],
+        2: [DockerContainer.from_dict({"Id": "db", "Image": "postgres:17", "State": "running"})],
+    }
+    failing: set[Any] = set()
+
+    async def get_containers(endpoint_id: int) -> list[DockerContainer]:
+        if endpoint_id in failing:
+            raise PortainerConnectionError
+        return containers[endpoint_id]
+
+    async def container_image_status(_endpoint_id: int, image: str, **_kwargs: Any) -> PortainerImageUpdateStatus:
+        if image in failing:
+            raise PortainerConnectionError
+        return PortainerImageUpdateStatus(update_available=False)
+
+    portainer = MagicMock()
+    portainer.get_endpoints = AsyncMock(return_value=[MagicMock(id=1), MagicMock(id=2)])
+    portainer.get_containers = get_containers
+    portainer.get_image_information = AsyncMock(return_value=MagicMock())
+    portainer.container_image_status = container_image_status
+
+    change_sets: list[PortainerImageWatcherChangeSet] = []
+    watcher = PortainerImageWatcher(portainer, only_changes=True)
+    watcher.register_change_callback(change_sets.append)
+    await watcher._check_all()
+    assert set(watcher.results) == {(1, "web"), (1, "cache"), (2, "db")}
+
+    failing.update({2, "redis:7"})
+    await watcher._check_all()
+    assert set(watcher.results) == {(1, "web"), (1, "cache"), (2, "db")}
+    assert watcher.snapshot.for_image("postgres:17")
+    assert watcher.snapshot.stale == {(1, "cache"), (2, "db")}
+    assert watcher.snapshot.is_stale(2, "db")
+    assert not watcher.snapshot.is_stale(1, "web")
+    assert len(change_sets) == 1
+
+    # Only a successful listing without the container removes it
+    failing.clear()
+    del containers[1][1]
+    await watcher._check_all()
+    assert set(watcher.results) == {(1, "web"), (2, "db")}
+    assert [result.container_id for result in change_sets[-1].removed] == ["cache"]
+
+    assert not watcher.snapshot.stale
+
+    # So does an endpoint that is no longer listed
+    portainer.get_endpoints.return_value = [MagicMock(id=1)]
+    await watcher._check_all()
+    assert set(watcher.results) == {(1, "web")}
+
+
+async def test_image_watcher_expires_missed_results() -> None:
+    """Test that a result that could not be checked is dropped after max_missed_checks checks in a row."""
+    failing = False
+
+    async def get_containers(_endpoint_id: int) -> list[DockerContainer]:
+        if failing:
+            raise PortainerConnectionError
+        return [DockerContainer.from_dict({"Id": "web", "Image": "nginx:1.27", "State": "running"})]
+
+    portainer = MagicMock()
+    portainer.get_containers = get_containers
+    portainer.get_image_information = AsyncMock(return_value=MagicMock())
+    portainer.container_image_status = AsyncMock(return_value=PortainerImageUpdateStatus(update_available=False))
+
+    for stagger in (False, True):
+        watcher = PortainerImageWatcher(portainer, endpoint_id=1, max_missed_checks=2, stagger=stagger)
+
+        async def check(watcher: PortainerImageWatcher = watcher) -> None:
+            if watcher._stagger:
+                await watcher._check_endpoint_staggered(1, 0)
+            else:
+                await watcher._check_all()
+
+        failing = False
+        await check()
+        failing = True
+        await check()
+        assert watcher.snapshot.is_stale(1, "web")
+
+        # A successful check in between starts counting again
+        failing = False
+        await check()
+        assert not watcher.snapshot.stale
+        failing = True
+        await check()
+        assert set(watcher.results) == {(1, "web")}
+        await check()
+        assert not watcher.results
+        assert not watcher._missed_checks
+
+
+async def test_image_watcher_snapshot() -> None:
+    """Test that every check publishes a new immutable snapshot with indexed lookups."""
+    containers = {
+        1: [
+            DockerContainer.from_dict({"Id": "web", "Image": "nginx:1.27", "State": "running"}),
+            DockerContainer.from_dict({"Id": "cache", "Image": "redis:7", "State": "running"}),
+        ],
+        2: [DockerContainer.from_dict({"Id": "proxy", "Image": "docker.io/library/nginx:1.27", "State": "running"})],
+    }
+    portainer = MagicMock()
+    portainer.get_endpoints = AsyncMock(return_value=[MagicMock(id=1), MagicMock(id=2)])
+    portainer.get_containers = AsyncMock(side_effect=lambda endpoint_id: containers[endpoint_id])
+    portainer.get_image_information = AsyncMock(return_value=MagicMock())
+    portainer.container_image_status = AsyncMock(return_value=PortainerImageUpdateStatus(update_available=False))
+
+    watcher = PortainerImageWatcher(portainer)
+    empty = watcher.snapshot
+    assert len(empty) == 0
+    assert empty.for_endpoint(1) == ()
+
+    await watcher._check_all()
+    snapshot = watcher.snapshot
+
+    assert snapshot is not empty
+    assert snapshot is watcher.snapshot
+    assert len(snapshot) == 3
+    assert snapshot.get(1, "web") == watcher.results[(1, "web")]
+    assert snapshot.get(1, "missing") is None
+    assert [result.container_id for result in snapshot.for_endpoint(1)] == ["web", "cache"]
+    assert [result.container_id for result in snapshot.for_image("nginx:1.27")] == ["web", "proxy"]
+    assert snapshot.for_image("postgres") == ()
+
+    with pytest.raises(TypeError):
+        snapshot.results[(1, "web")] = PortainerImageWatcherResult()  # type: ignore[index]
+
+    del containers[1][1]
+    await watcher._check_all()
+    assert len(snapshot) == 3
+    assert len(watcher.snapshot) == 2